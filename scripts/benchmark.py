@@ -0,0 +1,265 @@
+"""
+Time some of textacy's core operations on a large, synthetic, spaCy-parsed doc,
+so that changes in performance can be measured with the spaCy version and models
+that textacy actually targets.
+
+To compare two versions of textacy, run this script against each of them, e.g.
+with the older version checked out in a separate git worktree::
+
+    $ git worktree add ../textacy-before <commit>
+    $ PYTHONPATH=../textacy-before python scripts/benchmark.py term_counts
+    $ PYTHONPATH=. python scripts/benchmark.py term_counts
+
+Benchmarks only call functions that already existed before the changes they
+measure, or compare a newer function against the equivalent older calls.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import argparse
+from collections import OrderedDict
+import random
+import re
+import timeit
+try:
+    import tracemalloc
+except ImportError:  # PY2
+    tracemalloc = None
+
+import spacy
+
+import textacy
+from textacy import data, extract, regexes_etc, texts
+
+SUBJECTS = ['The mayor', 'Senator Smith', 'A spokeswoman for the agency', 'The committee',
+            'Dr. Alvarez', 'The I.M.F.', 'Local officials', 'The company', 'She', 'He']
+VERBS = ['announced', 'rejected', 'approved', 'questioned', 'proposed', 'delayed',
+         'criticized', 'defended', 'reviewed', 'funded']
+OBJECTS = ['a new plan for the city', 'the budget for next year', 'the report on flooding',
+           'an agreement with the union', 'three bridges over the river',
+           'the tax on imported steel', 'a study of public schools', 'the new policy']
+CLAUSES = ['after a long debate', 'on Tuesday', 'in a statement', 'despite strong opposition',
+           'for the second time this year', 'during the meeting', 'without explanation']
+QUOTES = ['We need to act now', 'This is not what the voters wanted',
+          'The numbers simply do not add up', 'I have never seen anything like it',
+          'Is that really what we want for our kids', 'Nobody was told about the changes']
+REPORTING_VERBS = ['said', 'told reporters', 'added', 'wrote', 'asked']
+
+# built-in english POS patterns, plus assorted custom ones
+POS_REGEX_PATTERNS = dict(regexes_etc.POS_REGEX_PATTERNS['en'])
+POS_REGEX_PATTERNS.update({
+    'ADJ_NOUN': r'<ADJ>+ <NOUN>', 'NOUN_NOUN': r'<NOUN> <NOUN>+',
+    'PROPN_SEQ': r'<PROPN>{2,}', 'DET_NOUN': r'<DET> <NOUN>',
+    'VERB_DET_NOUN': r'<VERB> <DET> <ADJ>* <NOUN>', 'ADP_PROPN': r'<ADP> <PROPN>+',
+    'NUM_NOUN': r'<NUM> <NOUN>', 'ADV_VERB': r'<ADV> <VERB>',
+    'VERB_ADP': r'<VERB> <ADP>', 'PRON_VERB': r'<PRON> <VERB>',
+    'NOUN_ADP_NOUN': r'<NOUN> <ADP> <DET>? <NOUN>', 'CONJ_NOUN': r'<CONJ> <DET>? <NOUN>',
+    'ADJ_CONJ_ADJ': r'<ADJ> <CONJ> <ADJ>', 'PUNCT_PROPN': r'<PUNCT> <PROPN>',
+    'VERB_VERB': r'<VERB> <PART>? <VERB>'})
+
+
+def make_text(n_tokens, seed=42):
+    """
+    Make a news-like text of roughly ``n_tokens`` tokens from random combinations
+    of the above phrases, with some direct quotations and paragraph breaks.
+    """
+    rand = random.Random(seed)
+    sents = []
+    n_words = 0
+    while n_words < n_tokens:
+        if rand.random() < 0.25:
+            sent = '"{}," {} {}.'.format(
+                rand.choice(QUOTES), rand.choice(SUBJECTS).lower() if rand.random() < 0.5
+                else rand.choice(SUBJECTS), rand.choice(REPORTING_VERBS))
+        else:
+            sent = '{} {} {} {}, and {} {} {}.'.format(
+                rand.choice(SUBJECTS), rand.choice(VERBS), rand.choice(OBJECTS),
+                rand.choice(CLAUSES), rand.choice(SUBJECTS).lower(), rand.choice(VERBS),
+                rand.choice(OBJECTS))
+        sents.append(sent)
+        n_words += len(sent.split()) + 2
+        if rand.random() < 0.1:
+            sents.append('\n\n')
+    return ' '.join(sents)
+
+
+def _format_kwargs(kwargs):
+    return ', '.join('{}={}'.format(key, sorted(value) if isinstance(value, set) else value)
+                     for key, value in sorted(kwargs.items()))
+
+
+def time_it(func, repeat=3):
+    """Get the best wall time, in seconds, of ``repeat`` calls to ``func``."""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def bench_term_counts(spacy_doc, spacy_pipeline, repeat):
+    """``TextDoc.term_counts()``, on a new doc each time to avoid its cache."""
+    for lemmatize in ('auto', True, False):
+        for ngram_range in ((1, 1), (2, 2), (1, 3)):
+            func = lambda: texts.TextDoc(
+                spacy_doc, spacy_pipeline=spacy_pipeline, lang='en').term_counts(
+                    lemmatize=lemmatize, ngram_range=ngram_range)
+            yield ('lemmatize={}, ngram_range={}'.format(lemmatize, ngram_range),
+                   time_it(func, repeat=repeat), 's')
+
+
+def bench_textdoc(spacy_doc, spacy_pipeline, repeat):
+    """
+    Memory overhead of many short :class:`TextDoc` s, repeated access to their
+    scalar stats, and adding them to a :class:`TextCorpus`.
+    """
+    spacy_docs = list(spacy_pipeline.pipe(sent.text for sent in spacy_doc.sents))
+    if tracemalloc is not None:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        docs = [texts.TextDoc(sd, spacy_pipeline=spacy_pipeline, lang='en')
+                for sd in spacy_docs]
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        yield ('TextDoc overhead, excluding spacy doc', (after - before) / len(docs), 'B/doc')
+    docs = [texts.TextDoc(sd, spacy_pipeline=spacy_pipeline, lang='en') for sd in spacy_docs]
+
+    def get_stats():
+        for _ in range(5):
+            for doc in docs:
+                doc.n_sents, doc.n_words, doc.n_paragraphs()
+    yield ('n_sents, n_words, n_paragraphs() x 5, {} docs'.format(len(docs)),
+           time_it(get_stats, repeat=repeat), 's')
+
+    def add_docs():
+        corpus = texts.TextCorpus('en')
+        for sd in spacy_docs:
+            corpus.add_doc(texts.TextDoc(sd, spacy_pipeline=spacy_pipeline, lang='en'))
+    yield ('TextCorpus.add_doc(), {} docs'.format(len(spacy_docs)),
+           time_it(add_docs, repeat=repeat), 's')
+
+
+def bench_words_ngrams(spacy_doc, spacy_pipeline, repeat):
+    """``extract.words()`` and ``extract.ngrams()``, with and without filters."""
+    for n in (1, 2, 3, 6):
+        for kwargs in ({'filter_stops': False, 'filter_punct': False},
+                       {'filter_nums': True},
+                       {'filter_nums': True, 'bad_pos_tags': {'PRON', 'DET'}}):
+            if n == 1:
+                func = lambda: list(extract.words(spacy_doc, **kwargs))
+            else:
+                func = lambda: list(extract.ngrams(spacy_doc, n, **kwargs))
+            yield ('n={}, {}'.format(n, _format_kwargs(kwargs)),
+                   time_it(func, repeat=repeat), 's')
+
+
+def bench_pos_regex(spacy_doc, spacy_pipeline, repeat):
+    """
+    ``extract.pos_regex_matches_multi()`` versus calling ``extract.pos_regex_matches()``
+    once per pattern, for the built-in patterns and for many patterns. If available,
+    also time a scan of the doc's tag string by a single regex combining all patterns
+    via lookaheads, versus one scan per pattern; the former is only a lower bound
+    for such an approach, since it doesn't resolve overlapping matches of the
+    same pattern.
+    """
+    for patterns in (regexes_etc.POS_REGEX_PATTERNS['en'], POS_REGEX_PATTERNS):
+        func = lambda: [list(extract.pos_regex_matches(spacy_doc, pattern))
+                        for pattern in patterns.values()]
+        yield ('pos_regex_matches(), {} patterns'.format(len(patterns)),
+               time_it(func, repeat=repeat), 's')
+        if hasattr(extract, 'pos_regex_matches_multi'):
+            func = lambda: list(extract.pos_regex_matches_multi(spacy_doc, patterns))
+            yield ('pos_regex_matches_multi(), {} patterns'.format(len(patterns)),
+                   time_it(func, repeat=repeat), 's')
+        if hasattr(extract, '_compile_pos_regex'):
+            tags = extract._get_pos_tag_string(spacy_doc)
+            regexes = [extract._compile_pos_regex(pattern) for pattern in patterns.values()]
+            func = lambda: [list(regex.finditer(tags)) for regex in regexes]
+            yield ('per-pattern regex scans only, {} patterns'.format(len(patterns)),
+                   time_it(func, repeat=repeat), 's')
+            regex = re.compile('|'.join(
+                '(?=(?P<p{}>{}))'.format(i, extract._compile_pos_regex(pattern).pattern)
+                for i, pattern in enumerate(patterns.values())))
+            func = lambda: list(regex.finditer(tags))
+            yield ('combined lookahead regex scan only, {} patterns'.format(len(patterns)),
+                   time_it(func, repeat=repeat), 's')
+
+
+def bench_direct_quotations(spacy_doc, spacy_pipeline, repeat):
+    """
+    ``extract.direct_quotations()`` on docs of increasing size, to show how
+    its run time scales with the numbers of sentences and quotes.
+    """
+    n_tokens = len(spacy_doc)
+    for frac in (0.25, 0.5, 1.0):
+        if frac < 1.0:
+            doc = spacy_pipeline(make_text(int(frac * n_tokens)))
+        else:
+            doc = spacy_doc
+        n_quotes = doc.text.count('"') // 2
+        func = lambda: list(extract.direct_quotations(doc))
+        yield ('{} tokens, {} quotes'.format(len(doc), n_quotes),
+               time_it(func, repeat=repeat), 's')
+
+
+def bench_run_plan(spacy_doc, spacy_pipeline, repeat):
+    """
+    ``extract.run_plan()`` versus calling each of its extractors directly,
+    as well as each extractor on its own.
+    """
+    plan = [('words', {'filter_nums': True}), ('ngrams', {'n': 2}), ('ngrams', {'n': 3}),
+            'named_entities', 'noun_chunks', 'subject_verb_object_triples',
+            'direct_quotations', ('pos_regex_matches', {'pattern': r'<ADJ>+ <NOUN>'}),
+            ('words', {'min_freq': 3})]
+    plan = [(step, {}) if isinstance(step, str) else step for step in plan]
+    calls = [(name, getattr(extract, name), kwargs) for name, kwargs in plan]
+    for name, extractor, kwargs in calls:
+        func = lambda: list(extractor(spacy_doc, **kwargs))
+        yield ('{}({})'.format(name, _format_kwargs(kwargs)),
+               time_it(func, repeat=repeat), 's')
+    func = lambda: [list(extractor(spacy_doc, **kwargs)) for _, extractor, kwargs in calls]
+    yield ('all of the above, called directly', time_it(func, repeat=repeat), 's')
+    if hasattr(extract, 'run_plan'):
+        func = lambda: extract.run_plan(spacy_doc, plan)
+        yield ('all of the above, via run_plan()', time_it(func, repeat=repeat), 's')
+
+
+BENCHMARKS = OrderedDict([
+    ('term_counts', bench_term_counts),
+    ('textdoc', bench_textdoc),
+    ('words_ngrams', bench_words_ngrams),
+    ('pos_regex', bench_pos_regex),
+    ('direct_quotations', bench_direct_quotations),
+    ('run_plan', bench_run_plan),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument(
+        'benchmarks', nargs='*',
+        help='names of benchmarks to run, any of {}; if none, all are run'.format(
+            ', '.join(BENCHMARKS)))
+    parser.add_argument(
+        '--n_tokens', type=int, default=20000,
+        help='approximate number of tokens in the synthetic doc')
+    parser.add_argument(
+        '--repeat', type=int, default=3,
+        help='number of times to run each operation; the best time is reported')
+    parser.add_argument(
+        '--seed', type=int, default=42,
+        help='random seed used to make the synthetic doc')
+    args = parser.parse_args()
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error('benchmark "{}" not valid; must be in {}'.format(name, list(BENCHMARKS)))
+
+    spacy_pipeline = data.load_spacy('en')
+    spacy_doc = spacy_pipeline(make_text(args.n_tokens, seed=args.seed))
+    print('textacy {}, spacy {}: {} tokens, {} sents'.format(
+        textacy.__version__, getattr(spacy, '__version__', '?'),
+        len(spacy_doc), sum(1 for _ in spacy_doc.sents)))
+
+    for name in args.benchmarks or BENCHMARKS:
+        print('\n{}'.format(name))
+        for label, value, unit in BENCHMARKS[name](spacy_doc, spacy_pipeline, args.repeat):
+            print('    {:<60} {:>10.4f} {}'.format(label, value, unit))
+
+
+if __name__ == '__main__':
+    main()
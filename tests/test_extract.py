@@ -1,13 +1,89 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, unicode_literals
 
+from collections import Counter, OrderedDict
+import gc
+import itertools
 import re
+import threading
 import unittest
+import weakref
 
 import numpy as np
 from spacy import attrs
 
-from textacy import data, extract, preprocess, regexes_etc
+from textacy import data, extract, preprocess, regexes_etc, spacy_utils
+
+QUOTES_TEXT = """
+"We need to act now," she said. "The storm is coming, and it won't wait for us." He nodded.
+The mayor said, "Everyone in the low-lying neighborhoods should leave the city tonight."
+"Is that really necessary?" asked a reporter from the Times. "Yes," the mayor replied, "it is."
+Nobody said anything for a while. Then the reporter asked, "Where will they go?"
+"The shelters are open," said the mayor, "and buses will run all night." The reporter wrote it down.
+"I don't believe him," the governor told reporters on Tuesday. The mayor said nothing.
+""".strip()
+
+
+def _filter_min_freq(items, min_freq, get_key=spacy_utils.normalized_str):
+    """
+    Reference implementation of the ``min_freq`` filter in :mod:`textacy.extract`,
+    which counts items by their (normalized) strings.
+    """
+    items = list(items)
+    freqs = Counter(get_key(item) for item in items)
+    return [item for item in items if freqs[get_key(item)] >= min_freq]
+
+
+def _direct_quotations_reference(doc):
+    """
+    Reference implementation of :func:`extract.direct_quotations()` that checks
+    all tokens, sentences, and quotes in turn, rather than binary searching them.
+    """
+    quote_end_punct = {',', '.', '?', '!'}
+    quote_indexes = set(itertools.chain.from_iterable(
+        (m.start(), m.end() - 1) for m in re.finditer(r"(\".*?\")|(''.*?'')|(``.*?'')", doc.string)))
+    quote_tok_indexes = sorted(tok.i for tok in doc if tok.idx in quote_indexes)
+    quote_positions = list(zip(quote_tok_indexes[::2], quote_tok_indexes[1::2]))
+    sents = list(doc.sents)
+    sent_positions = [(sent.start, sent.end) for sent in sents]
+
+    for q0, q1 in quote_positions:
+        quote = doc[q0: q1 + 1]
+        if not any(char in quote_end_punct for char in quote.text[-4:]):
+            continue
+        candidate_sent_indexes = [
+            i for i, (s0, s1) in enumerate(sent_positions)
+            if (s0 <= q1 + 1 and s1 > q1) or (s0 < q0 and s1 >= q0 - 1)]
+        for si in candidate_sent_indexes:
+            rvs = [tok for tok in sents[si]
+                   if spacy_utils.preserve_case(tok) is False
+                   and tok.lemma_ in regexes_etc.REPORTING_VERBS
+                   and tok.pos_ == 'VERB'
+                   and not any(oq0 <= tok.i <= oq1 for oq0, oq1 in quote_positions)]
+            if not rvs:
+                continue
+            rv = rvs[0]
+            min_rv_dist = 1000
+            for rv_candidate in rvs:
+                rv_dist = min(abs(rv_candidate.i - qp) for qp in (q0, q1))
+                if rv_dist < min_rv_dist:
+                    rv = rv_candidate
+                    min_rv_dist = rv_dist
+                else:
+                    break
+            try:
+                rv_subj = spacy_utils.get_subjects_of_verb(rv)[0]
+            except IndexError:
+                continue
+            span = spacy_utils.get_span_for_compound_noun(rv_subj)
+            yield (doc[span[0]: span[1] + 1], rv, quote)
+            break
+
+
+def _positions(items):
+    """Get the (start, end) token positions of extracted spans or tokens."""
+    return [(item.start, item.end) if hasattr(item, 'start') else (item.i, item.i + 1)
+            for item in items]
 
 
 class ExtractTestCase(unittest.TestCase):
@@ -82,6 +158,17 @@ class ExtractTestCase(unittest.TestCase):
             min_freq=2)][:25]
         self.assertEqual(observed, expected)
 
+    def test_words_min_freq_same_as_reference(self):
+        docs = [self.spacy_doc, data.load_spacy('en')(QUOTES_TEXT)]
+        filter_kwargs = [
+            {'filter_stops': False, 'filter_punct': False, 'filter_nums': False},
+            {'filter_stops': True, 'filter_punct': True, 'filter_nums': True},
+            {'filter_stops': False, 'bad_pos_tags': {'NOUN'}}]
+        for doc, kwargs, min_freq in itertools.product(docs, filter_kwargs, (2, 3, 5)):
+            expected = _positions(_filter_min_freq(extract.words(doc, **kwargs), min_freq))
+            observed = _positions(extract.words(doc, min_freq=min_freq, **kwargs))
+            self.assertEqual(observed, expected)
+
     def test_ngrams_less_than_1(self):
         with self.assertRaises(ValueError):
             list(extract.ngrams(self.spacy_doc, 0))
@@ -123,6 +210,17 @@ class ExtractTestCase(unittest.TestCase):
             min_freq=2)]
         self.assertEqual(observed, expected)
 
+    def test_ngrams_min_freq_same_as_reference(self):
+        docs = [self.spacy_doc, data.load_spacy('en')(QUOTES_TEXT)]
+        filter_kwargs = [
+            {'filter_stops': False, 'filter_punct': False, 'filter_nums': False},
+            {'filter_stops': True, 'filter_punct': True, 'filter_nums': True},
+            {'filter_stops': False, 'filter_punct': False, 'bad_pos_tags': {'NOUN'}}]
+        for doc, n, kwargs, min_freq in itertools.product(docs, (1, 2, 3), filter_kwargs, (2, 3)):
+            expected = _positions(_filter_min_freq(extract.ngrams(doc, n, **kwargs), min_freq))
+            observed = _positions(extract.ngrams(doc, n, min_freq=min_freq, **kwargs))
+            self.assertEqual(observed, expected)
+
     def test_ngrams_good_tag(self):
         expected = ['technology trends', 'education official']
         observed = [span.orth_ for span in extract.ngrams(
@@ -130,6 +228,13 @@ class ExtractTestCase(unittest.TestCase):
             good_pos_tags={'NOUN'})]
         self.assertEqual(observed, expected)
 
+    def test_ngrams_span(self):
+        span = self.spacy_doc[5:30]
+        expected = [(ngram.start, ngram.end) for ngram in extract.ngrams(self.spacy_doc, 2)
+                    if ngram.start >= span.start and ngram.end <= span.end]
+        observed = [(ngram.start, ngram.end) for ngram in extract.ngrams(span, 2)]
+        self.assertEqual(observed, expected)
+
     def test_named_entities(self):
         expected = [
             'Two weeks ago', 'Kuwait', 'Arab', '30 minutes', 'Middle East', 'Egyptian',
@@ -150,6 +255,14 @@ class ExtractTestCase(unittest.TestCase):
             self.spacy_doc, drop_determiners=True, min_freq=2)]
         self.assertEqual(observed, expected)
 
+    def test_named_entities_min_freq_same_as_reference(self):
+        for doc in (self.spacy_doc, data.load_spacy('en')(QUOTES_TEXT)):
+            for min_freq in (2, 3):
+                expected = _positions(_filter_min_freq(
+                    extract.named_entities(doc), min_freq, get_key=lambda ne: ne.text))
+                observed = _positions(extract.named_entities(doc, min_freq=min_freq))
+                self.assertEqual(observed, expected)
+
     def test_named_entities_determiner(self):
         expected = ['the Middle East', 'the United States']
         observed = [ent.text for ent in extract.named_entities(
@@ -186,6 +299,13 @@ class ExtractTestCase(unittest.TestCase):
             self.spacy_doc, drop_determiners=True, min_freq=2)]
         self.assertEqual(observed, expected)
 
+    def test_noun_chunks_min_freq_same_as_reference(self):
+        for doc in (self.spacy_doc, data.load_spacy('en')(QUOTES_TEXT)):
+            for min_freq in (2, 3):
+                expected = _positions(_filter_min_freq(extract.noun_chunks(doc), min_freq))
+                observed = _positions(extract.noun_chunks(doc, min_freq=min_freq))
+                self.assertEqual(observed, expected)
+
     def test_pos_regex_matches(self):
         expected = [
             'Two weeks', 'Kuwait', 'an I.M.F. seminar', 'Arab educators',
@@ -197,6 +317,67 @@ class ExtractTestCase(unittest.TestCase):
             self.spacy_doc, regexes_etc.POS_REGEX_PATTERNS['en']['NP'])]
         self.assertEqual(observed, expected)
 
+    def test_pos_regex_matches_alternatives(self):
+        expected = [span.text for span in extract.pos_regex_matches(
+            self.spacy_doc, r'(<NOUN>|<PROPN>|<ADJ>)+')]
+        observed = [span.text for span in extract.pos_regex_matches(
+            self.spacy_doc, r'<NOUN|PROPN|ADJ>+')]
+        self.assertTrue(len(observed) > 0)
+        self.assertEqual(observed, expected)
+
+    def test_pos_regex_matches_multi(self):
+        patterns = regexes_etc.POS_REGEX_PATTERNS['en']
+        expected = sorted(
+            ((span.start, span.end, name) for name, pattern in patterns.items()
+             for span in extract.pos_regex_matches(self.spacy_doc, pattern)),
+            key=lambda x: x[0])
+        observed = [(span.start, span.end, name) for name, span
+                    in extract.pos_regex_matches_multi(self.spacy_doc, patterns)]
+        self.assertEqual(observed, expected)
+
+    def test_pos_regex_matches_multi_overlapping(self):
+        patterns = {'noun': r'<NOUN>', 'nouns': r'<NOUN>+', 'np': r'<ADJ>* <NOUN>+',
+                    'adjs': r'<ADJ>*', 'none': r'<INTJ> <INTJ> <INTJ>'}
+        for names in itertools.permutations(sorted(patterns), 3):
+            ordered_patterns = OrderedDict(
+                (name, patterns[name]) for name in names)
+            expected = sorted(
+                ((span.start, span.end, name) for name, pattern in ordered_patterns.items()
+                 for span in extract.pos_regex_matches(self.spacy_doc, pattern)),
+                key=lambda x: x[0])
+            observed = [(span.start, span.end, name) for name, span
+                        in extract.pos_regex_matches_multi(self.spacy_doc, ordered_patterns)]
+            self.assertEqual(observed, expected, msg=names)
+
+    def test_pos_tag_chars_threads(self):
+        tags = ['FOO{}'.format(i) for i in range(200)]
+        chars = {}
+
+        def get_chars(tags):
+            for tag in tags:
+                chars.setdefault(tag, set()).add(extract._get_pos_tag_char(tag))
+
+        threads = [threading.Thread(target=get_chars, args=(tags,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(all(len(tag_chars) == 1 for tag_chars in chars.values()))
+        self.assertEqual(len(set(itertools.chain.from_iterable(chars.values()))), len(tags))
+        self.assertEqual(len(set(extract._POS_TAG_CHARS.values())), len(extract._POS_TAG_CHARS))
+
+    def test_pos_tag_string_cache_weak(self):
+        spacy_doc = data.load_spacy('en')('The year was 2081, and everybody was finally equal.')
+        try:
+            doc_ref = weakref.ref(spacy_doc)
+        except TypeError:
+            self.skipTest('spacy docs can not be weakly referenced')
+        list(extract.pos_regex_matches(spacy_doc, r'<NOUN>+'))
+        self.assertIn(spacy_doc, extract._POS_TAG_STRING_CACHE)
+        del spacy_doc
+        gc.collect()
+        self.assertIsNone(doc_ref())
+
     def test_subject_verb_object_triples(self):
         expected = [
             'we, discussed, impact', 'education official, raised, hand', 'he, could ask, me',
@@ -210,6 +391,100 @@ class ExtractTestCase(unittest.TestCase):
         observed = extract.acronyms_and_definitions(self.spacy_doc)
         self.assertEqual(observed, expected)
 
+    def test_acronym_index(self):
+        acro_index = extract.AcronymIndex(min_count=2, min_share=0.6)
+        acro_index.add('IMF', 'International Monetary Fund', count=2)
+        acro_index.add('IMF', 'Interplanetary Magnetic Field')
+        acro_index.add('IMO', 'International Maritime Organization')
+        acro_index.add_doc(self.spacy_doc)
+        self.assertEqual(acro_index.get_definition('IMF'), 'International Monetary Fund')
+        self.assertIsNone(acro_index.get_definition('IMO'))
+        self.assertIsNone(acro_index.get_definition('I.M.F.'))
+        self.assertEqual(acro_index.acronyms_with_prefix('IM'), ['IMF', 'IMO'])
+        self.assertEqual(acro_index.acronyms_with_prefix('I'), ['I.M.F.', 'IMF', 'IMO'])
+        observed = extract.AcronymIndex.from_dict(acro_index.to_dict())
+        self.assertEqual(observed.to_dict(), acro_index.to_dict())
+
+    def test_semistructured_statements_multi(self):
+        statement = ('I', 'was', 'in Kuwait participating in an I.M.F. seminar for Arab educators')
+        expected = {'I': [statement], 'i': [statement], 'we': [], 'he': [],
+                    'education official': []}
+        observed = {entity: [tuple(item.text for item in triple) for triple in triples]
+                    for entity, triples in extract.semistructured_statements_multi(
+                        self.spacy_doc, ['I', 'we', 'I', 'i', 'he', 'education official'],
+                        cue='be').items()}
+        self.assertEqual(observed, expected)
+
+    def test_run_plan(self):
+        patterns = regexes_etc.POS_REGEX_PATTERNS['en']
+        plan = [('words', {'filter_stops': False, 'min_freq': 2}),
+                ('ngrams', {'n': 2}),
+                'named_entities',
+                ('noun_chunks', {'drop_determiners': False}),
+                ('pos_regex_matches', {'pattern': patterns['NP']}),
+                ('pos_regex_matches_multi', {'patterns': patterns}),
+                'subject_verb_object_triples',
+                'acronyms_and_definitions',
+                ('semistructured_statements', {'entity': 'I', 'cue': 'be'}),
+                ('semistructured_statements_multi', {'entities': ['I', 'we'], 'cue': 'be'}),
+                'direct_quotations']
+        self.assertEqual({step if isinstance(step, str) else step[0] for step in plan},
+                         set(extract._PLAN_EXTRACTORS))
+
+        def to_texts(result):
+            if hasattr(result, 'text'):
+                return result.text
+            if isinstance(result, dict):
+                return {key: to_texts(value) for key, value in result.items()}
+            if isinstance(result, (list, tuple)) or hasattr(result, '__next__'):
+                return [to_texts(item) for item in result]
+            return result
+
+        expected = [
+            to_texts(getattr(extract, step)(self.spacy_doc)) if isinstance(step, str)
+            else to_texts(getattr(extract, step[0])(self.spacy_doc, **step[1]))
+            for step in plan]
+        observed = to_texts(extract.run_plan(self.spacy_doc, plan))
+        self.assertEqual(len(observed), len(plan))
+        for step, obs, exp in zip(plan, observed, expected):
+            self.assertEqual(obs, exp, msg=step)
+
+    def test_run_plan_shares_doc_data(self):
+        patterns = regexes_etc.POS_REGEX_PATTERNS['en']
+        plan = [('words', {'min_freq': 2}), ('ngrams', {'n': 2}),
+                ('ngrams', {'n': 3, 'min_freq': 2}), ('noun_chunks', {'min_freq': 2}),
+                ('pos_regex_matches', {'pattern': patterns['NP']}),
+                ('pos_regex_matches_multi', {'patterns': patterns})]
+        calls = Counter()
+
+        def counted(func):
+            def wrapper(*args, **kwargs):
+                calls[func.__name__] += 1
+                return func(*args, **kwargs)
+            return wrapper
+
+        get_attr_arrays = extract._get_attr_arrays
+        get_pos_tag_string = extract._get_pos_tag_string
+        extract._get_attr_arrays = counted(get_attr_arrays)
+        extract._get_pos_tag_string = counted(get_pos_tag_string)
+        try:
+            extract.run_plan(self.spacy_doc, plan)
+        finally:
+            extract._get_attr_arrays = get_attr_arrays
+            extract._get_pos_tag_string = get_pos_tag_string
+        self.assertEqual(calls['_get_attr_arrays'], 1)
+        self.assertEqual(calls['_get_pos_tag_string'], 1)
+
+    def test_run_plan_bad_extractor(self):
+        with self.assertRaises(ValueError):
+            extract.run_plan(self.spacy_doc, ['words', 'foo'])
+
+    def test_direct_quotations_same_as_reference(self):
+        for doc in (self.spacy_doc, data.load_spacy('en')(QUOTES_TEXT)):
+            expected = [_positions(triple) for triple in _direct_quotations_reference(doc)]
+            observed = [_positions(triple) for triple in extract.direct_quotations(doc)]
+            self.assertEqual(observed, expected)
+
     @unittest.skip("direct quotation extraction needs to be improved; it fails here")
     def test_direct_quotations(self):
         expected = [
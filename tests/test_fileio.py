@@ -56,6 +56,26 @@ class FileIOTestCase(unittest.TestCase):
                     for tok in doc]
         self.assertEqual(observed, expected)
 
+    def test_read_write_spacy_docs_indexes(self):
+        spacy_docs = [self.spacy_pipeline(sent.text) for sent in self.spacy_doc.sents]
+        expected = [[tok.lemma_ for tok in spacy_docs[i]] for i in (2, 0)]
+        filename = os.path.join(self.tempdir, 'test_read_write_spacy_docs_indexes.bin')
+        fileio.write_spacy_docs(spacy_docs, filename, index=True)
+        self.assertEqual(len(fileio.read_spacy_docs_offsets(filename)), len(spacy_docs) + 1)
+        observed = [[tok.lemma_ for tok in doc] for doc in fileio.read_spacy_docs(
+            self.spacy_pipeline.vocab, filename, indexes=[2, 0])]
+        self.assertEqual(observed, expected)
+
+    def test_read_write_spacy_docs_indexes_empty(self):
+        filename = os.path.join(self.tempdir, 'test_read_write_spacy_docs_indexes_empty.bin')
+        fileio.write_spacy_docs([], filename, index=True)
+        self.assertEqual(list(fileio.read_spacy_docs_offsets(filename)), [0])
+        observed = list(fileio.read_spacy_docs(
+            self.spacy_pipeline.vocab, filename, indexes=[]))
+        self.assertEqual(observed, [])
+        with self.assertRaises(IndexError):
+            list(fileio.read_spacy_docs(self.spacy_pipeline.vocab, filename, indexes=[0]))
+
     def test_read_write_file_lines(self):
         expected = [sent.text for sent in self.spacy_doc.sents]
         filename = os.path.join(self.tempdir, 'test_read_write_file_lines.txt')
@@ -0,0 +1,42 @@
+from __future__ import absolute_import, unicode_literals
+
+import sys
+import unittest
+
+from textacy import texts
+
+TEXTS = [
+    "The year was 2081, and everybody was finally equal.",
+    "They weren't only equal before God and the law.",
+    "They were equal every which way.",
+    "Nobody was smarter than anybody else.",
+    "Nobody was better looking than anybody else.",
+]
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'asyncio ingestion requires Python 3.5+')
+class AsyncCorpusIngestorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        import asyncio
+        from textacy.ingest import AsyncCorpusIngestor
+        self.loop = asyncio.new_event_loop()
+        self.corpus = texts.TextCorpus('en')
+        self.ingestor = AsyncCorpusIngestor(self.corpus, batch_size=2, max_queue_size=2)
+
+    def test_put_flush(self):
+        for i, text in enumerate(TEXTS):
+            self.loop.run_until_complete(self.ingestor.put(text, {'idx': i}))
+        self.loop.run_until_complete(self.ingestor.flush())
+        self.assertEqual([doc.text for doc in self.corpus], TEXTS)
+        self.assertEqual([doc.metadata['idx'] for doc in self.corpus], list(range(len(TEXTS))))
+        self.assertEqual([doc.corpus_index for doc in self.corpus], list(range(len(TEXTS))))
+
+    def test_put_error(self):
+        self.loop.run_until_complete(self.ingestor.put(None))
+        with self.assertRaises(Exception):
+            self.loop.run_until_complete(self.ingestor.flush())
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.ingestor.close())
+        self.loop.close()
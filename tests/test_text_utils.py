@@ -60,6 +60,14 @@ class TextUtilsTestCase(unittest.TestCase):
         for lang, sent in LANG_SENTS:
             self.assertEqual(text_utils.detect_language(sent), lang)
 
+    def test_detect_languages(self):
+        langs, sents = zip(*LANG_SENTS)
+        self.assertEqual(text_utils.detect_languages(sents), list(langs))
+
+    def test_detect_languages_max_n_chars(self):
+        self.assertEqual(text_utils.detect_languages([TEXT], max_n_chars=200),
+                         [text_utils.detect_language(TEXT)])
+
     def test_keyword_in_context(self):
         observed = list(text_utils.keyword_in_context(
             TEXT, 'clinton', ignore_case=True, window_width=50, print_only=False))
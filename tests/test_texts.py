@@ -0,0 +1,624 @@
+from __future__ import absolute_import, unicode_literals
+
+from collections import Counter
+import copy
+import itertools
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from textacy import extract, fileio, spacy_utils, texts
+
+TEXTS = [
+    "The year was 2081, and everybody was finally equal.",
+    "They weren't only equal before God and the law.",
+    "They were equal every which way.",
+    "Nobody was smarter than anybody else.",
+    "Nobody was better looking than anybody else.",
+]
+METADATA = [
+    {'idx': 0, 'speaker': 'Kurt', 'year': 2081},
+    {'idx': 1, 'speaker': 'Diana', 'year': 2081},
+    {'idx': 2, 'speaker': 'Kurt', 'year': 2082},
+    {'idx': 3, 'speaker': 'Harrison', 'year': 2083},
+    {'idx': 4, 'speaker': 'Kurt', 'year': 2084},
+]
+
+
+class TextCorpusTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = texts.TextCorpus.from_texts(
+            'en', TEXTS, metadata=[dict(md) for md in METADATA])
+
+    def test_from_texts_n_processes(self):
+        corpus = texts.TextCorpus.from_texts(
+            'en', TEXTS, metadata=[dict(md) for md in METADATA],
+            batch_size=2, n_processes=2)
+        self.assertEqual(corpus.n_docs, self.corpus.n_docs)
+        self.assertEqual(corpus.n_tokens, self.corpus.n_tokens)
+        for doc, expected in zip(corpus, self.corpus):
+            self.assertEqual(doc.metadata, expected.metadata)
+            self.assertEqual(
+                [(tok.orth_, tok.lemma_, tok.tag_, tok.dep_) for tok in doc],
+                [(tok.orth_, tok.lemma_, tok.tag_, tok.dep_) for tok in expected])
+            self.assertEqual(
+                [(ent.text, ent.label_) for ent in doc.spacy_doc.ents],
+                [(ent.text, ent.label_) for ent in expected.spacy_doc.ents])
+            # docs were deserialized against the corpus' vocab, so string ids match
+            self.assertEqual([(tok.orth, tok.lemma) for tok in doc],
+                             [(tok.orth, tok.lemma) for tok in expected])
+            self.assertEqual(doc.spacy_doc.to_bytes(), expected.spacy_doc.to_bytes())
+
+    def test_from_texts_n_processes_unpicklable(self):
+        # workers only get ``lang``, so a lang that can't be pickled forces
+        # parsing in this process, with the corpus' own pipeline
+        spacy_docs = texts._pipe_multiprocess(
+            lambda: 'en', TEXTS, self.corpus.spacy_pipeline, batch_size=2, n_processes=2)
+        self.assertEqual([spacy_doc.text for spacy_doc in spacy_docs],
+                         [doc.text for doc in self.corpus])
+
+    def test_add_doc_copy(self):
+        doc = self.corpus[0]
+        doc.term_counts()
+        doc.n_paragraphs()
+        other_corpus = texts.TextCorpus('en')
+        other_corpus.add_doc(doc, print_warning=False)
+        doc_copy = other_corpus[0]
+        self.assertIsNot(doc_copy, doc)
+        self.assertIs(doc_copy.spacy_doc, doc.spacy_doc)
+        self.assertIs(doc.corpus, self.corpus)
+        self.assertEqual(doc.corpus_index, 0)
+        self.assertIs(doc_copy.corpus, other_corpus)
+        self.assertEqual(doc_copy.corpus_index, 0)
+        # metadata and caches are the copy's own
+        self.assertEqual(doc_copy.metadata, doc.metadata)
+        doc_copy.metadata['speaker'] = 'Vonnegut'
+        self.assertEqual(doc.metadata['speaker'], 'Kurt')
+        self.assertIsNone(doc_copy._cache)
+        self.assertEqual(doc_copy._term_index, {})
+        self.assertIsNone(doc_copy._n_paragraphs)
+        doc_copy.words()
+        self.assertIsNot(doc_copy._cache, doc._cache)
+        self.assertEqual(list(doc_copy.words()), list(doc.words()))
+
+    def test_copy_doc(self):
+        doc = self.corpus[1]
+        doc.term_positions('equal')
+        doc_copy = copy.copy(doc)
+        self.assertIsNot(doc_copy.metadata, doc.metadata)
+        self.assertIsNot(doc_copy._term_index, doc._term_index)
+        self.assertEqual(doc_copy.term_positions('equal'), doc.term_positions('equal'))
+
+    def test_view(self):
+        view = self.corpus.view(lambda doc: doc.metadata['speaker'] == 'Kurt')
+        self.assertEqual(len(view), 3)
+        self.assertEqual([doc.metadata['idx'] for doc in view], [0, 2, 4])
+        self.assertIs(view[1], self.corpus[2])
+        self.assertEqual(view.indexes.tolist(), [0, 2, 4])
+
+    def test_view_docs_not_copied(self):
+        view = self.corpus.view([1, 3])
+        for doc, index in zip(view, [1, 3]):
+            self.assertIs(doc, self.corpus[index])
+            self.assertIs(doc.corpus, self.corpus)
+            self.assertEqual(doc.corpus_index, index)
+
+    def test_view_slice(self):
+        view = self.corpus.view([4, 3, 2, 1])
+        self.assertIsInstance(self.corpus[1:3], list)
+        self.assertIsInstance(view[1:3], list)
+        self.assertEqual(view[1:3], [self.corpus[3], self.corpus[2]])
+        self.assertEqual(view[::-1], self.corpus[1:])
+
+    def test_view_of_view(self):
+        view = self.corpus.view([0, 2, 3, 4])
+        subview = view.view([1, 3])
+        self.assertIs(subview.textcorpus, self.corpus)
+        self.assertEqual(subview.indexes.tolist(), [2, 4])
+
+    def test_view_remove_docs(self):
+        view = self.corpus.view()
+        view.remove_docs([0, 1])
+        self.assertEqual(len(view), 3)
+        self.assertEqual(len(self.corpus), 5)
+        self.assertEqual([doc.metadata['idx'] for doc in view], [2, 3, 4])
+
+    def test_view_after_parent_remove_docs(self):
+        view = self.corpus.view([2, 3])
+        self.assertEqual(view[0].metadata['idx'], 2)
+        self.corpus.remove_docs([0])
+        with self.assertRaises(ValueError):
+            view[0]
+        with self.assertRaises(ValueError):
+            list(view)
+        with self.assertRaises(ValueError):
+            view.view([0])
+        view = self.corpus.view([1, 2])
+        self.assertEqual([doc.metadata['idx'] for doc in view], [2, 3])
+
+    def test_view_query(self):
+        view = self.corpus.view([4, 3, 2, 0])
+        expected = [doc.metadata['idx'] for doc in view.query(speaker='Kurt', year__gt=2081)]
+        self.assertEqual(expected, [4, 2])
+        view.add_metadata_index('speaker')
+        view.add_metadata_index('year', kind='sorted')
+        self.assertEqual(
+            [doc.metadata['idx'] for doc in view.query(speaker='Kurt', year__gt=2081)], expected)
+        self.assertEqual([doc.metadata['idx'] for doc in view.query(year__lte=2083)], [3, 2, 0])
+        # indexes are rebuilt when docs are removed from the view
+        view.remove_docs([0])
+        self.assertEqual([doc.metadata['idx'] for doc in view.query(speaker='Kurt')], [2, 0])
+
+    def test_view_memory_usage(self):
+        view = self.corpus.view([1, 3])
+        for doc in self.corpus:
+            doc.term_counts()
+        usage = view.memory_usage()
+        self.assertEqual(usage['total'], sum(nbytes for component, nbytes in usage.items()
+                                             if component != 'total'))
+        corpus_usage = self.corpus.memory_usage()
+        self.assertLess(usage['spacy_docs'], corpus_usage['spacy_docs'])
+        self.assertLess(usage['doc_caches'], corpus_usage['doc_caches'])
+        self.assertGreater(usage['doc_caches'], 0)
+        # evicting the view's caches leaves the rest of the corpus' caches alone
+        view.set_memory_budget(0)
+        view.enforce_memory_budget()
+        self.assertEqual([doc._cache is None for doc in self.corpus],
+                         [False, True, False, True, False])
+
+    def _assert_same_stats(self, corpus, expected_texts):
+        expected = texts.TextCorpus.from_texts('en', expected_texts)
+        self.assertEqual(corpus.n_docs, expected.n_docs)
+        self.assertEqual(corpus.n_sents, expected.n_sents)
+        self.assertEqual(corpus.n_tokens, expected.n_tokens)
+        for attr in ('doc_freqs', 'term_freqs'):
+            freqs = getattr(corpus, attr)
+            expected_freqs = getattr(expected, attr)
+            self.assertEqual(
+                {i: freqs[i] for i in np.flatnonzero(freqs)},
+                {i: expected_freqs[i] for i in np.flatnonzero(expected_freqs)})
+
+    def test_remove_docs_mask(self):
+        self.corpus.doc_freqs  # compute stats before removal
+        docs = list(self.corpus)
+        self.corpus.remove_docs(np.array([True, False, True, False, False]))
+        self.assertEqual([doc.metadata['idx'] for doc in self.corpus], [1, 3, 4])
+        self.assertEqual([doc.corpus_index for doc in self.corpus], [0, 1, 2])
+        self.assertEqual(list(self.corpus), [docs[1], docs[3], docs[4]])
+        self.assertEqual(len(self.corpus._docs_term_counts), 3)
+        self._assert_same_stats(self.corpus, [TEXTS[1], TEXTS[3], TEXTS[4]])
+
+    def test_remove_docs_indexes_limit(self):
+        self.corpus.remove_docs([4, 0, 2], limit=2)
+        self.assertEqual([doc.metadata['idx'] for doc in self.corpus], [1, 3, 4])
+        self._assert_same_stats(self.corpus, [TEXTS[1], TEXTS[3], TEXTS[4]])
+
+    def test_remove_docs_func_limit(self):
+        self.corpus.remove_docs(lambda doc: doc.metadata['speaker'] == 'Kurt', limit=2)
+        self.assertEqual([doc.metadata['idx'] for doc in self.corpus], [1, 3, 4])
+        self.assertEqual([doc.corpus_index for doc in self.corpus], [0, 1, 2])
+
+    def test_remove_docs_all(self):
+        self.corpus.remove_docs(lambda doc: True)
+        self.assertEqual(self.corpus.n_docs, 0)
+        self.assertEqual(self.corpus.n_tokens, 0)
+        self.assertEqual(self.corpus.n_sents, 0)
+        self.assertEqual(np.count_nonzero(self.corpus.doc_freqs), 0)
+
+    def test_remove_docs_bad_mask(self):
+        with self.assertRaises(ValueError):
+            self.corpus.remove_docs(np.array([True, False]))
+        self.assertEqual(self.corpus.n_docs, 5)
+
+    def _query_idxs(self, **conditions):
+        return [doc.metadata['idx'] for doc in self.corpus.query(**conditions)]
+
+    def test_query_unindexed(self):
+        self.assertEqual(self._query_idxs(speaker='Kurt'), [0, 2, 4])
+        self.assertEqual(self._query_idxs(speaker='Kurt', year__gt=2081), [2, 4])
+        self.assertEqual(self._query_idxs(speaker__in=['Diana', 'Harrison']), [1, 3])
+        self.assertEqual(self._query_idxs(speaker='Nobody'), [])
+
+    def test_query_hash_index(self):
+        self.corpus.add_metadata_index('speaker')
+        self.assertEqual(self._query_idxs(speaker='Kurt'), [0, 2, 4])
+        self.assertEqual(self._query_idxs(speaker__in=['Harrison', 'Diana']), [1, 3])
+        self.assertEqual(self._query_idxs(speaker='Nobody'), [])
+        # range lookups aren't supported by hash indexes, so are checked doc by doc
+        self.assertEqual(self._query_idxs(speaker__gt='Harrison'), [0, 2, 4])
+        # indexed and unindexed conditions combine
+        self.assertEqual(self._query_idxs(speaker='Kurt', year__lte=2082), [0, 2])
+        self.assertEqual(
+            [doc.metadata['idx'] for doc in self.corpus.query(limit=2, speaker='Kurt')], [0, 2])
+
+    def test_query_sorted_index(self):
+        self.corpus.add_metadata_index('year', kind='sorted')
+        self.assertEqual(self._query_idxs(year=2081), [0, 1])
+        self.assertEqual(self._query_idxs(year__gt=2081), [2, 3, 4])
+        self.assertEqual(self._query_idxs(year__gte=2082, year__lt=2084), [2, 3])
+        self.assertEqual(self._query_idxs(year__lte=2082), [0, 1, 2])
+        self.assertEqual(self._query_idxs(year__in=[2084, 2081]), [0, 1, 4])
+        self.assertEqual(self._query_idxs(year__lt=2081), [])
+
+    def test_query_same_as_unindexed(self):
+        conditions = [{'speaker': 'Kurt'}, {'year__gte': 2082}, {'year__in': [2081, 2083]},
+                      {'speaker__in': ['Kurt', 'Diana'], 'year__lt': 2084},
+                      # values not comparable with those indexed
+                      {'year__gt': 'x'}, {'year': 'x'}, {'year__in': ['x', 2081]},
+                      {'speaker__lte': 2081}]
+        expected = [self._query_idxs(**cond) for cond in conditions]
+        self.corpus.add_metadata_index('speaker')
+        self.corpus.add_metadata_index('year', kind='sorted')
+        self.assertEqual([self._query_idxs(**cond) for cond in conditions], expected)
+
+    def test_query_index_add_doc(self):
+        self.corpus.add_metadata_index('speaker')
+        self.corpus.add_metadata_index('year', kind='sorted')
+        self.corpus.add_text('So they were all equal.', lang='en',
+                             metadata={'idx': 5, 'speaker': 'Kurt', 'year': 2081})
+        self.assertEqual(self._query_idxs(speaker='Kurt'), [0, 2, 4, 5])
+        self.assertEqual(self._query_idxs(year=2081), [0, 1, 5])
+
+    def test_query_index_remove_docs(self):
+        self.corpus.add_metadata_index('speaker')
+        self.corpus.add_metadata_index('year', kind='sorted')
+        self.corpus.remove_docs([0, 3])
+        self.assertEqual(self._query_idxs(speaker='Kurt'), [2, 4])
+        self.assertEqual(self._query_idxs(year__lte=2083), [1, 2])
+        self.assertEqual(self._query_idxs(speaker='Harrison'), [])
+        # results are the docs at their new positions in corpus
+        self.assertEqual([doc.corpus_index for doc in self.corpus.query(speaker='Kurt')], [1, 2])
+
+    def test_query_index_missing_values(self):
+        self.corpus.add_text('So they were all equal.', lang='en', metadata={'idx': 5})
+        self.corpus.add_metadata_index('speaker')
+        self.corpus.add_metadata_index('year', kind='sorted')
+        self.assertEqual(self._query_idxs(speaker='Kurt'), [0, 2, 4])
+        self.assertEqual(self._query_idxs(year__gte=2081), [0, 1, 2, 3, 4])
+
+    def test_add_metadata_index_bad_kind(self):
+        with self.assertRaises(ValueError):
+            self.corpus.add_metadata_index('speaker', kind='btree')
+
+    def _as_dict(self, doc_term_matrix, id_to_term):
+        doc_term_matrix = doc_term_matrix.tocoo()
+        return {(row, id_to_term[col]): value for row, col, value
+                in zip(doc_term_matrix.row, doc_term_matrix.col, doc_term_matrix.data)}
+
+    def test_as_doc_term_matrix(self):
+        get_terms = {True: lambda tok: tok.lemma_,
+                     False: lambda tok: tok.text,
+                     'auto': spacy_utils.normalized_str}
+        word_kwargs = [{}, {'filter_stops': False, 'filter_nums': True},
+                       {'good_pos_tags': {'NOUN', 'ADJ'}}, {'bad_pos_tags': {'NOUN'}}]
+        for lemmatize, get_term in get_terms.items():
+            for kwargs in word_kwargs:
+                terms_lists = [[get_term(tok) for tok in doc.words(**kwargs)]
+                               for doc in self.corpus]
+                expected = self._as_dict(*self.corpus.as_doc_term_matrix(
+                    terms_lists, weighting='tf', normalize=False))
+                observed = self._as_dict(*self.corpus.as_doc_term_matrix(
+                    lemmatize=lemmatize, weighting='tf', normalize=False, **kwargs))
+                self.assertEqual(observed, expected)
+
+    def test_as_doc_term_matrix_weighting(self):
+        terms_lists = [[spacy_utils.normalized_str(tok) for tok in doc.words()]
+                       for doc in self.corpus]
+        expected = self._as_dict(*self.corpus.as_doc_term_matrix(
+            terms_lists, weighting='tfidf', normalize=True, min_df=2))
+        doc_term_matrix, id_to_term = self.corpus.as_doc_term_matrix(
+            weighting='tfidf', normalize=True, min_df=2)
+        self.assertIs(self.corpus.doc_term_matrix, doc_term_matrix)
+        self.assertIs(self.corpus.id_to_term, id_to_term)
+        self.assertEqual(doc_term_matrix.shape[0], self.corpus.n_docs)
+        observed = self._as_dict(doc_term_matrix, id_to_term)
+        self.assertEqual(set(observed), set(expected))
+        for key, value in expected.items():
+            self.assertAlmostEqual(observed[key], value)
+
+
+class TextDocTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.doc = texts.TextDoc(' '.join(TEXTS), lang='en')
+
+    def test_term_count(self):
+        self.assertEqual(self.doc.term_count('equal'), 3)
+        self.assertEqual(self.doc.term_count('anybody else'), 2)
+        self.assertEqual(self.doc.term_count(self.doc[-2]), 2)
+        self.assertEqual(self.doc.term_positions('anybody else'), [33, 41])
+
+    def test_term_count_miss(self):
+        n_strings = len(self.doc.spacy_stringstore)
+        self.assertEqual(self.doc.term_count('zzyzx'), 0)
+        self.assertEqual(self.doc.term_positions('zzyzx'), [])
+        self.assertEqual(len(self.doc.spacy_stringstore), n_strings)
+        # substrings of words aren't terms
+        self.assertEqual(self.doc.term_count('body'), 0)
+        self.assertEqual(self.doc.term_count('body', fallback=True), 5)
+
+    def test_term_counts_same_as_extract(self):
+        spacy_doc = self.doc.spacy_doc
+        get_strs = {'auto': spacy_utils.normalized_str,
+                    True: lambda term: term.lemma_,
+                    False: lambda term: term.orth_}
+        for lemmatize, get_str in get_strs.items():
+            term_counts = self.doc.term_counts(lemmatize=lemmatize, ngram_range=(1, 3))
+            observed = {self.doc.spacy_stringstore[term_id]: count
+                        for term_id, count in term_counts.items()}
+            expected = Counter(get_str(term) for term in itertools.chain(
+                extract.words(spacy_doc), extract.ngrams(spacy_doc, 2),
+                extract.ngrams(spacy_doc, 3)))
+            self.assertEqual(observed, dict(expected), msg=lemmatize)
+
+
+class LazyTextDocTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.spacy_pipeline = texts.data.load_spacy('en')
+        self.text = ' '.join(TEXTS)
+        self.doc = texts.TextDoc(self.text, spacy_pipeline=self.spacy_pipeline,
+                                 lang='en', lazy=True)
+        self.eager_doc = texts.TextDoc(self.text, spacy_pipeline=self.spacy_pipeline,
+                                       lang='en')
+
+    def test_lazy_init(self):
+        self.assertEqual(self.doc.processed_stages, frozenset())
+        self.assertEqual(self.doc.text, self.eager_doc.text)
+        self.assertEqual(self.doc.n_tokens, self.eager_doc.n_tokens)
+        self.assertEqual([tok.text for tok in self.doc.words(filter_stops=False)],
+                         [tok.text for tok in self.eager_doc.words(filter_stops=False)])
+        self.assertEqual(self.doc.processed_stages, frozenset())
+
+    def test_process(self):
+        self.doc.process('parse')
+        self.assertEqual(self.doc.processed_stages, frozenset(['tag', 'parse']))
+        self.assertIsNotNone(self.doc._spacy_pipeline)
+        self.doc.process()
+        self.assertEqual(self.doc.processed_stages, frozenset(texts.PIPELINE_STAGES))
+        self.assertIsNone(self.doc._spacy_pipeline)
+
+    def test_process_invalid_stage(self):
+        self.assertRaises(ValueError, self.doc.process, 'lemmatize')
+
+    def test_words_ngrams_min_freq(self):
+        self.assertEqual(
+            [tok.text for tok in self.doc.words(min_freq=2)],
+            [tok.text for tok in self.eager_doc.words(min_freq=2)])
+        self.assertIn('tag', self.doc.processed_stages)
+        doc = texts.TextDoc(self.text, spacy_pipeline=self.spacy_pipeline,
+                            lang='en', lazy=True)
+        self.assertEqual(
+            [span.text for span in doc.ngrams(2, filter_stops=False, min_freq=2)],
+            [span.text for span in self.eager_doc.ngrams(2, filter_stops=False, min_freq=2)])
+        self.assertIn('tag', doc.processed_stages)
+
+    def test_same_as_eager(self):
+        self.assertEqual([sent.text for sent in self.doc.sents],
+                         [sent.text for sent in self.eager_doc.sents])
+        self.assertEqual([ent.text for ent in self.doc.named_entities()],
+                         [ent.text for ent in self.eager_doc.named_entities()])
+        self.assertEqual(self.doc.term_counts(), self.eager_doc.term_counts())
+        self.assertEqual([(tok.tag_, tok.dep_, tok.ent_type_) for tok in self.doc],
+                         [(tok.tag_, tok.dep_, tok.ent_type_) for tok in self.eager_doc])
+
+    def test_add_to_corpus(self):
+        corpus = texts.TextCorpus('en')
+        corpus.add_doc(self.doc)
+        self.assertEqual(corpus.n_tokens, self.eager_doc.n_tokens)
+        self.assertEqual(self.doc.processed_stages, frozenset())
+        self.assertEqual(corpus.n_sents, self.eager_doc.n_sents)
+        self.assertIn('parse', self.doc.processed_stages)
+
+
+class MemoryBudgetTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = texts.TextCorpus.from_texts(
+            'en', TEXTS, metadata=[dict(md) for md in METADATA])
+        self.tempdir = tempfile.mkdtemp(
+            prefix='test_texts', dir=os.path.dirname(os.path.abspath(__file__)))
+        self.spill_filename = os.path.join(self.tempdir, 'spill.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def _get_contents(self, doc):
+        return (doc.text, [(tok.orth_, tok.lemma_, tok.tag_) for tok in doc],
+                [tok.text for tok in doc.words()], doc.spacy_doc.to_bytes())
+
+    def test_doc_spill_store(self):
+        store = texts.DocSpillStore(self.spill_filename)
+        self.assertEqual(store.append(self.corpus[3].spacy_doc), 0)
+        self.assertEqual(store.append(self.corpus[1].spacy_doc), 1)
+        for index, doc in ((1, self.corpus[1]), (0, self.corpus[3])):
+            spacy_doc = store.load(index, self.corpus.spacy_vocab)
+            self.assertEqual(spacy_doc.to_bytes(), doc.spacy_doc.to_bytes())
+        # store is truncated on creation
+        store = texts.DocSpillStore(self.spill_filename)
+        self.assertEqual(os.path.getsize(self.spill_filename), 0)
+
+    def test_spill(self):
+        store = texts.DocSpillStore(self.spill_filename)
+        doc = self.corpus[2]
+        expected = self._get_contents(doc)
+        doc.spill(store)
+        self.assertTrue(doc.is_spilled)
+        self.assertIsNone(doc._cache)
+        self.assertEqual(self._get_contents(doc), expected)
+        self.assertFalse(doc.is_spilled)
+        # re-spilling an unchanged doc to the same store doesn't write it again
+        nbytes = os.path.getsize(self.spill_filename)
+        doc.spill(store)
+        self.assertEqual(os.path.getsize(self.spill_filename), nbytes)
+        self.assertEqual(self._get_contents(doc), expected)
+        # but spilling it to another store does
+        other_store = texts.DocSpillStore(os.path.join(self.tempdir, 'other_spill.bin'))
+        doc.spill(other_store)
+        self.assertEqual(os.path.getsize(other_store.filename), nbytes)
+        self.assertEqual(self._get_contents(doc), expected)
+
+    def test_memory_usage(self):
+        usage = self.corpus.memory_usage()
+        empty_caches_nbytes = usage['doc_caches']
+        self.assertEqual(
+            set(usage),
+            {'spacy_docs', 'spacy_vocab', 'doc_caches', 'docs', 'corpus_stats',
+             'doc_term_matrix', 'total'})
+        self.assertEqual(usage['total'], sum(nbytes for component, nbytes in usage.items()
+                                             if component != 'total'))
+        self.assertGreater(usage['spacy_docs'], 0)
+        self.assertEqual(usage['doc_term_matrix'], 0)
+        for doc in self.corpus:
+            doc.term_counts()
+        self.assertGreater(self.corpus.memory_usage()['doc_caches'], usage['doc_caches'])
+        store = texts.DocSpillStore(self.spill_filename)
+        for doc in self.corpus:
+            doc.spill(store)
+        usage = self.corpus.memory_usage()
+        self.assertEqual(usage['spacy_docs'], 0)
+        self.assertEqual(usage['doc_caches'], empty_caches_nbytes)
+
+    def test_enforce_memory_budget_no_budget(self):
+        self.corpus[0].term_counts()
+        self.corpus.enforce_memory_budget()
+        self.assertIsNotNone(self.corpus[0]._cache)
+
+    def test_enforce_memory_budget_evict_caches(self):
+        empty_caches_nbytes = self.corpus.memory_usage()['doc_caches']
+        expected = [self._get_contents(doc) for doc in self.corpus]
+        self.corpus.as_doc_term_matrix()
+        usage = self.corpus.memory_usage()
+        self.assertGreater(usage['doc_caches'], empty_caches_nbytes)
+        self.assertGreater(usage['doc_term_matrix'], 0)
+        # without a spill file, docs are never spilled, however far over budget
+        self.corpus.set_memory_budget(usage['total'] - 1)
+        self.corpus.enforce_memory_budget()
+        usage = self.corpus.memory_usage()
+        self.assertEqual(usage['doc_caches'], empty_caches_nbytes)
+        self.assertEqual(usage['doc_term_matrix'], 0)
+        self.assertIsNone(self.corpus.doc_term_matrix)
+        self.assertFalse(any(doc.is_spilled for doc in self.corpus))
+        self.assertEqual([self._get_contents(doc) for doc in self.corpus], expected)
+
+    def test_enforce_memory_budget_spill(self):
+        expected = [self._get_contents(doc) for doc in self.corpus]
+        n_tokens = self.corpus.n_tokens
+        self.corpus.set_memory_budget(0, spill_filename=self.spill_filename)
+        self.corpus.enforce_memory_budget()
+        self.assertTrue(all(doc.is_spilled for doc in self.corpus))
+        self.assertEqual(self.corpus.memory_usage()['spacy_docs'], 0)
+        self.assertEqual([self._get_contents(doc) for doc in self.corpus], expected)
+        self.assertEqual(self.corpus.n_tokens, n_tokens)
+
+    def test_set_memory_budget_add_doc(self):
+        corpus = texts.TextCorpus('en')
+        corpus.set_memory_budget(0, spill_filename=self.spill_filename, check_every=2)
+        for text in TEXTS[:3]:
+            corpus.add_text(text, lang='en')
+        self.assertEqual([doc.is_spilled for doc in corpus], [True, True, False])
+        self.assertEqual([doc.text for doc in corpus], TEXTS[:3])
+        corpus.set_memory_budget(None)
+        corpus.add_text(TEXTS[3], lang='en')
+        self.assertEqual([doc.is_spilled for doc in corpus], [False, False, False, False])
+
+
+class DiskTextCorpusTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp(
+            prefix='test_texts', dir=os.path.dirname(os.path.abspath(__file__)))
+        self.filename = os.path.join(self.tempdir, 'corpus.bin')
+        self.corpus = texts.DiskTextCorpus.from_texts(
+            'en', TEXTS, self.filename, metadata=[dict(md) for md in METADATA],
+            cache_size=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_from_texts(self):
+        self.assertEqual(len(self.corpus), len(TEXTS))
+        self.assertEqual([doc.text for doc in self.corpus], TEXTS)
+        self.assertEqual([doc.metadata for doc in self.corpus], METADATA)
+        self.assertEqual([doc.corpus_index for doc in self.corpus], list(range(len(TEXTS))))
+        self.assertEqual(self.corpus[3].text, TEXTS[3])
+        self.assertEqual(self.corpus[-1].text, TEXTS[-1])
+        self.assertEqual([doc.text for doc in self.corpus[1:3]], TEXTS[1:3])
+        self.assertRaises(IndexError, self.corpus.__getitem__, len(TEXTS))
+        self.assertEqual(len(fileio.read_spacy_docs_offsets(self.filename)), len(TEXTS) + 1)
+
+    def test_reopen(self):
+        corpus = texts.DiskTextCorpus('en', self.filename)
+        self.assertEqual(len(corpus), len(TEXTS))
+        self.assertEqual([doc.text for doc in corpus], TEXTS)
+        self.assertEqual(corpus.n_tokens, sum(doc.n_tokens for doc in self.corpus))
+        self.assertEqual(corpus.n_sents, texts.TextCorpus.from_texts('en', TEXTS).n_sents)
+
+    def test_add_text(self):
+        self.corpus.add_text('So they were all equal.', lang='en', metadata={'idx': 5})
+        self.assertEqual(len(self.corpus), len(TEXTS) + 1)
+        self.assertEqual(self.corpus[-1].text, 'So they were all equal.')
+        corpus = texts.DiskTextCorpus('en', self.filename)
+        self.assertEqual(corpus[len(TEXTS)].metadata, {'idx': 5})
+
+    def test_reopen_n_tokens(self):
+        corpus = texts.DiskTextCorpus('en', self.filename)
+        self.assertEqual(corpus.n_tokens, sum(doc.n_tokens for doc in self.corpus))
+        # counting tokens doesn't count terms
+        self.assertIsNone(corpus._doc_freqs)
+        self.assertIsNone(corpus._n_sents)
+
+    def test_add_doc_unserializable_metadata(self):
+        doc = texts.TextDoc('So they were all equal.', lang='en', metadata={'x': object()})
+        self.assertRaises(TypeError, self.corpus.add_doc, doc)
+        self.assertEqual(len(self.corpus), len(TEXTS))
+        corpus = texts.DiskTextCorpus('en', self.filename)
+        self.assertEqual(len(corpus), len(TEXTS))
+        self.assertEqual(len(fileio.read_spacy_docs_offsets(self.filename)), len(TEXTS) + 1)
+        self.corpus.add_text('So they were all equal.', lang='en', metadata={'idx': 5})
+        corpus = texts.DiskTextCorpus('en', self.filename)
+        self.assertEqual(corpus[-1].text, 'So they were all equal.')
+        self.assertEqual(corpus[-1].metadata, {'idx': 5})
+
+    def test_load_lazy(self):
+        filename = os.path.join(self.tempdir, 'saved.bin')
+        texts.TextCorpus.from_texts('en', TEXTS, metadata=METADATA).save(filename)
+        corpus = texts.TextCorpus.load('en', filename, lazy=True)
+        self.assertIsInstance(corpus, texts.DiskTextCorpus)
+        self.assertEqual([doc.text for doc in corpus], TEXTS)
+        self.assertEqual([doc.metadata for doc in corpus.query(speaker='Kurt')],
+                         [METADATA[0], METADATA[2], METADATA[4]])
+
+    def test_empty(self):
+        filename = os.path.join(self.tempdir, 'empty.bin')
+        corpus = texts.DiskTextCorpus('en', filename)
+        self.assertEqual(len(corpus), 0)
+        self.assertEqual(corpus.n_tokens, 0)
+        self.assertFalse(os.path.exists(filename))
+        self.assertFalse(os.path.exists(filename + '.idx'))
+        corpus.add_text(TEXTS[0], lang='en')
+        self.assertEqual(len(fileio.read_spacy_docs_offsets(filename)), 2)
+        self.assertEqual(texts.DiskTextCorpus('en', filename)[0].text, TEXTS[0])
+
+    def test_stale_index(self):
+        spacy_docs = [doc.spacy_doc for doc in self.corpus]
+        # rewrite the docs file without its index, which is now out-of-date
+        fileio.write_spacy_docs(spacy_docs[:3], self.filename, index=False)
+        fileio.write_json_lines(METADATA[:3], self.filename + '.metadata.json')
+        self.assertRaises(ValueError, fileio.read_spacy_docs_offsets, self.filename)
+        corpus = texts.DiskTextCorpus('en', self.filename)
+        self.assertEqual(len(corpus), 3)
+        self.assertEqual([doc.text for doc in corpus], TEXTS[:3])
+        self.assertEqual(len(fileio.read_spacy_docs_offsets(self.filename)), 4)
+
+    def test_metadata_mismatch(self):
+        fileio.write_json_lines(METADATA[:2], self.filename + '.metadata.json')
+        self.assertRaises(ValueError, texts.DiskTextCorpus, 'en', self.filename)
+
+    def test_remove_docs(self):
+        self.assertRaises(NotImplementedError, self.corpus.remove_doc, 0)
+        self.assertRaises(NotImplementedError, self.corpus.remove_docs, [0])
@@ -2,6 +2,7 @@ from __future__ import absolute_import
 
 import logging
 import os
+import sys
 
 __version__ = '0.2.2'
 __data_dir__ = os.path.join(os.path.dirname(__file__), 'resources')
@@ -21,7 +22,9 @@ from textacy import export, keyterms
 from textacy import texts
 
 from textacy.data import load_spacy
-from textacy.texts import TextDoc, TextCorpus
+from textacy.texts import TextDoc, TextCorpus, TextCorpusView, DiskTextCorpus
+if sys.version_info >= (3, 5):
+    from textacy.ingest import AsyncCorpusIngestor
 
 logger = logging.getLogger('textacy')
 if len(logger.handlers) == 0:  # To ensure reload() doesn't add another one
@@ -7,8 +7,10 @@ if PY2:
     from itertools import izip
     zip = izip
     str = unicode
+    unichr = unichr
     bzip_open = bz2.BZ2File
 else:
     zip = zip
     str = str
+    unichr = chr
     bzip_open = bz2.open
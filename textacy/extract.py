@@ -6,22 +6,41 @@ triples, and acronyms.
 """
 from __future__ import absolute_import, division, print_function, unicode_literals
 
-from collections import defaultdict
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
 from itertools import takewhile
 from operator import itemgetter
 import re
+import threading
+import types
+import weakref
 
+from cachetools import LRUCache
 from cytoolz import itertoolz
-from numpy import nanmin, nanmax, zeros, NaN
-from spacy.parts_of_speech import CONJ, DET, NOUN, VERB
-
-from textacy import spacy_utils, text_utils
-from textacy.spacy_utils import (normalized_str, get_main_verbs_of_sent,
+import numpy as np
+from spacy import attrs
+from spacy.parts_of_speech import CONJ, DET, NOUN, PROPN, VERB
+from spacy.tokens.span import Span as sspan
+
+from textacy import fileio, spacy_utils, text_utils
+from textacy.compat import unichr
+from textacy.spacy_utils import (get_main_verbs_of_sent,
                                  get_subjects_of_verb, get_objects_of_verb,
                                  get_span_for_compound_noun,
                                  get_span_for_verb_auxiliaries)
 from textacy.regexes_etc import NUMERIC_NE_TYPES, REPORTING_VERBS
 
+# POS tags are matched as single characters, one per token; universal tags
+# get theirs up front, any others as they're first seen in a pattern or doc
+_POS_TAG_CHARS = {tag: unichr(0x100 + i) for i, tag in enumerate(
+    ('', 'ADJ', 'ADP', 'ADV', 'AUX', 'CONJ', 'CCONJ', 'DET', 'INTJ', 'NOUN', 'NUM',
+     'PART', 'PRON', 'PROPN', 'PUNCT', 'SCONJ', 'SYM', 'VERB', 'X', 'EOL', 'SPACE'))}
+_POS_TAG_CHARS_LOCK = threading.Lock()
+# compiled patterns are cached, as are docs' tag strings for as long as
+# the docs themselves are alive
+_POS_REGEX_CACHE = LRUCache(maxsize=256)
+_POS_TAG_STRING_CACHE = weakref.WeakKeyDictionary()
+
 
 def words(doc,
           filter_stops=True, filter_punct=True, filter_nums=False,
@@ -47,25 +66,19 @@ def words(doc,
         ``spacy.Token``: the next token from ``doc`` passing specified filters
             in order of appearance in the document
     """
-    words_ = (w for w in doc if not w.is_space)
+    doc_data = _get_doc_data(doc)
+    doc = doc_data.doc
+    is_bad, is_stop = doc_data.token_filter_masks(
+        filter_punct, filter_nums, good_pos_tags, bad_pos_tags)
     if filter_stops is True:
-        words_ = (w for w in words_ if not w.is_stop)
-    if filter_punct is True:
-        words_ = (w for w in words_ if not w.is_punct)
-    if filter_nums is True:
-        words_ = (w for w in words_ if not w.like_num)
-    if good_pos_tags:
-        words_ = (w for w in words_ if w.pos_ in good_pos_tags)
-    if bad_pos_tags:
-        words_ = (w for w in words_ if w.pos_ not in bad_pos_tags)
+        is_bad = is_bad | is_stop
+    idxs = np.flatnonzero(~is_bad)
     if min_freq > 1:
-        words_ = list(words_)
-        freqs = itertoolz.frequencies(normalized_str(w) for w in words_)
-        words_ = (w for w in words_
-                  if freqs[normalized_str(w)] >= min_freq)
+        norm_ids = doc_data.normalized_ids()
+        idxs = idxs[_get_row_freqs(norm_ids[idxs, None]) >= min_freq]
 
-    for word in words_:
-        yield word
+    for i in idxs.tolist():
+        yield doc[i]
 
 
 def ngrams(doc, n,
@@ -104,33 +117,219 @@ def ngrams(doc, n,
     if n < 1:
         raise ValueError('n must be greater than or equal to 1')
 
-    ngrams_ = (doc[i: i + n]
-               for i in range(len(doc) - n + 1))
-    ngrams_ = (ngram for ngram in ngrams_
-               if not any(w.is_space for w in ngram))
+    # n-grams can't contain any bad tokens, nor start or end with a stop word;
+    # only spans for the n-grams that pass all filters are created
+    doc_data = _get_doc_data(doc)
+    doc = doc_data.doc
+    is_bad, is_stop = doc_data.token_filter_masks(
+        filter_punct, filter_nums, good_pos_tags, bad_pos_tags)
+    starts = _get_ngram_starts(n, is_bad)
     if filter_stops is True:
-        ngrams_ = (ngram for ngram in ngrams_
-                   if not ngram[0].is_stop and not ngram[-1].is_stop)
-    if filter_punct is True:
-        ngrams_ = (ngram for ngram in ngrams_
-                   if not any(w.is_punct for w in ngram))
-    if filter_nums is True:
-        ngrams_ = (ngram for ngram in ngrams_
-                   if not any(w.like_num for w in ngram))
-    if good_pos_tags:
-        ngrams_ = (ngram for ngram in ngrams_
-                   if all(w.pos_ in good_pos_tags for w in ngram))
-    if bad_pos_tags:
-        ngrams_ = (ngram for ngram in ngrams_
-                   if not any(w.pos_ in bad_pos_tags for w in ngram))
+        starts = starts[~is_stop[starts] & ~is_stop[starts + n - 1]]
     if min_freq > 1:
-        ngrams_ = list(ngrams_)
-        freqs = itertoolz.frequencies(normalized_str(ngram) for ngram in ngrams_)
-        ngrams_ = (ngram for ngram in ngrams_
-                   if freqs[normalized_str(ngram)] >= min_freq)
+        # n-grams are equal if all their tokens' normalized strings are equal
+        norm_ids = doc_data.normalized_ids()
+        ngram_ids = norm_ids[starts[:, None] + np.arange(n)]
+        starts = starts[_get_row_freqs(ngram_ids) >= min_freq]
+
+    for i in starts.tolist():
+        yield doc[i: i + n]
+
+
+class _DocData(object):
+    """
+    Per-token data of a spacy-parsed doc that several extractors need -- token
+    filter masks, normalized string ids, the POS tag string, and the list of
+    sentences -- each computed on first use and then reused, so that extractors
+    run on the same doc via :func:`run_plan()` don't each recompute them.
+    Term counting in :mod:`textacy.texts` uses the same data.
+
+    Args:
+        doc (``spacy.Doc`` or ``spacy.Span``)
+    """
+
+    _ATTR_IDS = (attrs.ORTH, attrs.LEMMA, attrs.POS, attrs.IS_SPACE,
+                 attrs.IS_STOP, attrs.IS_PUNCT, attrs.LIKE_NUM, attrs.SPACY)
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._attr_arrays = None
+        self._pos_names = None
+        self._token_filter_masks = {}
+        self._normalized_ids = None
+        self._pos_tag_string = None
+        self._sents = None
+
+    def attr_array(self, attr_id):
+        """
+        Get the values of attribute ``attr_id`` (one of ``_ATTR_IDS``) for
+        all tokens in the doc, all of which are got from spacy in one go.
+        """
+        if self._attr_arrays is None:
+            if len(self.doc) == 0:
+                arrays = np.zeros((len(self._ATTR_IDS), 0), dtype=np.int64)
+            else:
+                arrays = _get_attr_arrays(self.doc, list(self._ATTR_IDS))
+            self._attr_arrays = dict(zip(self._ATTR_IDS, arrays))
+        return self._attr_arrays[attr_id]
+
+    def pos_names(self):
+        """
+        Get the unique POS tag names in the doc, and the index into them of
+        each token's POS tag.
+        """
+        if self._pos_names is None:
+            # map pos ids to their names via the first token with each pos
+            _, first_idxs, inverse = np.unique(
+                self.attr_array(attrs.POS), return_index=True, return_inverse=True)
+            self._pos_names = ([self.doc[int(i)].pos_ for i in first_idxs],
+                               inverse.ravel())
+        return self._pos_names
+
+    def token_filter_masks(self, filter_punct, filter_nums, good_pos_tags, bad_pos_tags):
+        """
+        Evaluate the token-level filters of :func:`words()` and :func:`ngrams()`
+        for all tokens in the doc at once, using its attribute arrays.
+
+        Returns:
+            (:class:`numpy.ndarray`, :class:`numpy.ndarray`): boolean masks of the
+                tokens in the doc that are whitespace or fail any of the specified
+                filters, and of the tokens that are stop words; these are shared,
+                so mustn't be modified in place
+        """
+        key = (filter_punct is True, filter_nums is True,
+               frozenset(good_pos_tags or ()), frozenset(bad_pos_tags or ()))
+        try:
+            return self._token_filter_masks[key]
+        except KeyError:
+            pass
+        is_bad = self.attr_array(attrs.IS_SPACE).astype(bool)
+        if filter_punct is True:
+            is_bad |= self.attr_array(attrs.IS_PUNCT).astype(bool)
+        if filter_nums is True:
+            is_bad |= self.attr_array(attrs.LIKE_NUM).astype(bool)
+        if good_pos_tags or bad_pos_tags:
+            pos_names, inverse = self.pos_names()
+            if good_pos_tags:
+                is_bad |= np.array([name not in good_pos_tags for name in pos_names],
+                                   dtype=bool)[inverse]
+            if bad_pos_tags:
+                is_bad |= np.array([name in bad_pos_tags for name in pos_names],
+                                   dtype=bool)[inverse]
+        masks = (is_bad, self.attr_array(attrs.IS_STOP).astype(bool))
+        self._token_filter_masks[key] = masks
+        return masks
+
+    def normalized_ids(self):
+        """
+        Get the string ids of all tokens' normalized strings in the doc, as given by
+        :func:`spacy_utils.normalized_str() <textacy.spacy_utils.normalized_str>`,
+        checking acronym-ness just once per unique token text.
+
+        Raises:
+            ValueError: if the doc is not POS-tagged
+        """
+        if self._normalized_ids is None:
+            spacy_doc = self.doc.doc if isinstance(self.doc, sspan) else self.doc
+            if spacy_doc.is_tagged is False:
+                raise ValueError('token is not POS-tagged')
+            orth = self.attr_array(attrs.ORTH)
+            uniq_orth, inverse = np.unique(orth, return_inverse=True)
+            is_acronym = np.array(
+                [text_utils.is_acronym(spacy_doc.vocab.strings[int(orth_id)])
+                 for orth_id in uniq_orth], dtype=bool)
+            self._normalized_ids = np.where(
+                (self.attr_array(attrs.POS) == PROPN) | is_acronym[inverse.ravel()],
+                orth, self.attr_array(attrs.LEMMA))
+        return self._normalized_ids
+
+    def term_ids(self, lemmatize):
+        """
+        Get the string ids of all tokens in the doc: of their normalized strings
+        (see :meth:`normalized_ids()`) if ``lemmatize`` is 'auto', of their lemmas
+        if it's True, otherwise of their text as-is.
+        """
+        if lemmatize == 'auto':
+            return self.normalized_ids()
+        elif lemmatize is True:
+            return self.attr_array(attrs.LEMMA)
+        else:
+            return self.attr_array(attrs.ORTH)
+
+    def pos_tag_string(self):
+        """Get the doc's POS tag string, as output by :func:`_get_pos_tag_string()`."""
+        if self._pos_tag_string is None:
+            self._pos_tag_string = _get_pos_tag_string(self.doc)
+        return self._pos_tag_string
+
+    def sents(self):
+        """Get the list of the doc's sentences, or just the doc if it's a sentence."""
+        if self._sents is None:
+            try:
+                self._sents = list(self.doc.sents)
+            except AttributeError:
+                self._sents = [self.doc]
+        return self._sents
+
+
+def _get_doc_data(doc):
+    """
+    Get the :class:`_DocData` of ``doc``: ``doc`` itself if it's already one
+    (as passed by :func:`run_plan()`), otherwise a new one.
+    """
+    return doc if isinstance(doc, _DocData) else _DocData(doc)
+
+
+def _get_attr_arrays(doc, attr_ids):
+    """
+    Get one array per attribute in ``attr_ids`` (at least two) of the values
+    for all tokens in ``doc``, which may be a ``spacy.Doc`` or ``spacy.Span``.
+    """
+    if isinstance(doc, sspan):
+        return doc.doc.to_array(attr_ids)[doc.start: doc.end].T
+    return doc.to_array(attr_ids).T
+
+
+def _get_row_freqs(ids):
+    """
+    For each row in the 2D array ``ids``, get the number of rows in ``ids``
+    equal to it.
+    """
+    if len(ids) == 0:
+        return np.zeros(0, dtype=np.intp)
+    # sort rows so that equal rows are adjacent, then count each run of them
+    order = np.lexsort(ids.T[::-1])
+    sorted_ids = ids[order]
+    is_new = np.concatenate(([True], (sorted_ids[1:] != sorted_ids[:-1]).any(axis=1)))
+    groups = np.cumsum(is_new) - 1
+    freqs = np.empty(len(ids), dtype=np.intp)
+    freqs[order] = np.bincount(groups)[groups]
+    return freqs
+
+
+def _filter_by_freq(items, keys, min_freq):
+    """
+    Get the items in ``items`` whose corresponding (hashable) key in ``keys``
+    occurs at least ``min_freq`` times, in their original order.
+    """
+    key_ids = {}
+    ids = np.array([key_ids.setdefault(key, len(key_ids)) for key in keys], dtype=np.intp)
+    if len(ids) == 0:
+        return []
+    is_freq = np.bincount(ids)[ids] >= min_freq
+    return [item for item, keep in zip(items, is_freq.tolist()) if keep]
 
-    for ngram in ngrams_:
-        yield ngram
+
+def _get_ngram_starts(n, is_bad):
+    """
+    Get the start indexes of all n-grams that don't contain any token flagged
+    in the boolean mask ``is_bad``.
+    """
+    n_starts = len(is_bad) - n + 1
+    if n_starts <= 0:
+        return np.zeros(0, dtype=np.intp)
+    cum_bad = np.concatenate(([0], np.cumsum(is_bad)))
+    return np.flatnonzero((cum_bad[n:] - cum_bad[:n_starts]) == 0)
 
 
 def named_entities(doc,
@@ -171,9 +370,7 @@ def named_entities(doc,
                for ne in nes)
     if min_freq > 1:
         nes = list(nes)
-        freqs = itertoolz.frequencies(ne.text for ne in nes)
-        nes = (ne for ne in nes
-               if freqs[ne.text] >= min_freq)
+        nes = _filter_by_freq(nes, (ne.text for ne in nes), min_freq)
 
     for ne in nes:
         yield ne
@@ -195,15 +392,17 @@ def noun_chunks(doc, drop_determiners=True, min_freq=1):
         ``spacy.Span``: the next noun chunk from ``doc`` in order of appearance
              in the document
     """
+    doc_data = _get_doc_data(doc)
+    doc = doc_data.doc
     ncs = doc.noun_chunks
     if drop_determiners is True:
         ncs = (nc if nc[0].pos != DET else nc[1:]
                for nc in ncs)
     if min_freq > 1:
         ncs = list(ncs)
-        freqs = itertoolz.frequencies(normalized_str(nc) for nc in ncs)
-        ncs = (nc for nc in ncs
-               if freqs[normalized_str(nc)] >= min_freq)
+        norm_ids = doc_data.normalized_ids().tolist()
+        ncs = _filter_by_freq(
+            ncs, (tuple(norm_ids[nc.start: nc.end]) for nc in ncs), min_freq)
 
     for nc in ncs:
         yield nc
@@ -219,9 +418,9 @@ def pos_regex_matches(doc, pattern):
         pattern (str): Pattern of consecutive POS tags whose corresponding words
             are to be extracted, inspired by the regex patterns used in NLTK's
             `nltk.chunk.regexp`. Tags are uppercase, from the universal tag set;
-            delimited by < and >, which are basically converted to parentheses
-            with spaces as needed to correctly extract matching word sequences;
-            white space in the input doesn't matter.
+            delimited by < and >, with alternatives separated by | (e.g. <NOUN|PROPN>),
+            and otherwise combined with standard regex syntax;
+            white space in the input doesn't matter. Compiled patterns are cached.
 
             Examples (see `regexes_etc.POS_REGEX_PATTERNS`):
 
@@ -234,15 +433,149 @@ def pos_regex_matches(doc, pattern):
         ``spacy.Span``: the next span of consecutive tokens from ``doc`` whose
             parts-of-speech match ``pattern``, in order of apperance
     """
-    # standardize and transform the regular expression pattern...
-    pattern = re.sub(r'\s', '', pattern)
-    pattern = re.sub(r'<([A-Z]+)\|([A-Z]+)>', r'( (\1|\2))', pattern)
-    pattern = re.sub(r'<([A-Z]+)>', r'( \1)', pattern)
+    doc_data = _get_doc_data(doc)
+    doc = doc_data.doc
+    regex = _compile_pos_regex(pattern)
+    tags = doc_data.pos_tag_string()
+
+    # one character per token, so match offsets are token indexes
+    for m in regex.finditer(tags):
+        yield doc[m.start(): m.end()]
+
+
+def pos_regex_matches_multi(doc, patterns):
+    """
+    Extract sequences of consecutive tokens from a spacy-parsed doc whose
+    part-of-speech tags match any of the specified regex patterns, labeled
+    by pattern name. Each pattern's matches are the same as given by
+    :func:`pos_regex_matches()`, but matches of different patterns may overlap.
+
+    All patterns are compiled into a single regex, so the doc's (cached) tag string
+    is scanned once rather than once per pattern; only at tokens where some
+    pattern's match starts are the patterns after it tried there as well.
+
+    Args:
+        doc (``spacy.Doc`` or ``spacy.Span``)
+        patterns (dict): mapping of pattern name to pattern, where patterns are
+            as described in :func:`pos_regex_matches()`;
+            e.g. ``regexes_etc.POS_REGEX_PATTERNS['en']``
+
+    Yields:
+        (str, ``spacy.Span``): the next (name, span) pair, where ``span`` is
+            a span of consecutive tokens from ``doc`` whose parts-of-speech match
+            the pattern called ``name``, in order of appearance; matches starting
+            at the same token are ordered as ``patterns`` is iterated
+    """
+    doc_data = _get_doc_data(doc)
+    doc = doc_data.doc
+    names = list(patterns)
+    if not names:
+        return
+    pattern_strs = [patterns[name] for name in names]
+    # the i-th regex matches any of the patterns from the i-th onward
+    regexes = [_compile_pos_regex_multi(pattern_strs[i:]) for i in range(len(names))]
+    tags = doc_data.pos_tag_string()
+    # a pattern's matches don't overlap each other, so each may next match
+    # no earlier than the end of its last match
+    next_starts = [0] * len(names)
+
+    pos = 0
+    while pos <= len(tags):
+        m = regexes[0].search(tags, pos)
+        if m is None:
+            break
+        start = m.start()
+        # the alternation only gives the first pattern to match at ``start``,
+        # so look for others that do by matching just the patterns after it
+        i = 0
+        while m is not None:
+            i += int(m.lastgroup[1:])
+            end = m.end()
+            if next_starts[i] <= start:
+                next_starts[i] = end if end > start else start + 1
+                yield names[i], doc[start: end]
+            i += 1
+            m = regexes[i].match(tags, start) if i < len(names) else None
+        # restart just past this match's start, to find overlapping matches
+        pos = start + 1
+
+
+def _get_pos_tag_char(tag):
+    """Get the single character that stands for POS ``tag`` in tag strings."""
+    try:
+        return _POS_TAG_CHARS[tag]
+    except KeyError:
+        with _POS_TAG_CHARS_LOCK:
+            return _POS_TAG_CHARS.setdefault(tag, unichr(0x100 + len(_POS_TAG_CHARS)))
+
+
+def _compile_pos_regex(pattern):
+    """
+    Compile a POS regex ``pattern`` as used by :func:`pos_regex_matches()`
+    into a regex over tag strings, as output by :func:`_get_pos_tag_string()`,
+    or get it from the cache if it's already been compiled.
+    """
+    try:
+        return _POS_REGEX_CACHE[pattern]
+    except KeyError:
+        pass
+
+    def tags_to_chars(match):
+        chars = ''.join(_get_pos_tag_char(tag) for tag in match.group(1).split('|'))
+        return chars if len(chars) == 1 else '[' + chars + ']'
+
+    regex = re.compile(re.sub(r'<([^<>]+)>', tags_to_chars, re.sub(r'\s', '', pattern)))
+    _POS_REGEX_CACHE[pattern] = regex
+    return regex
+
+
+def _compile_pos_regex_multi(patterns):
+    """
+    Compile a sequence of POS regex ``patterns`` into a single regex over tag
+    strings that matches any of them, with the match of the ``i``-th pattern
+    in the named group "p{i}", or get it from the cache.
+    """
+    key = tuple(patterns)
+    try:
+        return _POS_REGEX_CACHE[key]
+    except KeyError:
+        pass
+    regex = re.compile('|'.join(
+        '(?P<p{}>{})'.format(i, _compile_pos_regex(pattern).pattern)
+        for i, pattern in enumerate(patterns)))
+    _POS_REGEX_CACHE[key] = regex
+    return regex
 
-    tags = ' ' + ' '.join(tok.pos_ for tok in doc)
 
-    for m in re.finditer(pattern, tags):
-        yield doc[tags[0:m.start()].count(' '):tags[0:m.end()].count(' ')]
+def _get_pos_tag_string(doc):
+    """
+    Get a string with one character per token in ``doc`` standing for its POS tag,
+    from the cache if ``doc`` (or the ``spacy.Doc`` of which it's a span) hasn't
+    changed since it was last computed.
+    """
+    if isinstance(doc, sspan):
+        return _get_pos_tag_string(doc.doc)[doc.start: doc.end]
+    # docs are weakly referenced, so the cache doesn't keep them alive
+    key = (len(doc), doc.is_tagged)
+    try:
+        cached_key, tags = _POS_TAG_STRING_CACHE[doc]
+        if cached_key == key:
+            return tags
+    except (KeyError, TypeError):
+        pass
+    if len(doc) == 0:
+        tags = ''
+    else:
+        pos = doc.to_array([attrs.POS]).ravel()
+        # map pos ids to their chars via the first token with each pos
+        _, first_idxs, inverse = np.unique(pos, return_index=True, return_inverse=True)
+        chars = [_get_pos_tag_char(doc[int(i)].pos_) for i in first_idxs]
+        tags = ''.join([chars[i] for i in inverse.ravel().tolist()])
+    try:
+        _POS_TAG_STRING_CACHE[doc] = (key, tags)
+    except TypeError:  # doc can't be weakly referenced, so don't cache
+        pass
+    return tags
 
 
 def subject_verb_object_triples(doc):
@@ -262,12 +595,7 @@ def subject_verb_object_triples(doc):
     # TODO: What about non-adjacent verb negations?
     # TODO: What about object (noun) negations?
     """
-    try:
-        sents = doc.sents
-    except AttributeError:
-        sents = [doc]
-
-    for sent in sents:
+    for sent in _get_doc_data(doc).sents():
         start_i = sent[0].i
 
         verbs = get_main_verbs_of_sent(sent)
@@ -297,7 +625,7 @@ def subject_verb_object_triples(doc):
                     yield (subj, verb, obj)
 
 
-def acronyms_and_definitions(doc, known_acro_defs=None):
+def acronyms_and_definitions(doc, known_acro_defs=None, acronym_index=None):
     """
     Extract a collection of acronyms and their most likely definitions, if available,
     from a spacy-parsed doc. If multiple definitions are found for a given acronym,
@@ -308,6 +636,10 @@ def acronyms_and_definitions(doc, known_acro_defs=None):
         known_acro_defs (dict, optional): if certain acronym/definition pairs
             are known, pass them in as {acronym (str): definition (str)};
             algorithm will not attempt to find new definitions
+        acronym_index (:class:`AcronymIndex`, optional): if given, acronyms
+            whose definitions are already known with high confidence by the index
+            get those definitions, and algorithm will not attempt to find new ones;
+            the index itself isn't modified (see :meth:`AcronymIndex.add_doc()`)
 
     Returns:
         dict: unique acronyms (keys) with matched definitions (values)
@@ -337,7 +669,15 @@ def acronyms_and_definitions(doc, known_acro_defs=None):
         for i, token in enumerate(sent):
 
             token_ = token.text
-            if token_ in known_acronyms or text_utils.is_acronym(token_) is False:
+            if token_ in known_acronyms:
+                continue
+            if acronym_index is not None:
+                definition = acronym_index.get_definition(token_)
+                if definition:
+                    acro_defs[token_] = [(definition, 1.0)]
+                    known_acronyms.add(token_)
+                    continue
+            if text_utils.is_acronym(token_) is False:
                 continue
 
             # define definition search window(s)
@@ -404,52 +744,52 @@ def _get_acronym_definition(acronym, window, threshold=0.8):
             International Journal on Document Analysis and Recognition 1.4 (1999): 191-198.
     """
     def build_lcs_matrix(X, Y):
+        # cells are filled one at a time, so plain lists of ints are much faster
+        # than numpy arrays; note that, for the first row and column, [i - 1]
+        # and [j - 1] wrap around to the last ones, which is kept as-is
         m = len(X)
         n = len(Y)
-        b = zeros((m, n), dtype=int)
-        c = zeros((m, n), dtype=int)
+        c = [[0] * n for _ in range(m)]
         for i in range(0, m):
+            c_i = c[i]
+            c_prev = c[i - 1]
             for j in range(0, n):
                 if X[i] == Y[j]:
-                    c[i, j] = c[i - 1, j - 1] + 1
-                    b[i, j] = 1
-                elif c[i - 1, j] >= c[i, j - 1]:
-                    c[i, j] = c[i - 1, j]
+                    c_i[j] = c_prev[j - 1] + 1
+                elif c_prev[j] >= c_i[j - 1]:
+                    c_i[j] = c_prev[j]
                 else:
-                    c[i, j] = c[i, j - 1]
-        return c, b
-
-    def parse_lcs_matrix(b, start_i, start_j, lcs_length, stack, vectors):
-        m = b.shape[0]
-        n = b.shape[1]
-        for i in range(start_i, m):
-            for j in range(start_j, n):
-                if b[i, j] == 1:
-                    s = (i, j)
-                    stack.append(s)
-                    if lcs_length == 1:
-                        vec = [NaN] * n
-                        for k, l in stack:
-                            vec[l] = k
-                        vectors.append(vec)
-                    else:
-                        parse_lcs_matrix(b, i + 1, j + 1, lcs_length - 1, stack, vectors)
-                    stack = []
-        return vectors
+                    c_i[j] = c_i[j - 1]
+        return c
+
+    def iter_lcs_vectors(X, Y, lcs_length):
+        # each vector is a list of the positions in Y of matched characters,
+        # starting with a match for X's first character and following it with
+        # the first match, in row-major order, below and right of the last one;
+        # a vector that can't reach ``lcs_length`` matches is pruned
+        for j in range(len(Y)):
+            if Y[j] != X[0]:
+                continue
+            vec = [j]
+            i = 0
+            while len(vec) < lcs_length:
+                for i in range(i + 1, len(X)):
+                    next_j = Y.find(X[i], vec[-1] + 1)
+                    if next_j >= 0:
+                        vec.append(next_j)
+                        break
+                else:
+                    break
+            else:
+                yield vec
 
     def vector_values(v, types):
         vv = {}
-        first = v.index(int(nanmin(v)))
-        last = v.index(int(nanmax(v)))
+        first = v[0]
+        last = v[-1]
         vv['size'] = (last - first) + 1
-        vv['distance'] = len(v) - last
-        vv['stop_count'] = 0
-        vv['misses'] = 0
-        for i in range(first, last + 1):
-            if v[i] >= 0 and types[i] == 's':
-                vv['stop_count'] += 1
-            elif v[i] is None and types[i] not in ['s', 'h']:
-                vv['misses'] += 1
+        vv['distance'] = len(types) - last
+        vv['stop_count'] = sum(1 for i in v if types[i] == 's')
         return vv
 
     def compare_vectors(A, B, types):
@@ -460,10 +800,6 @@ def _get_acronym_definition(acronym, window, threshold=0.8):
             return B
         elif vv_B['size'] == 1:
             return A
-        if vv_A['misses'] > vv_B['misses']:
-            return B
-        elif vv_A['misses'] < vv_B['misses']:
-            return A
         if vv_A['stop_count'] > vv_B['stop_count']:
             return B
         if vv_A['stop_count'] < vv_B['stop_count']:
@@ -510,26 +846,24 @@ def _get_acronym_definition(acronym, window, threshold=0.8):
         acr_leads = acr_leads[:-1]
     acr_leads = acr_leads.lower()
 
-    c, b = build_lcs_matrix(acr_leads, def_leads)
+    c = build_lcs_matrix(acr_leads, def_leads)
 
     # 4.4.1
-    lcs_length = c[c.shape[0] - 1, c.shape[1] - 1]
+    lcs_length = c[-1][-1]
     confidence = lcs_length / len(acronym)
-    if confidence < threshold:
+    if confidence < threshold or lcs_length < 1:
         return ('', confidence)
 
-    vecs = parse_lcs_matrix(b, 0, 0, lcs_length, [], [])
     # first letter of acronym must be present
-    vecs = [vec for vec in vecs if 0 in vec]
-    if not vecs:
+    vecs = iter_lcs_vectors(acr_leads, def_leads, lcs_length)
+    best_vec = next(vecs, None)
+    if best_vec is None:
         return ('', confidence)
-
-    best_vec = vecs[0]
-    for vec in vecs[1:]:
+    for vec in vecs:
         best_vec = compare_vectors(best_vec, vec, def_types)
 
-    first = best_vec.index(int(nanmin(best_vec)))
-    last = best_vec.index(int(nanmax(best_vec)))
+    first = best_vec[0]
+    last = best_vec[-1]
 
     definition = window[first: last + 1].text
     if len(definition.split()) == 1:
@@ -538,6 +872,176 @@ def _get_acronym_definition(acronym, window, threshold=0.8):
     return (definition, confidence)
 
 
+class AcronymIndex(object):
+    """
+    Collection of acronyms and counts of their definitions, built up incrementally
+    from any number of docs, e.g. all those in a corpus. Definitions known with
+    high confidence -- found often enough, and consistently enough -- are used
+    by :func:`acronyms_and_definitions()` instead of searching for new ones.
+
+    Args:
+        min_count (int, optional): minimum number of times an acronym's definitions
+            must have been found for its most common definition to be trusted
+        min_share (float, optional): minimum fraction of an acronym's definitions
+            that must be its most common definition for it to be trusted
+
+    Example::
+
+        >>> acro_index = AcronymIndex(min_count=3, min_share=0.9)
+        >>> for doc in corpus:
+        ...     acro_defs = acro_index.add_doc(doc.spacy_doc)
+        >>> acro_index.get_definition('NASA')
+        'National Aeronautics and Space Administration'
+        >>> acro_index.acronyms_with_prefix('NA')
+        ['NAACP', 'NASA', 'NATO']
+        >>> acro_index.save('acronyms.json')
+        >>> acro_index = AcronymIndex.load('acronyms.json')
+    """
+
+    def __init__(self, min_count=3, min_share=0.9):
+        self.min_count = min_count
+        self.min_share = min_share
+        self.n_docs = 0
+        self._def_counts = {}
+        self._sorted_acronyms = None
+
+    def __repr__(self):
+        return 'AcronymIndex({} acronyms from {} docs)'.format(len(self), self.n_docs)
+
+    def __len__(self):
+        return len(self._def_counts)
+
+    def __contains__(self, acronym):
+        return acronym in self._def_counts
+
+    def __iter__(self):
+        return iter(self._def_counts)
+
+    def add(self, acronym, definition, count=1):
+        """
+        Add ``count`` occurrences of ``acronym`` defined as ``definition`` to the index;
+        if ``definition`` is empty, the acronym is added without a definition.
+
+        Args:
+            acronym (str)
+            definition (str)
+            count (int, optional)
+        """
+        try:
+            def_counts = self._def_counts[acronym]
+        except KeyError:
+            def_counts = self._def_counts[acronym] = Counter()
+            self._sorted_acronyms = None
+        if definition:
+            def_counts[definition] += count
+
+    def add_doc(self, doc):
+        """
+        Extract acronyms and definitions from ``doc`` via :func:`acronyms_and_definitions()`,
+        using the definitions already known with high confidence, and add them to the index.
+
+        Args:
+            doc (``spacy.Doc`` or ``spacy.Span``)
+
+        Returns:
+            dict: unique acronyms (keys) with matched definitions (values) in ``doc``
+        """
+        acro_defs = acronyms_and_definitions(doc, acronym_index=self)
+        for acronym, definition in acro_defs.items():
+            self.add(acronym, definition)
+        self.n_docs += 1
+        return acro_defs
+
+    def update(self, other):
+        """
+        Add all acronyms and definition counts in ``other`` to the index,
+        e.g. to combine indexes built from different sets of docs.
+
+        Args:
+            other (:class:`AcronymIndex`)
+        """
+        for acronym, def_counts in other._def_counts.items():
+            self.add(acronym, '')
+            self._def_counts[acronym].update(def_counts)
+        self.n_docs += other.n_docs
+
+    def definition_counts(self, acronym):
+        """
+        Get all definitions found for ``acronym`` and the number of times each
+        was found, most common first.
+
+        Returns:
+            list((str, int))
+        """
+        return self._def_counts.get(acronym, Counter()).most_common()
+
+    def get_definition(self, acronym):
+        """
+        Get the most common definition of ``acronym`` if it's known with high confidence,
+        as specified by ``min_count`` and ``min_share``; otherwise, return None.
+
+        Returns:
+            str or None
+        """
+        def_counts = self._def_counts.get(acronym)
+        if not def_counts:
+            return None
+        total_count = sum(def_counts.values())
+        if total_count < self.min_count:
+            return None
+        definition, count = def_counts.most_common(1)[0]
+        if count / total_count < self.min_share:
+            return None
+        return definition
+
+    def acronyms_with_prefix(self, prefix):
+        """
+        Get all acronyms in the index that start with ``prefix``, in sorted order.
+
+        Returns:
+            list(str)
+        """
+        if self._sorted_acronyms is None:
+            self._sorted_acronyms = sorted(self._def_counts)
+        acronyms = []
+        for acronym in self._sorted_acronyms[bisect_left(self._sorted_acronyms, prefix):]:
+            if not acronym.startswith(prefix):
+                break
+            acronyms.append(acronym)
+        return acronyms
+
+    def to_dict(self):
+        """
+        Get a JSON-serializable dict of the index's data and parameters,
+        from which it can be re-created via :meth:`AcronymIndex.from_dict()`.
+        """
+        return {'min_count': self.min_count,
+                'min_share': self.min_share,
+                'n_docs': self.n_docs,
+                'definition_counts': {acronym: dict(def_counts)
+                                      for acronym, def_counts in self._def_counts.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create an index from a dict as output by :meth:`AcronymIndex.to_dict()`.
+        """
+        acro_index = cls(min_count=data['min_count'], min_share=data['min_share'])
+        acro_index.n_docs = data['n_docs']
+        acro_index._def_counts = {acronym: Counter(def_counts)
+                                  for acronym, def_counts in data['definition_counts'].items()}
+        return acro_index
+
+    def save(self, filename):
+        """Save the index to disk as JSON at ``filename``."""
+        fileio.write_json(self.to_dict(), filename)
+
+    @classmethod
+    def load(cls, filename):
+        """Load an index saved to disk at ``filename`` by :meth:`AcronymIndex.save()`."""
+        return cls.from_dict(next(fileio.read_json(filename)))
+
+
 def semistructured_statements(doc, entity, cue='be', ignore_entity_case=True,
                               min_n_words=1, max_n_words=20):
     """
@@ -567,17 +1071,69 @@ def semistructured_statements(doc, entity, cue='be', ignore_entity_case=True,
         Jones, G. 2010. Portable Extraction of Partially Structured Facts from
         the Web. In Proc. ICETAL 2010, LNAI 6233, 345-356. Heidelberg, Springer.
     """
+    for _, statement in _iter_semistructured_statements(
+            doc, [entity], cue, ignore_entity_case, min_n_words, max_n_words):
+        yield statement
+
+
+def semistructured_statements_multi(doc, entities, cue='be', ignore_entity_case=True,
+                                    min_n_words=1, max_n_words=20):
+    """
+    Extract "semi-structured statements" from a spacy-parsed doc for each of
+    many entities, as in :func:`semistructured_statements()`, but finding
+    all entities in a single pass over the doc.
+
+    Args:
+        doc (``spacy.Doc``)
+        entities (iterable(str)): nouns or noun phrases of some sort
+            (e.g. "President Obama", "global warming", "Python")
+        cue (str, optional): verb lemma with which ``entities`` are associated
+            (e.g. "talk about", "have", "write")
+        ignore_entity_case (bool, optional): if True, entity matching is case-independent
+        min_n_words (int, optional): min number of tokens allowed in a matching fragment
+        max_n_words (int, optional): max number of tokens allowed in a matching fragment
+
+    Returns:
+        dict: mapping of each (unique) entity in ``entities`` to a list of its
+            matching (entity, cue, fragment) triples, in order of appearance;
+            if ``ignore_entity_case`` is True, entities that differ only in case
+            each get the same statements
+    """
+    entities = list(entities)
+    statements = {entity: [] for entity in entities}
+    for entity, statement in _iter_semistructured_statements(
+            doc, entities, cue, ignore_entity_case, min_n_words, max_n_words):
+        statements[entity].append(statement)
+    return statements
+
+
+def _iter_semistructured_statements(doc, entities, cue, ignore_entity_case,
+                                    min_n_words, max_n_words):
+    """
+    Find all occurrences of ``entities`` in ``doc`` by walking a trie of their
+    tokens from each token, and yield (entity, (entity, cue, fragment)) pairs
+    for those that are part of semi-structured statements.
+    """
     if ignore_entity_case is True:
-        entity_toks = entity.lower().split(' ')
         get_tok_text = lambda x: x.lower_
     else:
-        entity_toks = entity.split(' ')
         get_tok_text = lambda x: x.text
-    first_entity_tok = entity_toks[0]
-    n_entity_toks = len(entity_toks)
+    # each trie node maps entity token texts to child nodes, and None
+    # to the entities (if any) whose tokens end at that node
+    entity_trie = {}
+    for entity in entities:
+        entity_toks = entity.lower().split(' ') if ignore_entity_case is True else entity.split(' ')
+        node = entity_trie
+        for entity_tok in entity_toks:
+            node = node.setdefault(entity_tok, {})
+        # duplicate entities would otherwise yield the same statements repeatedly
+        node_entities = node.setdefault(None, [])
+        if entity not in node_entities:
+            node_entities.append(entity)
     cue = cue.lower()
     cue_toks = cue.split(' ')
     n_cue_toks = len(cue_toks)
+    n_toks = len(doc)
 
     def is_good_last_tok(tok):
         if tok.is_punct:
@@ -590,69 +1146,76 @@ def semistructured_statements(doc, entity, cue='be', ignore_entity_case=True,
         for tok in sent:
 
             # filter by entity
-            if get_tok_text(tok) != first_entity_tok:
+            node = entity_trie.get(get_tok_text(tok))
+            if node is None:
                 continue
-            if n_entity_toks == 1:
-                the_entity = tok
-                the_entity_root = the_entity
-            if tok.i + n_cue_toks >= len(doc):
+            if tok.i + n_cue_toks >= n_toks:
                 continue
-            elif all(get_tok_text(tok.nbor(i=i + 1)) == et for i, et in enumerate(entity_toks[1:])):
-                the_entity = doc[tok.i: tok.i + n_entity_toks]
+            entity_ends = []
+            end_i = tok.i + 1
+            while node:
+                if None in node:
+                    entity_ends.append((end_i, node[None]))
+                if end_i >= n_toks:
+                    break
+                node = node.get(get_tok_text(doc[end_i]))
+                end_i += 1
+
+            for end_i, matched_entities in entity_ends:
+                the_entity = doc[tok.i: end_i]
                 the_entity_root = the_entity.root
-            else:
-                continue
 
-            # filter by cue
-            terh = the_entity_root.head
-            if terh.lemma_ != cue_toks[0]:
-                continue
-            if n_cue_toks == 1:
-                min_cue_i = terh.i
-                max_cue_i = terh.i + n_cue_toks
-                the_cue = terh
-            elif all(terh.nbor(i=i + 1).lemma_ == ct for i, ct in enumerate(cue_toks[1:])):
-                min_cue_i = terh.i
-                max_cue_i = terh.i + n_cue_toks
-                the_cue = doc[terh.i: max_cue_i]
-            else:
-                continue
-            if the_entity_root in the_cue.rights:
-                continue
+                # filter by cue
+                terh = the_entity_root.head
+                if terh.lemma_ != cue_toks[0]:
+                    continue
+                if n_cue_toks == 1:
+                    min_cue_i = terh.i
+                    max_cue_i = terh.i + n_cue_toks
+                    the_cue = terh
+                elif all(terh.nbor(i=i + 1).lemma_ == ct for i, ct in enumerate(cue_toks[1:])):
+                    min_cue_i = terh.i
+                    max_cue_i = terh.i + n_cue_toks
+                    the_cue = doc[terh.i: max_cue_i]
+                else:
+                    continue
+                if the_entity_root in the_cue.rights:
+                    continue
 
-            # now add adjacent auxiliary and negating tokens to the cue, for context
-            try:
-                min_cue_i = min(left.i for left in takewhile(
-                    lambda x: x.dep_ in {'aux', 'neg'}, reversed(list(the_cue.lefts))))
-            except ValueError:
-                pass
-            try:
-                max_cue_i = max(right.i for right in takewhile(
-                    lambda x: x.dep_ in {'aux', 'neg'}, the_cue.rights))
-            except ValueError:
-                pass
-            if max_cue_i - min_cue_i > 1:
-                the_cue = doc[min_cue_i: max_cue_i]
-            else:
-                the_cue = doc[min_cue_i]
+                # now add adjacent auxiliary and negating tokens to the cue, for context
+                try:
+                    min_cue_i = min(left.i for left in takewhile(
+                        lambda x: x.dep_ in {'aux', 'neg'}, reversed(list(the_cue.lefts))))
+                except ValueError:
+                    pass
+                try:
+                    max_cue_i = max(right.i for right in takewhile(
+                        lambda x: x.dep_ in {'aux', 'neg'}, the_cue.rights))
+                except ValueError:
+                    pass
+                if max_cue_i - min_cue_i > 1:
+                    the_cue = doc[min_cue_i: max_cue_i]
+                else:
+                    the_cue = doc[min_cue_i]
 
-            # filter by fragment
-            try:
-                min_frag_i = min(right.left_edge.i for right in the_cue.rights)
-                max_frag_i = max(right.right_edge.i for right in the_cue.rights)
-            except ValueError:
-                continue
-            while is_good_last_tok(doc[max_frag_i]) is False:
-                max_frag_i -= 1
-            n_fragment_toks = max_frag_i - min_frag_i
-            if n_fragment_toks <= 0 or n_fragment_toks < min_n_words or n_fragment_toks > max_n_words:
-                continue
-            # HACK...
-            if min_frag_i == max_cue_i - 1:
-                min_frag_i += 1
-            the_fragment = doc[min_frag_i: max_frag_i + 1]
+                # filter by fragment
+                try:
+                    min_frag_i = min(right.left_edge.i for right in the_cue.rights)
+                    max_frag_i = max(right.right_edge.i for right in the_cue.rights)
+                except ValueError:
+                    continue
+                while is_good_last_tok(doc[max_frag_i]) is False:
+                    max_frag_i -= 1
+                n_fragment_toks = max_frag_i - min_frag_i
+                if n_fragment_toks <= 0 or n_fragment_toks < min_n_words or n_fragment_toks > max_n_words:
+                    continue
+                # HACK...
+                if min_frag_i == max_cue_i - 1:
+                    min_frag_i += 1
+                the_fragment = doc[min_frag_i: max_frag_i + 1]
 
-            yield (the_entity, the_cue, the_fragment)
+                for entity in matched_entities:
+                    yield entity, (the_entity, the_cue, the_fragment)
 
 
 def direct_quotations(doc):
@@ -673,13 +1236,25 @@ def direct_quotations(doc):
 
     TODO: Better approach would use ML, but needs a training dataset.
     """
+    doc_data = _get_doc_data(doc)
+    doc = doc_data.doc
     quote_end_punct = {',', '.', '?', '!'}
+    # quotes' first and last tokens are found by binary search of their character
+    # offsets among all tokens' (sorted) character offsets
+    tok_idxs = [tok.idx for tok in doc]
     quote_indexes = set(itertoolz.concat(
         (m.start(), m.end() - 1) for m in re.finditer(r"(\".*?\")|(''.*?'')|(``.*?'')", doc.string)))
     quote_positions = list(itertoolz.partition(
-        2, sorted(tok.i for tok in doc if tok.idx in quote_indexes)))
-    sents = list(doc.sents)
-    sent_positions = [(sent.start, sent.end) for sent in sents]
+        2, sorted(itertoolz.concat(
+            range(bisect_left(tok_idxs, idx), bisect_right(tok_idxs, idx))
+            for idx in quote_indexes))))
+    # quotes don't overlap, so their starts and ends are both sorted
+    quote_starts = [q0 for q0, _ in quote_positions]
+    quote_ends = [q1 for _, q1 in quote_positions]
+    sents = doc_data.sents()
+    sent_starts = [sent.start for sent in sents]
+    sent_ends = [sent.end for sent in sents]
+    sent_rvs = {}
 
     for q0, q1 in quote_positions:
         quote = doc[q0: q1 + 1]
@@ -688,24 +1263,25 @@ def direct_quotations(doc):
         if not any(char in quote_end_punct for char in quote.text[-4:]):
             continue
 
-        # get adjacent sentences
-        candidate_sent_indexes = []
-        for i, (s0, s1) in enumerate(sent_positions):
-
-            if s0 <= q1 + 1 and s1 > q1:
-                candidate_sent_indexes.append(i)
-            elif s0 < q0 and s1 >= q0 - 1:
-                candidate_sent_indexes.append(i)
+        # get adjacent sentences: those that overlap the quote's last token or
+        # start right after it, and those that start before the quote and end
+        # no earlier than right before it
+        candidate_sent_indexes = sorted(set(itertoolz.concat((
+            range(bisect_right(sent_ends, q1), bisect_right(sent_starts, q1 + 1)),
+            range(bisect_left(sent_ends, q0 - 1), bisect_left(sent_starts, q0))))))
 
         for si in candidate_sent_indexes:
-            sent = sents[si]
 
-            # get any reporting verbs
-            rvs = [tok for tok in sent
-                   if spacy_utils.preserve_case(tok) is False
-                   and tok.lemma_ in REPORTING_VERBS
-                   and tok.pos_ == 'VERB'
-                   and not any(oq0 <= tok.i <= oq1 for oq0, oq1 in quote_positions)]
+            # get any reporting verbs, outside of all quotes
+            try:
+                rvs = sent_rvs[si]
+            except KeyError:
+                rvs = sent_rvs[si] = [
+                    tok for tok in sents[si]
+                    if spacy_utils.preserve_case(tok) is False
+                    and tok.lemma_ in REPORTING_VERBS
+                    and tok.pos_ == 'VERB'
+                    and not _is_in_quote(tok.i, quote_starts, quote_ends)]
 
             # get target offset against which to measure distances of NEs
             if rvs:
@@ -741,3 +1317,72 @@ def direct_quotations(doc):
 
             yield (speaker, rv, quote)
             break
+
+
+def _is_in_quote(i, quote_starts, quote_ends):
+    """
+    Check if token index ``i`` is within any of the (non-overlapping) quotes
+    with sorted first and last token indexes ``quote_starts`` and ``quote_ends``.
+    """
+    qi = bisect_right(quote_starts, i) - 1
+    return qi >= 0 and i <= quote_ends[qi]
+
+
+def run_plan(doc, plan):
+    """
+    Run many extractors on a spacy-parsed doc in one go, as specified by ``plan``.
+    Results are the same as calling the extractors one by one, but the data
+    that several of them need -- token filter masks and normalized strings
+    (:func:`words()`, :func:`ngrams()`, :func:`noun_chunks()`), the POS tag string
+    (:func:`pos_regex_matches()`, :func:`pos_regex_matches_multi()`), and the
+    list of sentences (:func:`subject_verb_object_triples()`,
+    :func:`direct_quotations()`) -- is computed once and shared among them.
+    All extractors named in ``plan`` are validated before any are run.
+
+    Args:
+        doc (``spacy.Doc``)
+        plan (list): sequence of extractors to run, each given as either the
+            name of an extraction function in this module or a (name, kwargs)
+            pair, where ``kwargs`` are passed to the function along with ``doc``;
+            for example::
+
+                [('words', {'filter_stops': True, 'filter_nums': True}),
+                 ('ngrams', {'n': 2}), ('ngrams', {'n': 3}),
+                 'named_entities', 'noun_chunks',
+                 'subject_verb_object_triples', 'direct_quotations']
+
+    Returns:
+        list: result of each extractor in ``plan``, in the same order; items
+            yielded by an extractor are collected into a list
+
+    Raises:
+        ValueError: if any extractor named in ``plan`` isn't valid
+    """
+    steps = []
+    for step in plan:
+        name, kwargs = step if isinstance(step, (list, tuple)) else (step, {})
+        if name not in _PLAN_EXTRACTORS:
+            msg = 'extractor "{}" not valid; must be one of {}'.format(
+                name, sorted(_PLAN_EXTRACTORS))
+            raise ValueError(msg)
+        steps.append((_PLAN_EXTRACTORS[name], kwargs or {}))
+
+    doc_data = _DocData(doc)
+    results = []
+    for func, kwargs in steps:
+        result = func(doc_data if func in _SHARED_DATA_EXTRACTORS else doc, **kwargs)
+        if isinstance(result, types.GeneratorType):
+            result = list(result)
+        results.append(result)
+    return results
+
+
+_PLAN_EXTRACTORS = {func.__name__: func for func in (
+    words, ngrams, named_entities, noun_chunks, pos_regex_matches,
+    pos_regex_matches_multi, subject_verb_object_triples, acronyms_and_definitions,
+    semistructured_statements, semistructured_statements_multi, direct_quotations)}
+# extractors that accept a `_DocData` in place of a doc, and use its shared data
+_SHARED_DATA_EXTRACTORS = {
+    words, ngrams, noun_chunks, pos_regex_matches, pos_regex_matches_multi,
+    subject_verb_object_triples, direct_quotations}
+
@@ -1,5 +1,6 @@
 from .read import (read_json, read_json_lines, read_json_mash,
                    read_file, read_file_lines, read_spacy_docs,
+                   read_spacy_docs_offsets,
                    read_sparse_csr_matrix, read_sparse_csc_matrix,
                    get_filenames, split_content_and_metadata)
 from .write import (write_json, write_json_lines,
@@ -8,10 +8,12 @@ import gzip
 import io
 from itertools import tee, starmap
 import json
+import mmap
 import os
 
 from cytoolz.itertoolz import cons, pluck
 import ijson
+from numpy import fromfile as np_fromfile
 from numpy import load as np_load
 from scipy.sparse import csc_matrix, csr_matrix
 from spacy.tokens.doc import Doc as SpacyDoc
@@ -207,7 +209,7 @@ def read_file_lines(filename, mode='rt', encoding=None):
                 yield line
 
 
-def read_spacy_docs(spacy_vocab, filename):
+def read_spacy_docs(spacy_vocab, filename, indexes=None):
     """
     Stream ``spacy.Doc`` s from disk at ``filename`` where they were serialized
     using Spacy's ``spacy.Doc.to_bytes()`` functionality.
@@ -216,13 +218,61 @@ def read_spacy_docs(spacy_vocab, filename):
         spacy_vocab (``spacy.Vocab``): the spacy vocab object used to serialize
             the docs in ``filename``
         filename (str): /path/to/file on disk from which spacy docs will be streamed
+        indexes (iterable(int), optional): if specified, only the docs at these
+            positions in ``filename`` are read, in the given order, by seeking
+            straight to them via the memory-mapped file; this requires the byte
+            offsets index written by ``write_spacy_docs(..., index=True)``
 
     Yields:
         the next deserialized ``spacy.Doc``
     """
-    with io.open(filename, mode='rb') as f:
-        for bytes_string in SpacyDoc.read_bytes(f):
-            yield SpacyDoc(spacy_vocab).from_bytes(bytes_string)
+    if indexes is None:
+        with io.open(filename, mode='rb') as f:
+            for bytes_string in SpacyDoc.read_bytes(f):
+                yield SpacyDoc(spacy_vocab).from_bytes(bytes_string)
+    else:
+        offsets = read_spacy_docs_offsets(filename)
+        # empty files (no docs) can't be memory-mapped, so don't try
+        if offsets[-1] == 0:
+            mm = b''
+        else:
+            with io.open(filename, mode='rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for index in indexes:
+                yield SpacyDoc(spacy_vocab).from_bytes(
+                    mm[offsets[index]: offsets[index + 1]])
+        finally:
+            if isinstance(mm, mmap.mmap):
+                mm.close()
+
+
+def read_spacy_docs_offsets(filename):
+    """
+    Read the byte offsets of ``spacy.Doc`` s serialized to disk at ``filename``
+    from its sidecar index file, as written by ``write_spacy_docs(..., index=True)``.
+
+    Args:
+        filename (str): /path/to/file on disk where spacy docs are stored (*not*
+            the path to the index file itself)
+
+    Returns:
+        :class:`numpy.ndarray`: array of length (# docs + 1), where doc i
+            occupies bytes ``offsets[i]`` up to ``offsets[i + 1]`` of ``filename``
+
+    Raises:
+        IOError: if the index file is not found on disk
+        ValueError: if the index file is out-of-date, i.e. its last offset
+            (the size of ``filename`` when the index was written) doesn't equal
+            the current size of ``filename``, which has since been rewritten
+    """
+    offsets = np_fromfile(filename + '.idx', dtype='<u8')
+    file_size = os.path.getsize(filename)
+    if len(offsets) == 0 or int(offsets[-1]) != file_size:
+        msg = 'index file {} is out-of-date: it ends at byte {}, but {} has {} bytes'.format(
+            filename + '.idx', int(offsets[-1]) if len(offsets) else None, filename, file_size)
+        raise ValueError(msg)
+    return offsets
 
 
 def read_sparse_csr_matrix(filename):
@@ -6,7 +6,7 @@ from __future__ import absolute_import, division, print_function, unicode_litera
 import gzip
 import io
 import json
-from numpy import savez, savez_compressed
+from numpy import asarray, savez, savez_compressed
 import os
 from scipy.sparse import csc_matrix, csr_matrix
 
@@ -102,7 +102,7 @@ def write_file_lines(lines, filename, mode='wt', encoding=None):
             for line in lines:
                 f.write(line +'\n')
 
-def write_spacy_docs(spacy_docs, filename):
+def write_spacy_docs(spacy_docs, filename, index=False):
     """
     Serialize a sequence of ``spacy.Doc`` s to disk at ``filename`` using Spacy's
     ``spacy.Doc.to_bytes()`` functionality.
@@ -111,13 +111,23 @@ def write_spacy_docs(spacy_docs, filename):
         spacy_docs (``spacy.Doc`` or iterable(``spacy.Doc``)): a single spacy doc
             or a sequence of spacy docs to serialize to disk at ``filename``
         filename (str): /path/to/file on disk from which spacy docs will be streamed
+        index (bool, optional): if True, also write the byte offsets of all docs
+            in ``filename`` to a sidecar file at ``filename + '.idx'``, so that
+            individual docs can be read back without reading the rest of the file;
+            see :func:`read_spacy_docs() <textacy.fileio.read.read_spacy_docs>`
     """
     _make_dirs(filename)
     if isinstance(spacy_docs, SpacyDoc):
         spacy_docs = [spacy_docs]
+    offsets = [0]
     with io.open(filename, mode='wb') as f:
         for doc in spacy_docs:
-            f.write(doc.to_bytes())
+            doc_bytes = doc.to_bytes()
+            f.write(doc_bytes)
+            offsets.append(offsets[-1] + len(doc_bytes))
+    if index is True:
+        with io.open(filename + '.idx', mode='wb') as f:
+            f.write(asarray(offsets, dtype='<u8').tobytes())
 
 
 def write_sparse_matrix(matrix, filename, compressed=False):
@@ -0,0 +1,134 @@
+"""
+Asynchronous front-end for adding texts to a :class:`TextCorpus <textacy.texts.TextCorpus>`
+from within an ``asyncio`` event loop, e.g. as they arrive from network consumers,
+without blocking the loop while spaCy parses them. Requires Python 3.5+.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from textacy.texts import TextDoc
+
+
+class AsyncCorpusIngestor(object):
+    """
+    Accept texts (and metadata) from coroutines via ``await ingestor.put(text, metadata)``,
+    collect them into micro-batches, parse each batch with ``spacy_pipeline.pipe()``
+    on a worker thread, and append the resulting :class:`TextDoc <textacy.texts.TextDoc>` s
+    to ``textcorpus`` in the order in which they were put.
+
+    Args:
+        textcorpus (:class:`TextCorpus <textacy.texts.TextCorpus>`): corpus to
+            which parsed docs are added; shouldn't be otherwise modified while
+            the ingestor is running
+        batch_size (int, optional): maximum number of texts parsed together;
+            batches are smaller if fewer texts are waiting
+        max_queue_size (int, optional): maximum number of texts waiting to be
+            parsed; once reached, :meth:`put() <AsyncCorpusIngestor.put>` waits
+            until there's room, applying backpressure to producers
+        n_threads (int, optional): passed to ``spacy_pipeline.pipe()``
+
+    Example::
+
+        >>> corpus = textacy.TextCorpus('en')
+        >>> async def ingest(texts):
+        ...     ingestor = AsyncCorpusIngestor(corpus, batch_size=100)
+        ...     for text in texts:
+        ...         await ingestor.put(text, {'source': 'feed'})
+        ...     await ingestor.close()
+        >>> asyncio.get_event_loop().run_until_complete(ingest(texts))
+
+    Note:
+        Docs are added to ``textcorpus`` on the worker thread, so wait on
+        :meth:`flush() <AsyncCorpusIngestor.flush>` before reading from it.
+        If parsing or adding a batch fails, the exception is raised by the
+        next call to ``put()``, ``flush()``, or ``close()``.
+    """
+    def __init__(self, textcorpus, batch_size=100, max_queue_size=1000, n_threads=2):
+        self.textcorpus = textcorpus
+        self.batch_size = batch_size
+        self.max_queue_size = max_queue_size
+        self.n_threads = n_threads
+        self.n_docs_added = 0
+        # queue and worker task are bound to the event loop in which
+        # the ingestor is first used, so they're created lazily
+        self._queue = None
+        self._worker = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._error = None
+
+    def __repr__(self):
+        return 'AsyncCorpusIngestor({} docs added; {} texts queued)'.format(
+            self.n_docs_added, self._queue.qsize() if self._queue is not None else 0)
+
+    async def put(self, text, metadata=None):
+        """
+        Queue ``text`` and its ``metadata`` to be parsed and added to the corpus,
+        waiting first if the queue is full.
+
+        Args:
+            text (str)
+            metadata (dict, optional)
+        """
+        self._raise_error()
+        if self._worker is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._worker = asyncio.ensure_future(self._run())
+        await self._queue.put((text, metadata))
+
+    async def flush(self):
+        """Wait until all queued texts have been parsed and added to the corpus."""
+        if self._queue is not None:
+            await self._queue.join()
+        self._raise_error()
+
+    async def close(self):
+        """Flush all queued texts, then stop the worker; the ingestor can't be reused."""
+        try:
+            await self.flush()
+        finally:
+            if self._worker is not None:
+                self._worker.cancel()
+                try:
+                    await self._worker
+                except asyncio.CancelledError:
+                    pass
+            self._executor.shutdown(wait=True)
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await loop.run_in_executor(self._executor, self._add_batch, batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _add_batch(self, batch):
+        # errors are caught here, on the worker thread, rather than in the worker
+        # task, so that their tracebacks don't reference its (suspended) frame
+        try:
+            texts, metadatas = zip(*batch)
+            spacy_pipeline = self.textcorpus.spacy_pipeline
+            spacy_docs = spacy_pipeline.pipe(
+                texts, n_threads=self.n_threads, batch_size=len(texts))
+            for spacy_doc, metadata in zip(spacy_docs, metadatas):
+                self.textcorpus.add_doc(
+                    TextDoc(spacy_doc, spacy_pipeline=spacy_pipeline,
+                            lang=self.textcorpus.lang, metadata=metadata))
+                self.n_docs_added += 1
+        except Exception as e:
+            if self._error is None:
+                self._error = e
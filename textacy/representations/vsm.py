@@ -91,6 +91,38 @@ def build_doc_term_matrix(terms_lists,
     id_to_term = {term_id - 1: term for term_id, term in enumerate(stringstore)
                   if term_id != 0}
 
+    return filter_and_weight_doc_term_matrix(
+        doc_term_matrix, id_to_term, weighting=weighting,
+        normalize=normalize, sublinear_tf=sublinear_tf, smooth_idf=smooth_idf,
+        min_df=min_df, max_df=max_df, min_ic=min_ic, max_n_terms=max_n_terms)
+
+
+def filter_and_weight_doc_term_matrix(doc_term_matrix, id_to_term,
+                                      weighting='tf',
+                                      normalize=False, sublinear_tf=False, smooth_idf=True,
+                                      min_df=1, max_df=1.0, min_ic=0.0, max_n_terms=None):
+    """
+    Filter terms from and apply weighting and normalization schemes to a raw
+    term-count document-term matrix, as in :func:`build_doc_term_matrix()`;
+    useful for matrices whose counts were built by other means, e.g. directly
+    from spacy docs' attribute arrays.
+
+    Args:
+        doc_term_matrix (:class:`scipy.sparse.csr_matrix <scipy.sparse.csr_matrix>`):
+            of shape (# docs, # unique terms), where value (i, j) is the number
+            of occurrences of term j in doc i
+        id_to_term (dict): mapping of unique integer term ids (matrix columns)
+            to corresponding strings
+
+    .. seealso:: :func:`build_doc_term_matrix()` for all other args.
+
+    Returns:
+        :class:`scipy.sparse.csr_matrix <scipy.sparse.csr_matrix>`: sparse matrix
+            of shape (# docs, # unique terms), where value (i, j) is the weight
+            of term j in doc i
+        dict: id to term mapping, where keys are unique integers as term ids and
+            values are corresponding strings
+    """
     # filter terms by document frequency or information content?
     if max_df != 1.0 or min_df != 1 or max_n_terms is not None:
         doc_term_matrix, id_to_term = filter_terms_by_df(
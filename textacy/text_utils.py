@@ -3,9 +3,11 @@ Set of small utility functions that take text strings as input.
 """
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+import hashlib
 import logging
 import re
 
+from cachetools import LRUCache
 from cld2 import detect as cld2_detect
 
 from textacy.compat import PY2, str
@@ -16,6 +18,12 @@ from textacy.regexes_etc import (ACRONYM_REGEX, DANGLING_PARENS_TERM_RE,
 
 logger = logging.getLogger(__name__)
 
+LANG_DETECTION_MAX_CHARS = 10000
+"""int: max number of leading characters of a text used to detect its language"""
+
+_LANG_CACHE = LRUCache(maxsize=100000)
+"""``cachetools.LRUCache``: detected languages keyed by hash of text sample"""
+
 
 def is_acronym(token, exclude=None):
     """
@@ -81,6 +89,40 @@ def detect_language(text):
     return best_guesses[0][1]
 
 
+def detect_languages(texts, max_n_chars=LANG_DETECTION_MAX_CHARS):
+    """
+    Detect the most likely language of each text in ``texts``, and return their
+    2-letter codes in order. Only a bounded prefix of each text -- its first
+    ``max_n_chars`` characters, backed off to the last whitespace -- is passed
+    to :func:`detect_language() <textacy.text_utils.detect_language>`, and
+    results are memoized by a hash of that prefix, so that long and repeated
+    texts (within and across calls) are cheap to detect.
+
+    Args:
+        texts (iterable(str))
+        max_n_chars (int, optional): maximum number of leading characters in
+            each text used to detect its language
+
+    Returns:
+        list(str)
+    """
+    langs = []
+    for text in texts:
+        if len(text) > max_n_chars:
+            text = text[:max_n_chars]
+            # don't cut a word in half, if possible
+            if not text[-1].isspace():
+                text = text.rsplit(None, 1)[0]
+        key = hashlib.md5(text.encode('utf8')).digest()
+        try:
+            lang = _LANG_CACHE[key]
+        except KeyError:
+            lang = detect_language(text)
+            _LANG_CACHE[key] = lang
+        langs.append(lang)
+    return langs
+
+
 def keyword_in_context(text, keyword, ignore_case=True,
                        window_width=50, print_only=True):
     """
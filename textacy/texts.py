@@ -5,19 +5,45 @@ collections (corpora).
 """
 from __future__ import absolute_import, division, print_function, unicode_literals
 
+from bisect import bisect_left, bisect_right
 from collections import Counter
 import copy
+import io
+import itertools
+import json
+import logging
+from math import log
+import mmap
+import multiprocessing
+import os
+import pickle
 import re
+import sys
+import types
 
+from cachetools import Cache, LRUCache, hashkey
 from cytoolz import itertoolz
+import numpy as np
+import scipy.sparse as sp
+from spacy import attrs
 from spacy.tokens.doc import Doc as sdoc
 from spacy.tokens.token import Token as stoken
 from spacy.tokens.span import Span as sspan
 
 from textacy.compat import str, zip
-from textacy import data, extract, spacy_utils, text_stats, text_utils, keyterms
+from textacy import data, extract, fileio, spacy_utils, text_stats, text_utils, keyterms
 from textacy.representations import network, vsm
 
+logger = logging.getLogger(__name__)
+
+PIPELINE_STAGES = ('tag', 'parse', 'entity')
+_ALL_PIPELINE_STAGES = frozenset(PIPELINE_STAGES)
+
+# rough sizes of spacy's per-token and per-lexeme C structs, which aren't
+# visible from python, for estimating memory usage
+_SPACY_TOKEN_NBYTES = 96
+_SPACY_LEXEME_NBYTES = 128
+
 
 class TextDoc(object):
     """
@@ -45,13 +71,45 @@ class TextDoc(object):
 
                 {'title': 'A Search for Second-generation Leptoquarks in pp Collisions at √s = 7 TeV with the ATLAS Detector',
                  'author': 'Burton DeWilde', 'pub_date': '2012-08-01'}
+        cache_size (int, optional): maximum number of results from information
+            extraction methods (``words()``, ``ngrams()``, ``key_terms()``, etc.)
+            and ``term_counts()`` that are cached on the doc, keyed by method
+            and arguments; least recently used results are evicted first
+        lazy (bool, optional): if True and ``text_or_sdoc`` is a str, only
+            tokenize the text up front; the spacy tagger, parser, and entity
+            recognizer are run later, as and when a method first needs them
+            (see :meth:`TextDoc.process() <textacy.texts.TextDoc.process>`)
+
+    Attributes:
+        processed_stages (frozenset(str)): spacy pipeline stages that have been
+            run on ``spacy_doc``, a subset of {'tag', 'parse', 'entity'}
+
+    Note:
+        ``TextDoc`` defines ``__slots__`` to keep per-doc memory overhead low in
+        large corpora, so arbitrary attributes can't be set on instances; use
+        ``metadata`` instead. Scalar stats (``n_sents``, ``n_words``, ``n_paragraphs()``)
+        are computed on first access, then cached.
     """
-    def __init__(self, text_or_sdoc, spacy_pipeline=None, lang=None, metadata=None):
+    __slots__ = ('metadata', 'lang', 'spacy_vocab', 'spacy_stringstore', '_spacy_doc',
+                 'processed_stages', 'corpus', 'corpus_index', '_spill',
+                 '_spacy_pipeline', '_cache', '_cache_size',
+                 '_term_index', '_term_index_n',
+                 '_n_sents', '_n_words', '_n_paragraphs')
+
+    def __init__(self, text_or_sdoc, spacy_pipeline=None, lang=None, metadata=None,
+                 cache_size=32, lazy=False):
         self.metadata = {} if metadata is None else metadata
-        self._term_counts = Counter()
+        # caches are created on first use, since many docs never need them
+        self._cache = None
+        self._cache_size = cache_size
+        self._term_index = {}
+        self._term_index_n = 0
+        self._n_sents = None
+        self._n_words = None
+        self._n_paragraphs = None
 
         if isinstance(text_or_sdoc, str):
-            self.lang = text_utils.detect_language(text_or_sdoc) if not lang else lang
+            self.lang = text_utils.detect_languages([text_or_sdoc])[0] if not lang else lang
             if spacy_pipeline is None:
                 spacy_pipeline = data.load_spacy(self.lang)
             # check for match between text and passed spacy_pipeline language
@@ -62,20 +120,98 @@ class TextDoc(object):
                     raise ValueError(msg)
             self.spacy_vocab = spacy_pipeline.vocab
             self.spacy_stringstore = self.spacy_vocab.strings
-            self.spacy_doc = spacy_pipeline(text_or_sdoc)
+            if lazy is True:
+                self.spacy_doc = spacy_pipeline(
+                    text_or_sdoc, tag=False, parse=False, entity=False)
+                self.processed_stages = frozenset()
+                self._spacy_pipeline = spacy_pipeline
+            else:
+                self.spacy_doc = spacy_pipeline(text_or_sdoc)
+                self.processed_stages = _ALL_PIPELINE_STAGES
+                self._spacy_pipeline = None
 
         elif isinstance(text_or_sdoc, sdoc):
-            self.lang = spacy_pipeline.lang if spacy_pipeline is not None else \
-                text_utils.detect_language(text_or_sdoc.text_with_ws)
+            if lang:
+                self.lang = lang
+            elif spacy_pipeline is not None:
+                self.lang = spacy_pipeline.lang
+            else:
+                self.lang = text_utils.detect_languages([_get_text_prefix(
+                    text_or_sdoc, text_utils.LANG_DETECTION_MAX_CHARS)])[0]
             self.spacy_vocab = text_or_sdoc.vocab
             self.spacy_stringstore = self.spacy_vocab.strings
             self.spacy_doc = text_or_sdoc
+            self.processed_stages = _ALL_PIPELINE_STAGES
+            self._spacy_pipeline = None
 
         else:
             msg = 'TextDoc must be initialized with {}, not {}'.format(
                 {str, sdoc}, type(text_or_sdoc))
             raise ValueError(msg)
 
+    @property
+    def spacy_doc(self):
+        """
+        ``spacy.Doc``: the processed content of this doc; if it has been spilled
+        to disk (see :meth:`TextDoc.spill() <textacy.texts.TextDoc.spill>`),
+        it's transparently loaded back into memory.
+        """
+        if self._spacy_doc is None:
+            store, index = self._spill
+            self._spacy_doc = store.load(index, self.spacy_vocab)
+        return self._spacy_doc
+
+    @spacy_doc.setter
+    def spacy_doc(self, spacy_doc):
+        self._spacy_doc = spacy_doc
+        self._spill = None
+
+    @property
+    def is_spilled(self):
+        """bool: True if ``spacy_doc`` is currently on disk rather than in memory."""
+        return self._spacy_doc is None
+
+    def spill(self, store):
+        """
+        Free up memory by dropping this doc's ``spacy_doc`` and all cached results;
+        the former is first serialized to ``store``, unless it's already there
+        and unchanged, and is loaded back into memory on next access.
+
+        Args:
+            store (:class:`DocSpillStore <textacy.texts.DocSpillStore>`)
+        """
+        if self._spacy_doc is None:
+            return
+        if self._spill is None or self._spill[0] is not store:
+            self._spill = (store, store.append(self._spacy_doc))
+        self.clear_cache()
+        self._spacy_doc = None
+
+    def clear_cache(self):
+        """
+        Clear all cached information extraction results, term counts, and the
+        term index from this doc, e.g. to free up memory.
+        """
+        self._cache = None
+        self._term_index = {}
+        self._term_index_n = 0
+
+    def __copy__(self):
+        """
+        Make a shallow copy of this doc that shares its underlying ``spacy.Doc``,
+        but has its own copy of ``metadata`` and its own (initially empty) caches.
+        """
+        doc = self.__class__.__new__(self.__class__)
+        for slot in TextDoc.__slots__:
+            try:
+                setattr(doc, slot, getattr(self, slot))
+            except AttributeError:  # slot not set, e.g. corpus
+                continue
+        doc.metadata = copy.copy(self.metadata)
+        doc.clear_cache()
+        doc._n_paragraphs = None
+        return doc
+
     def __repr__(self):
         snippet = self.text[:50].replace('\n',' ')
         if len(snippet) == 50:
@@ -101,6 +237,7 @@ class TextDoc(object):
     @property
     def sents(self):
         """Yield the document's sentences as segmented by spacy."""
+        self.process('parse')
         for sent in self.spacy_doc.sents:
             yield sent
 
@@ -115,6 +252,80 @@ class TextDoc(object):
                 or :func:`extract.pos_regex_matches() <textacy.extract.pos_regex_matches>`
         """
         spacy_utils.merge_spans(spans)
+        self.clear_cache()
+        self._n_sents = None
+        self._n_words = None
+        # spilled copy of spacy doc (if any) is now out-of-date
+        self._spill = None
+
+    def process(self, *stages):
+        """
+        Run spacy pipeline ``stages`` on a lazily-processed doc *in-place*, if
+        they haven't been run already. Stages always run in pipeline order --
+        tag, then parse, then entity -- so any preceding stages are run first.
+        Components run in the same order as in the full pipeline -- tagger,
+        matcher (with the 'entity' stage), parser, entity recognizer -- except
+        when 'entity' is run in a later call than 'parse', in which case
+        the matcher necessarily runs after the parser.
+
+        Args:
+            *stages (str {'tag', 'parse', 'entity'}): pipeline stages to run;
+                if none are given, all stages are run
+
+        Raises:
+            ValueError: if any of ``stages`` are not valid pipeline stages
+        """
+        stages = frozenset(stages) if stages else _ALL_PIPELINE_STAGES
+        if stages <= self.processed_stages:
+            return
+        if not stages <= _ALL_PIPELINE_STAGES:
+            msg = 'stages {} not valid; must be in {}'.format(
+                set(stages - _ALL_PIPELINE_STAGES), PIPELINE_STAGES)
+            raise ValueError(msg)
+        last_stage = max(PIPELINE_STAGES.index(stage) for stage in stages)
+        stages = [stage for stage in PIPELINE_STAGES[:last_stage + 1]
+                  if stage not in self.processed_stages]
+        # same order as spacy's pipeline: tagger, matcher, parser, entity
+        components = []
+        if 'tag' in stages:
+            components.append(self._spacy_pipeline.tagger)
+        if 'entity' in stages:
+            components.append(getattr(self._spacy_pipeline, 'matcher', None))
+        if 'parse' in stages:
+            components.append(self._spacy_pipeline.parser)
+        if 'entity' in stages:
+            components.append(self._spacy_pipeline.entity)
+        for component in components:
+            if component is not None:
+                component(self.spacy_doc)
+        self.processed_stages = self.processed_stages | frozenset(stages)
+        # spilled copy of spacy doc (if any) is now out-of-date
+        self._spill = None
+        # all done! no need to hold on to the pipeline
+        if self.processed_stages == _ALL_PIPELINE_STAGES:
+            self.processed_stages = _ALL_PIPELINE_STAGES
+            self._spacy_pipeline = None
+
+    def _cached(self, func, *args, **kwargs):
+        """
+        Get the result of calling ``func(*args, **kwargs)`` from the doc's cache,
+        calling it and caching the result first if needed. Results that are
+        generators are materialized for caching, so an iterator over them is
+        returned instead.
+        """
+        if self._cache is None:
+            self._cache = LRUCache(maxsize=self._cache_size)
+        key = hashkey(func.__name__, *_hashable(args), **dict(zip(kwargs, _hashable(kwargs.values()))))
+        try:
+            result = self._cache[key]
+        except KeyError:
+            result = func(*args, **kwargs)
+            if isinstance(result, types.GeneratorType):
+                result = tuple(result)
+            self._cache[key] = result
+        if isinstance(result, tuple):
+            return iter(result)
+        return result
 
     ###############
     # DOC AS TEXT #
@@ -128,13 +339,13 @@ class TextDoc(object):
     def tokenized_text(self):
         """Return text as an ordered, nested list of tokens per sentence."""
         return [[token.text for token in sent]
-                for sent in self.spacy_doc.sents]
+                for sent in self.sents]
 
     @property
     def pos_tagged_text(self):
         """Return text as an ordered, nested list of (token, POS) pairs per sentence."""
         return [[(token.text, token.pos_) for token in sent]
-                for sent in self.spacy_doc.sents]
+                for sent in self.sents]
 
     #######################
     # DOC REPRESENTATIONS #
@@ -151,7 +362,8 @@ class TextDoc(object):
             weighting (str {'tf', 'tfidf'}, optional): weighting of term weights,
                 either term frequency ('tf') or tf * inverse doc frequency ('tfidf')
             idf (dict, optional): if `weighting` = 'tfidf', idf's must be supplied
-                externally, such as from a `TextCorpus` object
+                externally, such as from a `TextCorpus` object via
+                :attr:`TextCorpus.idf <textacy.texts.TextCorpus.idf>`
             lemmatize (bool or 'auto', optional): if True, lemmatize all terms
                 when getting their frequencies
             ngram_range (tuple(int), optional): (min n, max n) values for n-grams
@@ -290,6 +502,7 @@ class TextDoc(object):
                     all_terms.append(self.ngrams(n, **kwargs))
 
         if lemmatize is True:
+            self.process('tag')
             for term in itertoolz.concat(all_terms):
                 yield term.lemma_
         else:
@@ -306,7 +519,11 @@ class TextDoc(object):
 
         .. seealso:: :func:`extract.words() <textacy.extract.words>` for all function kwargs.
         """
-        return extract.words(self.spacy_doc, **kwargs)
+        # POS filters and frequency filtering of normalized terms need POS tags
+        if (kwargs.get('good_pos_tags') or kwargs.get('bad_pos_tags') or
+                kwargs.get('min_freq', 1) > 1):
+            self.process('tag')
+        return self._cached(extract.words, self.spacy_doc, **kwargs)
 
     def ngrams(self, n, **kwargs):
         """
@@ -320,7 +537,11 @@ class TextDoc(object):
 
         .. seealso:: :func:`extract.ngrams() <textacy.extract.ngrams>` for all function kwargs.
         """
-        return extract.ngrams(self.spacy_doc, n, **kwargs)
+        # POS filters and frequency filtering of normalized terms need POS tags
+        if (kwargs.get('good_pos_tags') or kwargs.get('bad_pos_tags') or
+                kwargs.get('min_freq', 1) > 1):
+            self.process('tag')
+        return self._cached(extract.ngrams, self.spacy_doc, n, **kwargs)
 
     def named_entities(self, **kwargs):
         """
@@ -330,7 +551,8 @@ class TextDoc(object):
         .. seealso:: :func:`extract.named_entities() <textacy.extract.named_entities>`
         for all function kwargs.
         """
-        return extract.named_entities(self.spacy_doc, **kwargs)
+        self.process('entity')
+        return self._cached(extract.named_entities, self.spacy_doc, **kwargs)
 
     def noun_chunks(self, **kwargs):
         """
@@ -340,7 +562,8 @@ class TextDoc(object):
         .. seealso:: :func:`extract.noun_chunks() <textacy.extract.noun_chunks>`
         for all function kwargs.
         """
-        return extract.noun_chunks(self.spacy_doc, **kwargs)
+        self.process('parse')
+        return self._cached(extract.noun_chunks, self.spacy_doc, **kwargs)
 
     def pos_regex_matches(self, pattern):
         """
@@ -362,13 +585,32 @@ class TextDoc(object):
                 * verb phrase: r'<VERB>?<ADV>*<VERB>+'
                 * prepositional phrase: r'<PREP> <DET>? (<NOUN>+<ADP>)* <NOUN>+'
         """
+        self.process('tag')
         return extract.pos_regex_matches(self.spacy_doc, pattern)
 
+    def pos_regex_matches_multi(self, patterns):
+        """
+        Extract sequences of consecutive tokens from a spacy-parsed doc whose
+        part-of-speech tags match any of the specified regex patterns, labeled
+        by the name of the matching pattern. The doc is scanned once for all
+        patterns, rather than once per pattern.
+
+        Args:
+            patterns (dict): mapping of pattern name to pattern, where patterns
+                are as described in :meth:`pos_regex_matches() <TextDoc.pos_regex_matches>`,
+                e.g. :obj:`POS_REGEX_PATTERNS['en'] <textacy.regexes_etc.POS_REGEX_PATTERNS>`
+
+        .. seealso:: :func:`extract.pos_regex_matches_multi() <textacy.extract.pos_regex_matches_multi>`
+        """
+        self.process('tag')
+        return extract.pos_regex_matches_multi(self.spacy_doc, patterns)
+
     def subject_verb_object_triples(self):
         """
         Extract an *un*ordered sequence of distinct subject-verb-object (SVO) triples
         from doc.
         """
+        self.process('parse')
         return extract.subject_verb_object_triples(self.spacy_doc)
 
     def acronyms_and_definitions(self, **kwargs):
@@ -380,6 +622,7 @@ class TextDoc(object):
         .. seealso:: :func:`extract.acronyms_and_definitions() <textacy.extract.acronyms_and_definitions>`
         for all function kwargs.
         """
+        self.process('parse')
         return extract.acronyms_and_definitions(self.spacy_doc, **kwargs)
 
     def semistructured_statements(self, entity, **kwargs):
@@ -394,13 +637,33 @@ class TextDoc(object):
         .. seealso:: :func:`extract.semistructured_statements() <textacy.extract.semistructured_statements>`
         for all function kwargs.
         """
+        self.process('parse')
         return extract.semistructured_statements(self.spacy_doc, entity, **kwargs)
 
+    def semistructured_statements_multi(self, entities, **kwargs):
+        """
+        Extract "semi-structured statements" from doc for each of many entities,
+        finding all of them in a single pass over the doc.
+
+        Args:
+            entities (iterable(str)): nouns or noun phrases of some sort
+                (e.g. "President Obama", "global warming", "Python")
+
+        Returns:
+            dict: mapping of each entity to a list of its (entity, cue, fragment) triples
+
+        .. seealso:: :func:`extract.semistructured_statements_multi() <textacy.extract.semistructured_statements_multi>`
+        for all function kwargs.
+        """
+        self.process('parse')
+        return extract.semistructured_statements_multi(self.spacy_doc, entities, **kwargs)
+
     def direct_quotations(self):
         """
         Baseline, not-great attempt at direction quotation extraction (no indirect
         or mixed quotations) using rules and patterns. English only.
         """
+        self.process('parse')
         return extract.direct_quotations(self.spacy_doc)
 
     def key_terms(self, algorithm='sgrank', n=10):
@@ -417,12 +680,13 @@ class TextDoc(object):
         Raises:
             ValueError: if ``algorithm`` not in {'sgrank', 'textrank', 'singlerank'}
         """
+        self.process()
         if algorithm == 'sgrank':
-            return keyterms.sgrank(self.spacy_doc, window_width=1500, n_keyterms=n)
+            return list(self._cached(keyterms.sgrank, self.spacy_doc, window_width=1500, n_keyterms=n))
         elif algorithm == 'textrank':
-            return keyterms.textrank(self.spacy_doc, n_keyterms=n)
+            return list(self._cached(keyterms.textrank, self.spacy_doc, n_keyterms=n))
         elif algorithm == 'singlerank':
-            return keyterms.singlerank(self.spacy_doc, n_keyterms=n)
+            return list(self._cached(keyterms.singlerank, self.spacy_doc, n_keyterms=n))
         else:
             raise ValueError('algorithm {} not a valid option'.format(algorithm))
 
@@ -449,6 +713,16 @@ class TextDoc(object):
             :class:`collections.Counter() <collections.Counter>`: mapping of unique
                 term ids to corresponding term counts
         """
+        term_counts = self._cached(
+            self._count_terms, lemmatize=lemmatize, ngram_range=tuple(ngram_range),
+            include_nes=include_nes, include_ncs=include_ncs, include_kts=include_kts)
+        return Counter(term_counts)
+
+    def _count_terms(self, lemmatize='auto', ngram_range=(1, 1),
+                     include_nes=False, include_ncs=False, include_kts=False):
+        term_counts = Counter()
+        if lemmatize is not False:
+            self.process('tag')
         if lemmatize == 'auto':
             get_id = lambda x: self.spacy_stringstore[spacy_utils.normalized_str(x)]
         elif lemmatize is True:
@@ -456,68 +730,188 @@ class TextDoc(object):
         else:
             get_id = lambda x: self.spacy_stringstore[x.text]
 
-        for n in range(ngram_range[0], ngram_range[1] + 1):
-            if n == 1:
-                self._term_counts = self._term_counts | Counter(
-                    get_id(word) for word in self.words())
-            else:
-                self._term_counts = self._term_counts | Counter(
-                    get_id(ngram) for ngram in self.ngrams(n))
+        # words and n-grams are counted in bulk from the doc's attribute arrays
+        doc_data = extract._DocData(self.spacy_doc)
+        for n in range(max(ngram_range[0], 1), ngram_range[1] + 1):
+            _update_max(term_counts, _count_ngram_ids(doc_data, n, lemmatize, get_id))
         if include_nes is True:
-            self._term_counts = self._term_counts | Counter(
-                get_id(ne) for ne in self.named_entities())
+            _update_max(term_counts, Counter(
+                get_id(ne) for ne in self.named_entities()))
         if include_ncs is True:
-            self._term_counts = self._term_counts | Counter(
-                get_id(nc) for nc in self.noun_chunks())
+            _update_max(term_counts, Counter(
+                get_id(nc) for nc in self.noun_chunks()))
         if include_kts is True:
             # HACK: key terms are currently returned as strings
-            # TODO: cache key terms, and return them as spacy spans
+            # TODO: return key terms as spacy spans
             get_id = lambda x: self.spacy_stringstore[x]
-            self._term_counts = self._term_counts | Counter(
-                get_id(kt) for kt, _ in self.key_terms())
+            _update_max(term_counts, Counter(
+                get_id(kt) for kt, _ in self.key_terms()))
 
-        return self._term_counts
+        return term_counts
 
-    def term_count(self, term):
+    def term_count(self, term, fallback=False):
         """
-        Get the number of occurrences ("count") of term in doc.
+        Get the number of occurrences ("count") of term in doc, as looked up in
+        the doc's positional term index (see :meth:`TextDoc.term_positions() <textacy.texts.TextDoc.term_positions>`).
 
         Args:
-            term (str or ``spacy.Token`` or ``spacy.Span``)
+            term (str or ``spacy.Token`` or ``spacy.Span``): if str, the term
+                must be normalized as for :meth:`term_positions() <textacy.texts.TextDoc.term_positions>`
+            fallback (bool, optional): if True and ``term`` isn't in the index,
+                count all occurrences of its text in the doc's text instead,
+                including as substrings of other words; note that this is a
+                pass over the whole text
 
         Returns:
             int
         """
-        # figure out what object we're dealing with here; convert as necessary
+        term_count_ = len(self.term_positions(term))
+        if term_count_ == 0 and fallback is True:
+            term_text, _, _ = self._get_term_text_id_len(term)
+            return sum(1 for _ in re.finditer(re.escape(term_text), self.text))
+        return term_count_
+
+    def term_positions(self, term):
+        """
+        Get the token indexes in doc at which all occurrences of ``term`` start,
+        as looked up in the doc's positional term index (see
+        :meth:`TextDoc.build_term_index() <textacy.texts.TextDoc.build_term_index>`);
+        the index is built on first use, and extended as needed to cover
+        terms with more words than it currently does.
+
+        Args:
+            term (str or ``spacy.Token`` or ``spacy.Span``): if str, the term
+                must be normalized as by :func:`spacy_utils.normalized_str() <textacy.spacy_utils.normalized_str>`,
+                i.e. lemmatized unless it's a proper noun or acronym
+
+        Returns:
+            list(int)
+        """
+        term_text, term_id, term_len = self._get_term_text_id_len(term)
+        self.build_term_index(max_n=max(term_len, self._term_index_n or 3))
+        if term_id is None:
+            # building the index adds n-grams' strings to the string store
+            if term_text not in self.spacy_stringstore:
+                return []
+            term_id = self.spacy_stringstore[term_text]
+        try:
+            return self._term_index[term_id].tolist()
+        except KeyError:
+            return []
+
+    def build_term_index(self, max_n=3):
+        """
+        Build a positional index of terms in doc -- words and n-grams of up to
+        ``max_n`` tokens, excluding those with whitespace tokens -- mapping the id
+        of each term's :func:`normalized string <textacy.spacy_utils.normalized_str>`
+        to the token indexes at which it starts. If an index already exists,
+        it's only extended to cover longer n-grams.
+
+        The index makes :meth:`term_count() <textacy.texts.TextDoc.term_count>`,
+        :meth:`term_positions() <textacy.texts.TextDoc.term_positions>`, and
+        :meth:`keyword_in_context() <textacy.texts.TextDoc.keyword_in_context>`
+        lookups cost about the same regardless of the length of the doc.
+
+        Args:
+            max_n (int, optional): maximum number of tokens per indexed term
+        """
+        if max_n <= self._term_index_n:
+            return
+        self.process('tag')
+        doc_data = extract._DocData(self.spacy_doc)
+        term_ids = doc_data.normalized_ids()
+        is_space = doc_data.attr_array(attrs.IS_SPACE).astype(bool)
+        spacy_ = doc_data.attr_array(attrs.SPACY)
+        get_id = lambda x: self.spacy_stringstore[spacy_utils.normalized_str(x)]
+        for n in range(self._term_index_n + 1, max_n + 1):
+            starts = extract._get_ngram_starts(n, is_space)
+            if len(starts) == 0:
+                break
+            if n == 1:
+                _, first_idxs, inverse = np.unique(
+                    term_ids[starts], return_index=True, return_inverse=True)
+                inverse = inverse.ravel()
+            else:
+                first_idxs, inverse = _group_ngrams(n, starts, term_ids, spacy_)
+            # split all starts into groups of positions, one per unique term
+            group_starts = np.split(starts[np.argsort(inverse, kind='mergesort')],
+                                    np.cumsum(np.bincount(inverse))[:-1])
+            for first_idx, positions in zip(first_idxs.tolist(), group_starts):
+                start = int(starts[first_idx])
+                if n == 1:
+                    term_id = int(term_ids[start])
+                else:
+                    term_id = get_id(self.spacy_doc[start: start + n])
+                if term_id in self._term_index:
+                    positions = np.sort(np.concatenate((self._term_index[term_id], positions)))
+                self._term_index[term_id] = positions
+        self._term_index_n = max_n
+
+    def keyword_in_context(self, term, window_width=50, print_only=True):
+        """
+        Search for ``term`` in doc, return or print strings spanning ``window_width``
+        characters before and after each occurrence of it. Occurrences are looked
+        up in the doc's positional term index; if there are none, this falls back
+        to searching the doc's text for ``term`` as-is.
+
+        Args:
+            term (str or ``spacy.Token`` or ``spacy.Span``): if str, the term
+                should be normalized as for :meth:`term_positions() <textacy.texts.TextDoc.term_positions>`
+            window_width (int, optional): number of characters on either side of
+                ``term`` to include as "context"
+            print_only (bool, optional): if True, print out all results with nice
+                formatting; if False, return all (pre, kw, post) matches as generator
+                of raw strings
+
+        Returns:
+            generator(tuple(str, str, str)), or None
+
+        .. seealso:: :func:`text_utils.keyword_in_context() <textacy.text_utils.keyword_in_context>`
+        """
+        term_text, _, term_len = self._get_term_text_id_len(term)
+        positions = self.term_positions(term)
+        if not positions:
+            return text_utils.keyword_in_context(
+                self.text, re.escape(term_text), ignore_case=False,
+                window_width=window_width, print_only=print_only)
+        text = self.text
+        kwics = ((text[max(0, start_char - window_width): start_char],
+                  text[start_char: end_char],
+                  text[end_char: end_char + window_width])
+                 for start_char, end_char in
+                 ((self.spacy_doc[i].idx,
+                   self.spacy_doc[i + term_len - 1].idx + len(self.spacy_doc[i + term_len - 1]))
+                  for i in positions))
+        if print_only is True:
+            for pre, kw, post in kwics:
+                print('{pre} {kw} {post}'.format(
+                    pre=pre.rjust(window_width), kw=kw, post=post.ljust(window_width)))
+        else:
+            return kwics
+
+    def _get_term_text_id_len(self, term):
+        """
+        Get the (normalized) text, string id, and number of tokens of ``term``,
+        which may be a str, ``spacy.Token``, or ``spacy.Span``; the id is None
+        if ``term`` is a str that isn't in the string store, and thus can't
+        be in doc.
+        """
         if isinstance(term, str):
             term_text = term
-            term_id = self.spacy_stringstore[term_text]
             term_len = term_text.count(' ') + 1
+            # don't add unseen strings to the string store just to look them up
+            if term_text not in self.spacy_stringstore:
+                return (term_text, None, term_len)
         elif isinstance(term, stoken):
             term_text = spacy_utils.normalized_str(term)
-            term_id = self.spacy_stringstore[term_text]
             term_len = 1
         elif isinstance(term, sspan):
             term_text = spacy_utils.normalized_str(term)
-            term_id = self.spacy_stringstore[term_text]
             term_len = len(term)
-
-        term_count_ = self._term_counts[term_id]
-        if term_count_ > 0:
-            return term_count_
-        # have we not already counted the appropriate `n` n-grams?
-        if not any(self.spacy_stringstore[t].count(' ') == term_len
-                   for t in self._term_counts):
-            get_id = lambda x: self.spacy_stringstore[spacy_utils.normalized_str(x)]
-            if term_len == 1:
-                self._term_counts += Counter(get_id(w) for w in self.words())
-            else:
-                self._term_counts += Counter(get_id(ng) for ng in self.ngrams(term_len))
-            term_count_ = self._term_counts[term_id]
-            if term_count_ > 0:
-                return term_count_
-        # last resort: try a regular expression
-        return sum(1 for _ in re.finditer(re.escape(term_text), self.text))
+        else:
+            msg = 'term must be a str, spacy Token, or spacy Span, not {}'.format(type(term))
+            raise TypeError(msg)
+        return (term_text, self.spacy_stringstore[term_text], term_len)
 
     @property
     def n_tokens(self):
@@ -530,18 +924,31 @@ class TextDoc(object):
         The number of words in the document -- i.e. the number of tokens, excluding
         punctuation and whitespace.
         """
-        return sum(1 for _ in self.words(filter_stops=False,
-                                         filter_punct=True,
-                                         filter_nums=False))
+        if self._n_words is None:
+            if len(self.spacy_doc) == 0:
+                self._n_words = 0
+            else:
+                is_punct_or_space = self.spacy_doc.to_array([attrs.IS_PUNCT, attrs.IS_SPACE])
+                self._n_words = int(np.count_nonzero(~is_punct_or_space.any(axis=1)))
+        return self._n_words
 
     @property
     def n_sents(self):
         """The number of sentences in the document."""
-        return sum(1 for _ in self.spacy_doc.sents)
+        if self._n_sents is None:
+            self._n_sents = sum(1 for _ in self.sents)
+        return self._n_sents
 
     def n_paragraphs(self, pattern=r'\n\n+'):
         """The number of paragraphs in the document, as delimited by ``pattern``."""
-        return sum(1 for _ in re.finditer(pattern, self.text)) + 1
+        if self._n_paragraphs is None:
+            self._n_paragraphs = {}
+        try:
+            return self._n_paragraphs[pattern]
+        except KeyError:
+            n_paragraphs = sum(1 for _ in re.finditer(pattern, self.text)) + 1
+            self._n_paragraphs[pattern] = n_paragraphs
+            return n_paragraphs
 
     @property
     def readability_stats(self):
@@ -572,10 +979,21 @@ class TextCorpus(object):
         self.spacy_pipeline = data.load_spacy(self.lang)
         self.spacy_vocab = self.spacy_pipeline.vocab
         self.spacy_stringstore = self.spacy_vocab.strings
-        self.docs = []
+        self._docs = []
         self.n_docs = 0
-        self.n_sents = 0
-        self.n_tokens = 0
+        # sentences are only counted on first access, since that needs parsing
+        self._n_sents = None
+        self._n_tokens = 0
+        # term stats are computed on first access, then kept up-to-date
+        self._doc_freqs = None
+        self._term_freqs = None
+        self._docs_term_counts = None
+        self._metadata_indexes = {}
+        self.memory_budget = None
+        self._memory_budget_check_every = 1000
+        self._spill_store = None
+        # incremented whenever docs are removed, which invalidates views' indexes
+        self._n_removals = 0
 
     def __repr__(self):
         return 'TextCorpus({} docs; {} tokens)'.format(self.n_docs, self.n_tokens)
@@ -584,31 +1002,52 @@ class TextCorpus(object):
         return self.n_docs
 
     def __getitem__(self, index):
-        return self.docs[index]
+        return self._docs[index]
 
     def __iter__(self):
-        for doc in self.docs:
+        for doc in self._docs:
             yield doc
 
     @classmethod
-    def from_texts(cls, lang, texts, metadata=None, n_threads=2, batch_size=1000):
+    def from_texts(cls, lang, texts, metadata=None, n_threads=2, batch_size=1000,
+                   n_processes=1):
         """
         Convenience function for creating a :class:`TextCorpus <textacy.texts.TextCorpus>`
         from an iterable of text strings.
 
         Args:
-            lang (str)
+            lang (str): if None, the corpus' language is inferred as the most
+                common language detected among the first ``batch_size`` texts
+                (see :func:`text_utils.detect_languages() <textacy.text_utils.detect_languages>`)
             texts (iterable(str))
             metadata (iterable(dict), optional)
             n_threads (int, optional)
             batch_size (int, optional)
+            n_processes (int, optional): if greater than 1, ``texts`` are split
+                into chunks of ``batch_size`` and parsed in this many worker
+                processes, each of which loads its own spacy pipeline; parsed docs
+                are sent back as bytes and added to the corpus in their original order.
+                If ``texts`` can't be pickled for the workers, they're parsed
+                in a single process instead
 
         Returns:
             :class:`TextCorpus <textacy.texts.TextCorpus>`
         """
+        if lang is None:
+            texts = iter(texts)
+            first_texts = list(itertools.islice(texts, batch_size))
+            if not first_texts:
+                raise ValueError('lang can not be inferred from an empty iterable of texts')
+            lang = Counter(text_utils.detect_languages(first_texts)).most_common(1)[0][0]
+            texts = itertools.chain(first_texts, texts)
         textcorpus = cls(lang=lang)
-        spacy_docs = textcorpus.spacy_pipeline.pipe(
-            texts, n_threads=n_threads, batch_size=batch_size)
+        if n_processes > 1:
+            spacy_docs = _pipe_multiprocess(
+                lang, texts, textcorpus.spacy_pipeline, n_threads=n_threads,
+                n_processes=n_processes, batch_size=batch_size)
+        else:
+            spacy_docs = textcorpus.spacy_pipeline.pipe(
+                texts, n_threads=n_threads, batch_size=batch_size)
         if metadata is not None:
             for spacy_doc, md in zip(spacy_docs, metadata):
                 textcorpus.add_doc(TextDoc(spacy_doc, lang=lang,
@@ -621,6 +1060,60 @@ class TextCorpus(object):
                                            metadata=None))
         return textcorpus
 
+    def save(self, filename, metadata_filename=None):
+        """
+        Save all docs in the corpus to disk at ``filename``, along with an index
+        of their byte offsets (at ``filename + '.idx'``) and their metadata
+        (at ``metadata_filename``), such that the corpus can be re-loaded either
+        in full or lazily, one doc at a time, via :meth:`TextCorpus.load() <textacy.texts.TextCorpus.load>`.
+
+        Args:
+            filename (str): /path/to/file on disk to which spacy docs will be written
+            metadata_filename (str, optional): /path/to/file on disk to which
+                doc metadata will be written as JSON lines; if None,
+                ``filename`` + '.metadata.json' is used
+        """
+        if metadata_filename is None:
+            metadata_filename = filename + '.metadata.json'
+        fileio.write_spacy_docs((doc.spacy_doc for doc in self), filename, index=True)
+        fileio.write_json_lines((doc.metadata for doc in self), metadata_filename,
+                                mode='wt', encoding='utf-8')
+
+    @classmethod
+    def load(cls, lang, filename, metadata_filename=None, lazy=False, cache_size=1000):
+        """
+        Load a corpus previously saved to disk via :meth:`TextCorpus.save() <textacy.texts.TextCorpus.save>`.
+
+        Args:
+            lang (str): 2-letter code of corpus' language
+            filename (str): /path/to/file on disk from which spacy docs will be read
+            metadata_filename (str, optional): /path/to/file on disk from which
+                doc metadata will be read; if None, ``filename`` + '.metadata.json'
+                is used
+            lazy (bool, optional): if True, return a :class:`DiskTextCorpus <textacy.texts.DiskTextCorpus>`
+                whose docs are only read from disk as needed, seeking straight
+                to a given doc by its byte offset; otherwise, read all docs
+                into memory at once
+            cache_size (int, optional): if ``lazy`` is True, maximum number of
+                docs kept in memory at any one time
+
+        Returns:
+            :class:`TextCorpus <textacy.texts.TextCorpus>` or :class:`DiskTextCorpus <textacy.texts.DiskTextCorpus>`
+        """
+        if metadata_filename is None:
+            metadata_filename = filename + '.metadata.json'
+        if lazy is True:
+            return DiskTextCorpus(lang, filename, metadata_filename=metadata_filename,
+                                  cache_size=cache_size)
+        textcorpus = TextCorpus(lang)
+        spacy_docs = fileio.read_spacy_docs(textcorpus.spacy_vocab, filename)
+        metadata = fileio.read_json_lines(metadata_filename, mode='rt', encoding='utf-8')
+        for spacy_doc, md in zip(spacy_docs, metadata):
+            textcorpus.add_doc(TextDoc(spacy_doc, lang=lang,
+                                       spacy_pipeline=textcorpus.spacy_pipeline,
+                                       metadata=md))
+        return textcorpus
+
     def add_text(self, text, lang=None, metadata=None):
         """
         Create a :class:`TextDoc <textacy.texts.TextDoc>` from ``text`` and ``metadata``,
@@ -641,17 +1134,26 @@ class TextCorpus(object):
                       lang=lang, metadata=metadata)
         doc.corpus_index = self.n_docs
         doc.corpus = self
-        self.docs.append(doc)
+        self._docs.append(doc)
         self.n_docs += 1
-        self.n_sents += doc.n_sents
-        self.n_tokens += doc.n_tokens
+        if self._n_sents is not None:
+            self._n_sents += doc.n_sents
+        self._n_tokens += doc.n_tokens
+        if self._doc_freqs is not None:
+            self._add_term_stats(doc)
+        self._index_metadata(doc.corpus_index, doc.metadata)
+        if (self.memory_budget is not None and
+                self.n_docs % self._memory_budget_check_every == 0):
+            self.enforce_memory_budget()
 
     def add_doc(self, doc, print_warning=True):
         """
         Add an existing :class:`TextDoc <textacy.texts.TextDoc>` to the corpus as-is.
         NB: If ``textdoc`` is already added to this or another :class:`TextCorpus <textacy.texts.TextCorpus>`,
-        a warning message will be printed and the ``corpus_index`` attribute will be
-        overwritten, but you won't be prevented from adding the doc.
+        a warning message will be printed and a shallow copy of the doc -- sharing
+        its underlying ``spacy.Doc``, but with its own metadata and caches --
+        will be added instead. To make a sub-corpus
+        of another corpus' docs without any copying, use :meth:`TextCorpus.view() <textacy.texts.TextCorpus.view>`.
 
         Args:
             doc (:class:`TextDoc <textacy.texts.TextDoc>`)
@@ -663,21 +1165,53 @@ class TextCorpus(object):
             msg = 'TextDoc.lang {} != TextCorpus.lang {}'.format(doc.lang, self.lang)
             raise ValueError(msg)
         if hasattr(doc, 'corpus_index'):
-            doc = copy.deepcopy(doc)
+            doc = copy.copy(doc)
             if print_warning is True:
                 print('**WARNING: TextDoc already associated with a TextCorpus; adding anyway...')
         doc.corpus_index = self.n_docs
         doc.corpus = self
-        self.docs.append(doc)
+        self._docs.append(doc)
         self.n_docs += 1
-        self.n_sents += doc.n_sents
-        self.n_tokens += doc.n_tokens
+        if self._n_sents is not None:
+            self._n_sents += doc.n_sents
+        self._n_tokens += doc.n_tokens
+        if self._doc_freqs is not None:
+            self._add_term_stats(doc)
+        self._index_metadata(doc.corpus_index, doc.metadata)
+        if (self.memory_budget is not None and
+                self.n_docs % self._memory_budget_check_every == 0):
+            self.enforce_memory_budget()
+
+    @property
+    def docs(self):
+        """list(:class:`TextDoc <textacy.texts.TextDoc>`): all docs in the corpus, in order."""
+        return self._docs
+
+    @docs.setter
+    def docs(self, docs):
+        self._docs = docs
+
+    @property
+    def n_sents(self):
+        """
+        The number of sentences in the corpus; since this requires parsing any
+        lazily-processed docs, it's computed on first access, then kept up-to-date
+        as docs are added and removed.
+        """
+        if self._n_sents is None:
+            self._n_sents = sum(doc.n_sents for doc in self)
+        return self._n_sents
+
+    @property
+    def n_tokens(self):
+        """The number of tokens in the corpus."""
+        return self._n_tokens
 
     def get_doc(self, index):
         """
         Get a single doc by its position ``index`` in the corpus.
         """
-        return self.docs[index]
+        return self[index]
 
     def get_docs(self, match_condition, limit=None):
         """
@@ -713,41 +1247,1305 @@ class TextCorpus(object):
         ``corpus_index`` attribute on all docs that come after it in the corpus."""
         for doc in self[index + 1:]:
             doc.corpus_index -= 1
-        del self[index]
+        doc = self._docs.pop(index)
+        self.n_docs -= 1
+        self._n_removals += 1
+        if self._n_sents is not None:
+            self._n_sents -= doc.n_sents
+        self._n_tokens -= doc.n_tokens
+        if self._docs_term_counts is not None:
+            self._update_term_stats(*self._docs_term_counts.pop(index), sign=-1)
+        self._rebuild_metadata_indexes()
 
     def remove_docs(self, match_condition, limit=None):
         """
-        Remove all (or N = ``limit``) docs in corpus for which ``match_condition(doc) is True``.
-        Re-set all remaining docs' ``corpus_index`` attributes at the end.
+        Remove all (or N = ``limit``) docs in corpus for which ``match_condition(doc) is True``,
+        or that are specified by a mask or indexes. Docs are removed all at once,
+        in a single pass over the corpus that also re-sets all remaining docs'
+        ``corpus_index`` attributes and updates the corpus' statistics.
 
         Args:
-            match_condition (func): function that operates on a :class:`TextDoc <textacy.texts.TextDoc>`
-                and returns a boolean value; e.g. ``lambda x: len(x) > 100`` matches
-                all docs with more than 100 tokens
+            match_condition (func or array-like): function that operates on a
+                :class:`TextDoc <textacy.texts.TextDoc>` and returns a boolean value,
+                e.g. ``lambda x: len(x) > 100`` matches all docs with more than
+                100 tokens; or a boolean mask of length ``n_docs`` where True
+                values match docs; or a sequence of (int) indexes of matching docs
             limit (int, optional): if not None, maximum number of matched docs
                 to remove
+
+        Raises:
+            ValueError: if ``match_condition`` is a boolean mask whose length
+                doesn't equal the number of docs in corpus
+        """
+        remove_mask = self._get_match_mask(match_condition, limit=limit)
+        docs_term_counts = self._docs_term_counts
+        kept_docs = []
+        kept_docs_term_counts = [] if docs_term_counts is not None else None
+        for index, remove in enumerate(remove_mask.tolist()):
+            doc = self._docs[index]
+            if remove is True:
+                if self._n_sents is not None:
+                    self._n_sents -= doc.n_sents
+                self._n_tokens -= doc.n_tokens
+                if docs_term_counts is not None:
+                    self._update_term_stats(*docs_term_counts[index], sign=-1)
+            else:
+                doc.corpus_index = len(kept_docs)
+                kept_docs.append(doc)
+                if docs_term_counts is not None:
+                    kept_docs_term_counts.append(docs_term_counts[index])
+        self._docs = kept_docs
+        self.n_docs = len(kept_docs)
+        self._n_removals += 1
+        self._docs_term_counts = kept_docs_term_counts
+        self._rebuild_metadata_indexes()
+
+    def memory_usage(self):
+        """
+        Get the approximate memory used by the corpus, in bytes, broken down by
+        component. Sizes of spacy objects are estimated from their numbers of
+        tokens and lexemes, since their C-level data isn't visible from python.
+
+        Returns:
+            dict: mapping of component to its size in bytes, where components are:
+
+                * 'spacy_docs': docs' ``spacy.Doc`` s that are in memory, i.e.
+                  haven't been spilled to disk
+                * 'spacy_vocab': shared vocabulary and string store, which grow
+                  as new strings are seen; shared with the spacy pipeline
+                * 'doc_caches': docs' cached extraction results, term counts,
+                  and term indexes
+                * 'docs': :class:`TextDoc <textacy.texts.TextDoc>` objects
+                  and their metadata
+                * 'corpus_stats': corpus' doc and term frequency tables
+                  and metadata indexes
+                * 'doc_term_matrix': doc-term matrix and id-to-term mapping
+                  saved by :meth:`TextCorpus.as_doc_term_matrix() <textacy.texts.TextCorpus.as_doc_term_matrix>`
+                * 'total': sum of all the above
+        """
+        usage = {'spacy_docs': 0, 'doc_caches': 0, 'docs': 0}
+        for doc in self._iter_loaded_docs():
+            if doc.is_spilled is False:
+                usage['spacy_docs'] += _spacy_doc_nbytes(doc.spacy_doc)
+            usage['doc_caches'] += _sizeof(doc._cache) + _sizeof(doc._term_index)
+            usage['docs'] += sys.getsizeof(doc) + _sizeof(doc.metadata)
+
+        vocab = self.spacy_vocab
+        usage['spacy_vocab'] = (
+            len(vocab) * (_SPACY_LEXEME_NBYTES + 4 * getattr(vocab, 'vectors_length', 0)) +
+            sum(sys.getsizeof(string) for string in self.spacy_stringstore))
+
+        usage['corpus_stats'] = sum(
+            freqs.nbytes for freqs in (self._doc_freqs, self._term_freqs)
+            if freqs is not None)
+        if self._docs_term_counts is not None:
+            usage['corpus_stats'] += _sizeof(self._docs_term_counts)
+        usage['corpus_stats'] += sum(
+            _sizeof(index.__dict__) for index in self._metadata_indexes.values())
+
+        usage['doc_term_matrix'] = 0
+        doc_term_matrix = getattr(self, 'doc_term_matrix', None)
+        if doc_term_matrix is not None:
+            usage['doc_term_matrix'] = (
+                doc_term_matrix.data.nbytes + doc_term_matrix.indices.nbytes +
+                doc_term_matrix.indptr.nbytes + _sizeof(self.id_to_term))
+
+        usage['total'] = sum(usage.values())
+        return usage
+
+    def set_memory_budget(self, max_bytes, spill_filename=None, check_every=1000):
+        """
+        Keep the corpus' approximate memory usage, as given by :meth:`TextCorpus.memory_usage() <textacy.texts.TextCorpus.memory_usage>`,
+        within ``max_bytes``: every ``check_every`` docs added to the corpus,
+        :meth:`TextCorpus.enforce_memory_budget() <textacy.texts.TextCorpus.enforce_memory_budget>`
+        is called automatically.
+
+        Args:
+            max_bytes (int): memory budget in bytes; if None, the budget is removed
+            spill_filename (str, optional): /path/to/file on disk to which docs'
+                ``spacy.Doc`` s are spilled if evicting caches isn't enough; if
+                None, docs are never spilled to disk
+            check_every (int, optional): number of docs added between checks;
+                since each check is a pass over all docs in memory, don't make
+                this too small for large corpora
+        """
+        self.memory_budget = max_bytes
+        self._memory_budget_check_every = check_every
+        if spill_filename is None:
+            self._spill_store = None
+        elif self._spill_store is None or self._spill_store.filename != spill_filename:
+            self._spill_store = DocSpillStore(spill_filename)
+
+    def enforce_memory_budget(self):
+        """
+        If the corpus' approximate memory usage exceeds its memory budget, first
+        evict all per-doc caches and the saved doc-term matrix; then, if still
+        over budget, spill docs' ``spacy.Doc`` s to disk, oldest first, until
+        under budget. Spilled docs are transparently loaded back into memory
+        when next used.
+
+        .. seealso:: :meth:`TextCorpus.set_memory_budget() <textacy.texts.TextCorpus.set_memory_budget>`
+        """
+        if self.memory_budget is None:
+            return
+        if self.memory_usage()['total'] <= self.memory_budget:
+            return
+        for doc in self._iter_loaded_docs():
+            doc.clear_cache()
+        self.doc_term_matrix = None
+        self.id_to_term = None
+        excess_nbytes = self.memory_usage()['total'] - self.memory_budget
+        if excess_nbytes <= 0 or self._spill_store is None:
+            return
+        for doc in self._iter_loaded_docs():
+            if excess_nbytes <= 0:
+                break
+            if doc.is_spilled is False:
+                excess_nbytes -= _spacy_doc_nbytes(doc.spacy_doc)
+                doc.spill(self._spill_store)
+
+    def _iter_loaded_docs(self):
+        """Yield all docs in corpus that are loaded in memory."""
+        return iter(self._docs)
+
+    def view(self, match_condition=None, limit=None):
+        """
+        Get a lightweight sub-corpus of all (or N = ``limit``) docs in corpus
+        for which ``match_condition(doc) is True``, or that are specified by
+        a mask or indexes. The view references this corpus' docs by index,
+        so no docs are copied, and it keeps its own corpus statistics.
+
+        Args:
+            match_condition (func or array-like, optional): function that operates on a
+                :class:`TextDoc <textacy.texts.TextDoc>` and returns a boolean value;
+                or a boolean mask of length ``n_docs`` where True values match docs;
+                or a sequence of (int) indexes of matching docs; if None, all docs match
+            limit (int, optional): if not None, maximum number of matched docs
+                to include in the view
+
+        Returns:
+            :class:`TextCorpusView <textacy.texts.TextCorpusView>`
+
+        Raises:
+            ValueError: if ``match_condition`` is a boolean mask whose length
+                doesn't equal the number of docs in corpus
+        """
+        if match_condition is None:
+            indexes = np.arange(self.n_docs if limit is None else min(limit, self.n_docs))
+        elif callable(match_condition) or np.asarray(match_condition).dtype == bool:
+            indexes = np.flatnonzero(self._get_match_mask(match_condition, limit=limit))
+        else:
+            # keep indexes as given, in order and with duplicates
+            indexes = np.asarray(match_condition, dtype=np.int64)[:limit]
+        return TextCorpusView(self, indexes)
+
+    def _get_match_mask(self, match_condition, limit=None):
+        """
+        Get a boolean mask over docs in corpus matched by ``match_condition``,
+        as accepted by :meth:`TextCorpus.remove_docs() <textacy.texts.TextCorpus.remove_docs>`.
+        """
+        if callable(match_condition):
+            mask = np.zeros(self.n_docs, dtype=bool)
+            n_matched_docs = 0
+            for index, doc in enumerate(self):
+                if limit is not None and n_matched_docs >= limit:
+                    break
+                if match_condition(doc) is True:
+                    mask[index] = True
+                    n_matched_docs += 1
+            return mask
+        match_condition = np.asarray(match_condition)
+        if match_condition.dtype == bool:
+            if len(match_condition) != self.n_docs:
+                msg = 'mask length {} != number of docs {}'.format(
+                    len(match_condition), self.n_docs)
+                raise ValueError(msg)
+            mask = match_condition.copy()
+        else:
+            mask = np.zeros(self.n_docs, dtype=bool)
+            mask[match_condition.astype(np.intp)] = True
+        if limit is not None:
+            mask[np.flatnonzero(mask)[limit:]] = False
+        return mask
+
+    def add_metadata_index(self, field, kind='hash'):
+        """
+        Index all docs in corpus by the value of ``field`` in their metadata,
+        such that :meth:`TextCorpus.query() <textacy.texts.TextCorpus.query>`
+        can look up matching docs directly rather than checking every doc.
+        The index is kept up-to-date as docs are added to and removed from corpus.
+
+        Args:
+            field (str): metadata key whose values are to be indexed, e.g. 'speaker'
+            kind (str {'hash', 'sorted'}, optional): if 'hash', index supports
+                equality ('eq', 'in') lookups; if 'sorted', index also supports
+                range ('gt', 'gte', 'lt', 'lte') lookups, but values must be
+                mutually comparable (e.g. dates as ISO-formatted strings)
+
+        Raises:
+            ValueError: if ``kind`` not in {'hash', 'sorted'}
+
+        Note:
+            Docs without ``field`` in their metadata, or whose value for it is None
+            or unhashable, are not indexed and thus never match a query on ``field``.
+        """
+        if kind == 'hash':
+            self._metadata_indexes[field] = _HashIndex()
+        elif kind == 'sorted':
+            self._metadata_indexes[field] = _SortedIndex()
+        else:
+            msg = 'kind "{}" not valid; must be in {}'.format(kind, {'hash', 'sorted'})
+            raise ValueError(msg)
+        self._rebuild_metadata_indexes()
+
+    def query(self, limit=None, **conditions):
+        """
+        Get all (or N = ``limit``) docs in corpus whose metadata match all
+        ``conditions``, in order of appearance in corpus. Conditions on fields
+        indexed via :meth:`TextCorpus.add_metadata_index() <textacy.texts.TextCorpus.add_metadata_index>`
+        are resolved through their indexes; any others are checked doc by doc,
+        and only on docs matching the indexed conditions.
+
+        Args:
+            limit (int, optional): if not None, maximum number of matched docs
+                to return
+            **conditions: metadata field names, optionally suffixed by one of
+                '__eq' (default), '__in', '__gt', '__gte', '__lt', or '__lte',
+                mapped to the value(s) to compare against; for example::
+
+                    >>> corpus.query(speaker='Bernie Sanders', date__gte='2010-01-01')
+
+        Yields:
+            :class:`TextDoc <textacy.texts.TextDoc>`: one per doc matching all
+                ``conditions`` up to ``limit`` docs
+        """
+        indexes = None
+        unindexed_conditions = []
+        for key, value in conditions.items():
+            field, op = _parse_query_key(key)
+            index = self._metadata_indexes.get(field)
+            if index is None or op not in index.ops:
+                unindexed_conditions.append((field, op, value))
+                continue
+            matches = index.lookup(op, value)
+            indexes = matches if indexes is None else indexes & matches
+        if indexes is None:
+            indexes = range(self.n_docs)
+        else:
+            indexes = sorted(indexes)
+
+        n_matched_docs = 0
+        for index in indexes:
+            if limit is not None and n_matched_docs >= limit:
+                break
+            metadata = self._get_doc_metadata(index)
+            if all(_match_query_condition(metadata, field, op, value)
+                   for field, op, value in unindexed_conditions):
+                n_matched_docs += 1
+                yield self[index]
+
+    def _get_doc_metadata(self, index):
+        """Get the metadata of the doc at position ``index`` in corpus."""
+        return self._docs[index].metadata
+
+    def _iter_metadata(self):
+        """Yield the metadata of each doc in corpus, in order."""
+        for doc in self._docs:
+            yield doc.metadata
+
+    def _index_metadata(self, index, metadata):
+        """Add the doc at position ``index`` to all metadata indexes."""
+        for field, field_index in self._metadata_indexes.items():
+            field_index.add(metadata.get(field), index)
+
+    def _rebuild_metadata_indexes(self):
+        """Rebuild all metadata indexes from scratch, e.g. after removing docs."""
+        for field, field_index in self._metadata_indexes.items():
+            field_index.clear()
+        if self._metadata_indexes:
+            for index, metadata in enumerate(self._iter_metadata()):
+                self._index_metadata(index, metadata)
+
+    def _compute_term_stats(self):
+        """
+        Compute the corpus' document- and term-frequency tables with a single
+        pass over its docs, recording each doc's term counts along the way
+        so that exactly the same counts are subtracted if it's later removed.
+        """
+        self._doc_freqs = np.zeros(0, dtype=np.int64)
+        self._term_freqs = np.zeros(0, dtype=np.int64)
+        self._docs_term_counts = []
+        for doc in self:
+            self._add_term_stats(doc)
+
+    def _add_term_stats(self, doc):
+        """
+        Count the terms in ``doc``, record them, and add them to the corpus'
+        document- and term-frequency tables.
+        """
+        term_ids, counts = _get_term_ids_counts(doc)
+        if self._docs_term_counts is not None:
+            self._docs_term_counts.append((term_ids, counts))
+        self._update_term_stats(term_ids, counts, sign=1)
+
+    def _update_term_stats(self, term_ids, counts, sign=1):
+        """
+        Add (``sign`` = 1) or subtract (``sign`` = -1) the ``counts`` of ``term_ids``
+        to/from the corpus' document- and term-frequency tables, growing
+        the arrays as needed to fit new term ids.
+        """
+        if len(term_ids) == 0:
+            return
+        max_term_id = term_ids.max()
+        if max_term_id >= len(self._doc_freqs):
+            size = max(2 * len(self._doc_freqs), max_term_id + 1)
+            self._doc_freqs = np.concatenate(
+                (self._doc_freqs, np.zeros(size - len(self._doc_freqs), dtype=np.int64)))
+            self._term_freqs = np.concatenate(
+                (self._term_freqs, np.zeros(size - len(self._term_freqs), dtype=np.int64)))
+        self._doc_freqs[term_ids] += sign
+        self._term_freqs[term_ids] += sign * counts
+
+    @property
+    def doc_freqs(self):
+        """
+        :class:`numpy.ndarray`: number of docs in corpus in which each term appears,
+        indexed by term id (as assigned by ``spacy_stringstore``); terms are
+        words, as counted by :meth:`TextDoc.term_counts() <textacy.texts.TextDoc.term_counts>`,
+        and ids beyond the end of the array have doc freq = 0; computed with
+        a single pass over all docs on first access, then kept up-to-date
+        as docs are added and removed
+        """
+        if self._doc_freqs is None:
+            self._compute_term_stats()
+        return self._doc_freqs
+
+    @property
+    def term_freqs(self):
         """
-        remove_indexes = [doc.corpus_index
-                          for doc in self.get_docs(match_condition, limit=limit)]
-        for index in remove_indexes:
-            del self[index]
-        # now let's re-set the `corpus_index` attribute for all docs at once
-        for i, doc in enumerate(self):
-            doc.corpus_index = i
+        :class:`numpy.ndarray`: total number of occurrences of each term in corpus,
+        indexed by term id (as assigned by ``spacy_stringstore``); ids beyond
+        the end of the array have term freq = 0; computed on first access,
+        as for :attr:`TextCorpus.doc_freqs`
+        """
+        if self._term_freqs is None:
+            self._compute_term_stats()
+        return self._term_freqs
+
+    @property
+    def idf(self):
+        """
+        Smoothed inverse document frequencies of terms in corpus, kept up-to-date
+        as docs are added and removed, so that e.g. ``TextDoc.as_bag_of_terms(weighting='tfidf', idf=corpus.idf)``
+        or ``keyterms.sgrank(doc, idf=corpus.idf)`` needn't rebuild a doc-term matrix.
+        Look up a term's idf by its (int) id or its (str) text.
+
+        Returns:
+            :class:`CorpusIdf <textacy.texts.CorpusIdf>`
+        """
+        return CorpusIdf(self)
 
-    def as_doc_term_matrix(self, terms_lists, weighting='tf',
+    def as_doc_term_matrix(self, terms_lists=None, weighting='tf',
                            normalize=True, smooth_idf=True, sublinear_tf=False,
-                           min_df=1, max_df=1.0, min_ic=0.0, max_n_terms=None):
+                           min_df=1, max_df=1.0, min_ic=0.0, max_n_terms=None,
+                           lemmatize='auto', filter_stops=True, filter_punct=True,
+                           filter_nums=False, good_pos_tags=None, bad_pos_tags=None):
         """
         Transform corpus into a sparse CSR matrix, where each row i corresponds
         to a doc, each column j corresponds to a unique term, and matrix values
         (i, j) correspond to the tf or tf-idf weighting of term j in doc i.
 
+        If ``terms_lists`` is None, terms are the words in each doc, counted
+        directly from its spacy doc's attribute arrays and filtered as in
+        :func:`extract.words() <textacy.extract.words>`, without ever making
+        strings of terms other than for the final ``id_to_term`` mapping;
+        this is much faster than passing in the equivalent ``terms_lists``.
+
+        Args:
+            terms_lists (iterable(iterable(str)), optional): one sequence of
+                (str) terms per doc in corpus, as in :func:`build_doc_term_matrix() <textacy.representations.vsm.build_doc_term_matrix>`
+            lemmatize (bool or 'auto', optional): if True, words are lemmatized;
+                if 'auto', all words but proper nouns and acronyms are lemmatized;
+                only used if ``terms_lists`` is None
+            filter_stops (bool, optional): only used if ``terms_lists`` is None
+            filter_punct (bool, optional): only used if ``terms_lists`` is None
+            filter_nums (bool, optional): only used if ``terms_lists`` is None
+            good_pos_tags (set(str), optional): only used if ``terms_lists`` is None
+            bad_pos_tags (set(str), optional): only used if ``terms_lists`` is None
+
+        Returns:
+            :class:`scipy.sparse.csr_matrix <scipy.sparse.csr_matrix>`: sparse matrix
+                of shape (# docs, # unique terms), where value (i, j) is the weight
+                of term j in doc i
+            dict: id to term mapping, where keys are unique integers as term ids and
+                values are corresponding strings
+
         .. seealso:: :func:`build_doc_term_matrix <textacy.representations.vsm.build_doc_term_matrix>`
         """
-        self.doc_term_matrix, self.id_to_term = vsm.build_doc_term_matrix(
-            terms_lists, weighting=weighting,
+        if terms_lists is not None:
+            self.doc_term_matrix, self.id_to_term = vsm.build_doc_term_matrix(
+                terms_lists, weighting=weighting,
+                normalize=normalize, smooth_idf=smooth_idf, sublinear_tf=sublinear_tf,
+                min_df=min_df, max_df=max_df, min_ic=min_ic,
+                max_n_terms=max_n_terms)
+            return (self.doc_term_matrix, self.id_to_term)
+
+        # get all docs' filtered word ids at once, then remap spacy's term ids
+        # onto a compact range of column indexes
+        docs_word_ids = []
+        for doc in self:
+            if lemmatize is not False or good_pos_tags or bad_pos_tags:
+                doc.process('tag')
+            docs_word_ids.append(_get_word_ids(
+                doc.spacy_doc, lemmatize, filter_stops, filter_punct, filter_nums,
+                good_pos_tags, bad_pos_tags))
+        n_docs = len(docs_word_ids)
+        rows = np.repeat(np.arange(n_docs), [len(ids) for ids in docs_word_ids])
+        docs_word_ids = [ids for ids in docs_word_ids if len(ids)]
+        if docs_word_ids:
+            word_ids = np.concatenate(docs_word_ids)
+        else:
+            word_ids = np.zeros(0, dtype=np.int64)
+        uniq_word_ids, cols = np.unique(word_ids, return_inverse=True)
+        doc_term_matrix = sp.coo_matrix(
+            (np.ones(len(word_ids), dtype=int), (rows, cols.ravel())),
+            shape=(n_docs, len(uniq_word_ids))).tocsr()
+        id_to_term = {col: self.spacy_stringstore[word_id]
+                      for col, word_id in enumerate(uniq_word_ids.tolist())}
+
+        self.doc_term_matrix, self.id_to_term = vsm.filter_and_weight_doc_term_matrix(
+            doc_term_matrix, id_to_term, weighting=weighting,
             normalize=normalize, smooth_idf=smooth_idf, sublinear_tf=sublinear_tf,
             min_df=min_df, max_df=max_df, min_ic=min_ic,
             max_n_terms=max_n_terms)
         return (self.doc_term_matrix, self.id_to_term)
+
+
+class CorpusIdf(object):
+    """
+    Read-only, dict-like view of the smoothed inverse document frequencies of
+    terms in a :class:`TextCorpus <textacy.texts.TextCorpus>`, computed in O(1)
+    per term from the corpus' doc freqs table as ``log((n_docs + 1) / (df + 1)) + 1``,
+    i.e. as in :func:`vsm.apply_idf_weighting() <textacy.representations.vsm.apply_idf_weighting>`.
+
+    Terms may be given either as ids or as strings; terms that don't appear in
+    the corpus get the maximum idf value rather than raising a ``KeyError``.
+    Iteration, length, and membership only consider terms that appear in the corpus.
+
+    Args:
+        textcorpus (:class:`TextCorpus <textacy.texts.TextCorpus>`)
+    """
+    def __init__(self, textcorpus):
+        self.textcorpus = textcorpus
+
+    def __repr__(self):
+        return 'CorpusIdf({} terms)'.format(len(self))
+
+    def _doc_freq(self, term):
+        if isinstance(term, str):
+            # don't add unseen strings to the string store just to look them up
+            if term not in self.textcorpus.spacy_stringstore:
+                return 0
+            term = self.textcorpus.spacy_stringstore[term]
+        doc_freqs = self.textcorpus.doc_freqs
+        return doc_freqs[term] if term < len(doc_freqs) else 0
+
+    def __getitem__(self, term):
+        return log((self.textcorpus.n_docs + 1) / (self._doc_freq(term) + 1)) + 1.0
+
+    def get(self, term, default=None):
+        return self[term] if term in self else default
+
+    def __contains__(self, term):
+        return self._doc_freq(term) > 0
+
+    def __bool__(self):
+        return self.textcorpus.n_docs > 0
+    __nonzero__ = __bool__
+
+    def __len__(self):
+        return int(np.count_nonzero(self.textcorpus.doc_freqs))
+
+    def __iter__(self):
+        for term_id in np.flatnonzero(self.textcorpus.doc_freqs):
+            yield int(term_id)
+
+    def items(self):
+        for term_id in self:
+            yield (term_id, self[term_id])
+
+
+QUERY_OPS = {'eq', 'in', 'gt', 'gte', 'lt', 'lte'}
+
+
+def _parse_query_key(key):
+    """Split a :meth:`TextCorpus.query()` keyword into its (field, op)."""
+    field, _, op = key.rpartition('__')
+    if field and op in QUERY_OPS:
+        return (field, op)
+    return (key, 'eq')
+
+
+def _match_query_condition(metadata, field, op, value):
+    """Check if a doc's ``metadata`` match a single query condition."""
+    try:
+        field_value = metadata[field]
+    except KeyError:
+        return False
+    if field_value is None:
+        return False
+    try:
+        if op == 'eq':
+            return field_value == value
+        elif op == 'in':
+            return field_value in value
+        elif op == 'gt':
+            return field_value > value
+        elif op == 'gte':
+            return field_value >= value
+        elif op == 'lt':
+            return field_value < value
+        else:
+            return field_value <= value
+    except TypeError:
+        return False
+
+
+class _HashIndex(object):
+    """
+    Metadata index mapping each unique value to the (sorted) positions of docs
+    with that value, for equality lookups.
+    """
+    ops = {'eq', 'in'}
+
+    def __init__(self):
+        self._indexes = {}
+
+    def clear(self):
+        self._indexes = {}
+
+    def add(self, value, index):
+        if value is None:
+            return
+        try:
+            self._indexes.setdefault(value, []).append(index)
+        except TypeError:  # unhashable value
+            pass
+
+    def lookup(self, op, value):
+        if op == 'eq':
+            values = [value]
+        else:
+            values = value
+        matches = set()
+        for value in values:
+            try:
+                matches.update(self._indexes.get(value, ()))
+            except TypeError:
+                continue
+        return matches
+
+
+class _SortedIndex(object):
+    """
+    Metadata index keeping doc positions sorted by value, for equality and
+    range lookups via binary search.
+    """
+    ops = QUERY_OPS
+
+    def __init__(self):
+        self._values = []
+        self._indexes = []
+
+    def clear(self):
+        self._values = []
+        self._indexes = []
+
+    def add(self, value, index):
+        if value is None:
+            return
+        try:
+            i = bisect_right(self._values, value)
+        except TypeError:  # value not comparable with those already indexed
+            return
+        self._values.insert(i, value)
+        self._indexes.insert(i, index)
+
+    def lookup(self, op, value):
+        if op == 'in':
+            return set(itertoolz.concat(self.lookup('eq', val) for val in value))
+        try:
+            if op == 'eq':
+                lo = bisect_left(self._values, value)
+                hi = bisect_right(self._values, value)
+            elif op == 'gt':
+                lo, hi = bisect_right(self._values, value), len(self._values)
+            elif op == 'gte':
+                lo, hi = bisect_left(self._values, value), len(self._values)
+            elif op == 'lt':
+                lo, hi = 0, bisect_left(self._values, value)
+            else:
+                lo, hi = 0, bisect_right(self._values, value)
+        except TypeError:  # value not comparable with those indexed, so matches none
+            return set()
+        return set(self._indexes[lo: hi])
+
+
+class DiskTextCorpus(TextCorpus):
+    """
+    A :class:`TextCorpus <textacy.texts.TextCorpus>` whose docs live on disk rather
+    than in memory: parsed spacy docs are stored in ``filename``, as written by
+    :func:`fileio.write_spacy_docs() <textacy.fileio.write.write_spacy_docs>`,
+    and their metadata in a JSON-lines sidecar file. Docs are deserialized on
+    demand, with the most recently used ones kept in an LRU cache.
+
+    Individual docs are read by seeking straight to their byte offsets in the
+    memory-mapped ``filename``; the offsets are stored in an index file at
+    ``filename + '.idx'``, which is (re-)built on first use if it doesn't exist
+    or is out-of-date, i.e. if ``filename`` has since been rewritten.
+
+    Args:
+        lang (str): 2-letter code of corpus' language, used to initialize spaCy
+        filename (str): /path/to/file on disk where spacy docs are stored; if it
+            doesn't exist yet, an empty corpus is created and docs added to the
+            corpus are appended to it
+        metadata_filename (str, optional): /path/to/file on disk where doc metadata
+            are stored, one JSON object per line in the same order as the docs;
+            if None, ``filename`` + '.metadata.json' is used
+        cache_size (int, optional): maximum number of deserialized docs kept
+            in memory at any one time
+
+    Iterate over, index into, and add docs to the corpus just as for
+    :class:`TextCorpus <textacy.texts.TextCorpus>`. Removing docs is not supported.
+    """
+    def __init__(self, lang, filename, metadata_filename=None, cache_size=1000):
+        super(DiskTextCorpus, self).__init__(lang)
+        self.filename = filename
+        self.metadata_filename = metadata_filename or filename + '.metadata.json'
+        self._cache = LRUCache(maxsize=cache_size)
+        self._mmap = None
+        self._offsets = self._read_offsets()
+        self._metadata = []
+        if os.path.exists(self.metadata_filename):
+            self._metadata = list(fileio.read_json_lines(self.metadata_filename))
+        if len(self._metadata) != len(self._offsets) - 1:
+            msg = '{} docs in {} but {} metadata in {}'.format(
+                len(self._offsets) - 1, self.filename,
+                len(self._metadata), self.metadata_filename)
+            raise ValueError(msg)
+        self.n_docs = len(self._offsets) - 1
+        # docs aren't held in memory, so stats require a full pass over them;
+        # but tokens are cheap to count as docs are added to an empty corpus
+        self._docs = None
+        self._n_tokens = 0 if self.n_docs == 0 else None
+
+    def _read_offsets(self):
+        """
+        Read the byte offsets of docs in ``filename`` from its index file; if
+        there's no index, or it's out-of-date with respect to ``filename``,
+        (re-)build it with one pass over the docs' length headers, then save it
+        to disk so this needn't be done again.
+        """
+        if not os.path.exists(self.filename):
+            return [0]
+        try:
+            return fileio.read_spacy_docs_offsets(self.filename).tolist()
+        except (IOError, ValueError):
+            pass
+        offsets = [0]
+        with io.open(self.filename, mode='rb') as f:
+            for _ in sdoc.read_bytes(f):
+                offsets.append(f.tell())
+        with io.open(self.filename + '.idx', mode='wb') as f:
+            f.write(np.asarray(offsets, dtype='<u8').tobytes())
+        return offsets
+
+    def __repr__(self):
+        return 'DiskTextCorpus({} docs; "{}")'.format(self.n_docs, self.filename)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._load_doc(i) for i in range(*index.indices(self.n_docs))]
+        if index < 0:
+            index += self.n_docs
+        if not 0 <= index < self.n_docs:
+            raise IndexError('corpus index out of range')
+        return self._load_doc(index)
+
+    def __iter__(self):
+        for index in range(self.n_docs):
+            yield self._load_doc(index)
+
+    @property
+    def docs(self):
+        """Yield all docs in the corpus, loading them from disk as needed."""
+        return iter(self)
+
+    @property
+    def n_sents(self):
+        """The number of sentences in the corpus; requires a full pass on first access."""
+        if self._n_sents is None:
+            self._compute_stats()
+        return self._n_sents
+
+    @property
+    def n_tokens(self):
+        """The number of tokens in the corpus; requires a full pass on first access."""
+        if self._n_tokens is None:
+            # only docs' lengths are needed, not any of their terms
+            self._n_tokens = sum(
+                len(spacy_doc)
+                for spacy_doc in fileio.read_spacy_docs(self.spacy_vocab, self.filename))
+        return self._n_tokens
+
+    @property
+    def doc_freqs(self):
+        """Same as :attr:`TextCorpus.doc_freqs`, but requires a full pass on first access."""
+        if self._doc_freqs is None:
+            self._compute_stats()
+        return self._doc_freqs
+
+    @property
+    def term_freqs(self):
+        """Same as :attr:`TextCorpus.term_freqs`, but requires a full pass on first access."""
+        if self._term_freqs is None:
+            self._compute_stats()
+        return self._term_freqs
+
+    def _compute_stats(self):
+        """Compute corpus-wide statistics with a single streaming pass over its docs."""
+        self._n_sents = 0
+        self._n_tokens = 0
+        self._doc_freqs = np.zeros(0, dtype=np.int64)
+        self._term_freqs = np.zeros(0, dtype=np.int64)
+        if self.n_docs == 0:
+            return
+        for spacy_doc in fileio.read_spacy_docs(self.spacy_vocab, self.filename):
+            doc = TextDoc(spacy_doc, spacy_pipeline=self.spacy_pipeline, lang=self.lang)
+            self._n_sents += doc.n_sents
+            self._n_tokens += doc.n_tokens
+            self._add_term_stats(doc)
+
+    def _get_doc_metadata(self, index):
+        return self._metadata[index]
+
+    def _iter_loaded_docs(self):
+        return iter(list(self._cache.values()))
+
+    def _iter_metadata(self):
+        return iter(self._metadata)
+
+    def _load_doc(self, index):
+        try:
+            return self._cache[index]
+        except KeyError:
+            pass
+        if self._mmap is None:
+            with io.open(self.filename, mode='rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        spacy_doc = sdoc(self.spacy_vocab).from_bytes(
+            self._mmap[self._offsets[index]: self._offsets[index + 1]])
+        doc = TextDoc(spacy_doc, spacy_pipeline=self.spacy_pipeline,
+                      lang=self.lang, metadata=self._metadata[index])
+        doc.corpus_index = index
+        doc.corpus = self
+        self._cache[index] = doc
+        return doc
+
+    @classmethod
+    def from_texts(cls, lang, texts, filename, metadata=None, metadata_filename=None,
+                   cache_size=1000, n_threads=2, batch_size=1000, n_processes=1):
+        """
+        Convenience function for creating a :class:`DiskTextCorpus <textacy.texts.DiskTextCorpus>`
+        from an iterable of text strings, streaming parsed docs to disk at
+        ``filename`` rather than holding them all in memory.
+
+        Args:
+            lang (str)
+            texts (iterable(str))
+            filename (str)
+            metadata (iterable(dict), optional)
+            metadata_filename (str, optional)
+            cache_size (int, optional)
+            n_threads (int, optional)
+            batch_size (int, optional)
+            n_processes (int, optional)
+
+        Returns:
+            :class:`DiskTextCorpus <textacy.texts.DiskTextCorpus>`
+        """
+        textcorpus = cls(lang, filename, metadata_filename=metadata_filename,
+                         cache_size=cache_size)
+        if n_processes > 1:
+            spacy_docs = _pipe_multiprocess(
+                lang, texts, textcorpus.spacy_pipeline, n_threads=n_threads,
+                n_processes=n_processes, batch_size=batch_size)
+        else:
+            spacy_docs = textcorpus.spacy_pipeline.pipe(
+                texts, n_threads=n_threads, batch_size=batch_size)
+        if metadata is None:
+            metadata = itertools.repeat(None)
+        for spacy_doc, md in zip(spacy_docs, metadata):
+            textcorpus.add_doc(TextDoc(spacy_doc, lang=lang,
+                                       spacy_pipeline=textcorpus.spacy_pipeline,
+                                       metadata=md))
+        return textcorpus
+
+    def add_text(self, text, lang=None, metadata=None):
+        """
+        Create a :class:`TextDoc <textacy.texts.TextDoc>` from ``text`` and ``metadata``,
+        then append it to the corpus' files on disk.
+        """
+        self.add_doc(TextDoc(text, spacy_pipeline=self.spacy_pipeline,
+                             lang=lang, metadata=metadata))
+
+    def add_doc(self, doc, print_warning=True):
+        """
+        Append an existing :class:`TextDoc <textacy.texts.TextDoc>` to the corpus'
+        files on disk. Since the doc is serialized, it is never shared with
+        another corpus, and ``print_warning`` is ignored.
+        """
+        if doc.lang != self.lang:
+            msg = 'TextDoc.lang {} != TextCorpus.lang {}'.format(doc.lang, self.lang)
+            raise ValueError(msg)
+        # serialize everything up front, so a doc that can't be serialized
+        # (e.g. with non-JSON metadata) isn't partially written to disk
+        metadata_line = json.dumps(doc.metadata, ensure_ascii=False) + '\n'
+        doc_bytes = doc.spacy_doc.to_bytes()
+        with io.open(self.filename, mode='ab') as f:
+            f.write(doc_bytes)
+        self._offsets.append(self._offsets[-1] + len(doc_bytes))
+        if len(self._offsets) == 2:
+            # first doc, so the index doesn't exist yet
+            with io.open(self.filename + '.idx', mode='wb') as f:
+                f.write(np.asarray(self._offsets, dtype='<u8').tobytes())
+        else:
+            with io.open(self.filename + '.idx', mode='ab') as f:
+                f.write(np.asarray(self._offsets[-1:], dtype='<u8').tobytes())
+        with io.open(self.metadata_filename, mode='at', encoding='utf-8') as f:
+            f.write(metadata_line)
+        # the memory-mapped file no longer covers all docs; re-map on next load
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._metadata.append(doc.metadata)
+        self.n_docs += 1
+        if self._n_tokens is not None:
+            self._n_tokens += doc.n_tokens
+        if self._n_sents is not None:
+            self._n_sents += doc.n_sents
+        if self._doc_freqs is not None:
+            self._add_term_stats(doc)
+        self._index_metadata(self.n_docs - 1, doc.metadata)
+
+    def remove_doc(self, index):
+        raise NotImplementedError('docs can not be removed from a DiskTextCorpus')
+
+    def remove_docs(self, match_condition, limit=None):
+        raise NotImplementedError('docs can not be removed from a DiskTextCorpus')
+
+
+class TextCorpusView(TextCorpus):
+    """
+    Lightweight sub-corpus of a :class:`TextCorpus <textacy.texts.TextCorpus>`
+    that references the parent corpus' docs by their positions in it rather
+    than copying them, so that making many (overlapping) views costs only
+    an array of indexes apiece. Views of views reference the original corpus.
+
+    A view keeps its own statistics -- ``n_sents``, ``n_tokens``, ``doc_freqs``,
+    ``term_freqs``, and thus ``idf`` -- which are computed over its docs on
+    first access. Docs may be removed from a view without affecting the parent
+    corpus, but docs can't be added; add them to the parent corpus instead.
+
+    Args:
+        textcorpus (:class:`TextCorpus <textacy.texts.TextCorpus>`): parent corpus
+        indexes (array-like): (int) positions of this view's docs in ``textcorpus``
+
+    Note:
+        Views are *not* updated when docs are removed from the parent corpus,
+        since its docs' positions shift; accessing a view's docs after that
+        raises a ``ValueError``. Make a new view instead.
+
+    Usually made via :meth:`TextCorpus.view() <textacy.texts.TextCorpus.view>`, e.g.
+    ``corpus.view(lambda doc: doc.metadata['speaker'] == 'Bernie Sanders')``.
+    """
+    def __init__(self, textcorpus, indexes):
+        indexes = np.asarray(indexes, dtype=np.int64)
+        if isinstance(textcorpus, TextCorpusView):
+            textcorpus._check_parent()
+            indexes = textcorpus._indexes[indexes]
+            textcorpus = textcorpus.textcorpus
+        self.textcorpus = textcorpus
+        self._parent_n_removals = textcorpus._n_removals
+        self.lang = textcorpus.lang
+        self.spacy_pipeline = textcorpus.spacy_pipeline
+        self.spacy_vocab = textcorpus.spacy_vocab
+        self.spacy_stringstore = textcorpus.spacy_stringstore
+        self._indexes = indexes
+        self.n_docs = len(indexes)
+        self._n_sents = None
+        self._n_tokens = None
+        self._doc_freqs = None
+        self._term_freqs = None
+        self._docs_term_counts = None
+        self._metadata_indexes = {}
+        self.memory_budget = None
+        self._memory_budget_check_every = 1000
+        self._spill_store = None
+
+    def __repr__(self):
+        return 'TextCorpusView({} docs of {})'.format(self.n_docs, self.textcorpus)
+
+    def __getitem__(self, index):
+        self._check_parent()
+        if isinstance(index, slice):
+            return [self.textcorpus[i] for i in self._indexes[index].tolist()]
+        return self.textcorpus[int(self._indexes[index])]
+
+    def __iter__(self):
+        self._check_parent()
+        for index in self._indexes.tolist():
+            yield self.textcorpus[index]
+
+    def _check_parent(self):
+        """
+        Make sure no docs have been removed from the parent corpus since this
+        view was made, in which case its indexes no longer point to its docs.
+        """
+        if self.textcorpus._n_removals != self._parent_n_removals:
+            msg = ('docs have been removed from {} since this view was made, '
+                   'so its indexes are out-of-date; make a new view').format(self.textcorpus)
+            raise ValueError(msg)
+
+    @property
+    def docs(self):
+        """Yield all docs in the view, in order, from its parent corpus."""
+        return iter(self)
+
+    @property
+    def indexes(self):
+        """:class:`numpy.ndarray`: positions of this view's docs in its parent corpus."""
+        return self._indexes
+
+    @property
+    def n_sents(self):
+        """The number of sentences in the view; requires a full pass on first access."""
+        if self._n_sents is None:
+            self._compute_stats()
+        return self._n_sents
+
+    @property
+    def n_tokens(self):
+        """The number of tokens in the view; requires a full pass on first access."""
+        if self._n_tokens is None:
+            self._compute_stats()
+        return self._n_tokens
+
+    @property
+    def doc_freqs(self):
+        """Same as :attr:`TextCorpus.doc_freqs`, but requires a full pass on first access."""
+        if self._doc_freqs is None:
+            self._compute_stats()
+        return self._doc_freqs
+
+    @property
+    def term_freqs(self):
+        """Same as :attr:`TextCorpus.term_freqs`, but requires a full pass on first access."""
+        if self._term_freqs is None:
+            self._compute_stats()
+        return self._term_freqs
+
+    def _compute_stats(self):
+        """Compute the view's statistics with a single pass over its docs."""
+        self._n_sents = 0
+        self._n_tokens = 0
+        self._doc_freqs = np.zeros(0, dtype=np.int64)
+        self._term_freqs = np.zeros(0, dtype=np.int64)
+        self._docs_term_counts = []
+        for doc in self:
+            self._n_sents += doc.n_sents
+            self._n_tokens += doc.n_tokens
+            self._add_term_stats(doc)
+
+    def _get_doc_metadata(self, index):
+        self._check_parent()
+        return self.textcorpus._get_doc_metadata(int(self._indexes[index]))
+
+    def _iter_metadata(self):
+        self._check_parent()
+        for index in self._indexes.tolist():
+            yield self.textcorpus._get_doc_metadata(index)
+
+    def _iter_loaded_docs(self):
+        """Yield the view's docs that are loaded in memory in its parent corpus."""
+        self._check_parent()
+        indexes = set(self._indexes.tolist())
+        for doc in self.textcorpus._iter_loaded_docs():
+            if doc.corpus_index in indexes:
+                yield doc
+
+    def add_text(self, text, lang=None, metadata=None):
+        raise NotImplementedError(
+            'docs can not be added to a TextCorpusView; add them to its parent corpus')
+
+    def add_doc(self, doc, print_warning=True):
+        raise NotImplementedError(
+            'docs can not be added to a TextCorpusView; add them to its parent corpus')
+
+    def remove_doc(self, index):
+        """Remove the document at ``index`` from the view, but not from its parent corpus."""
+        self.remove_docs([index])
+
+    def remove_docs(self, match_condition, limit=None):
+        """
+        Remove all (or N = ``limit``) matching docs from the view, but not from
+        its parent corpus.
+
+        .. seealso:: :meth:`TextCorpus.remove_docs() <textacy.texts.TextCorpus.remove_docs>`
+        """
+        remove_mask = self._get_match_mask(match_condition, limit=limit)
+        if self._n_sents is not None:
+            for index in np.flatnonzero(remove_mask).tolist():
+                doc = self[index]
+                self._n_sents -= doc.n_sents
+                self._n_tokens -= doc.n_tokens
+                self._update_term_stats(*self._docs_term_counts[index], sign=-1)
+            self._docs_term_counts = [
+                term_counts for term_counts, remove
+                in zip(self._docs_term_counts, remove_mask.tolist()) if remove is False]
+        self._indexes = self._indexes[~remove_mask]
+        self.n_docs = len(self._indexes)
+        self._rebuild_metadata_indexes()
+
+
+class DocSpillStore(object):
+    """
+    Append-only file on disk to which :class:`TextDoc <textacy.texts.TextDoc>` s
+    spill their ``spacy.Doc`` s to free up memory, and from which they're loaded
+    back on demand. The file is truncated when the store is created.
+
+    Args:
+        filename (str): /path/to/file on disk
+    """
+    def __init__(self, filename):
+        self.filename = filename
+        self._offsets = [0]
+        with io.open(self.filename, mode='wb'):
+            pass
+
+    def __repr__(self):
+        return 'DocSpillStore({} docs; "{}")'.format(len(self._offsets) - 1, self.filename)
+
+    def append(self, spacy_doc):
+        """
+        Serialize ``spacy_doc`` to the end of the store's file, and return its
+        index in the store.
+        """
+        doc_bytes = spacy_doc.to_bytes()
+        with io.open(self.filename, mode='ab') as f:
+            f.write(doc_bytes)
+        self._offsets.append(self._offsets[-1] + len(doc_bytes))
+        return len(self._offsets) - 2
+
+    def load(self, index, spacy_vocab):
+        """Deserialize the ``spacy.Doc`` at ``index`` in the store."""
+        with io.open(self.filename, mode='rb') as f:
+            f.seek(self._offsets[index])
+            doc_bytes = f.read(self._offsets[index + 1] - self._offsets[index])
+        return sdoc(spacy_vocab).from_bytes(doc_bytes)
+
+
+def _spacy_doc_nbytes(spacy_doc):
+    """Estimate the memory used by ``spacy_doc``, in bytes."""
+    return sys.getsizeof(spacy_doc) + len(spacy_doc) * _SPACY_TOKEN_NBYTES
+
+
+def _sizeof(obj):
+    """
+    Estimate the memory used by ``obj`` and, for containers, their contents,
+    in bytes; objects referenced multiple times are counted multiple times.
+    """
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is not None else 0)
+    nbytes = sys.getsizeof(obj)
+    if isinstance(obj, (dict, Cache)):
+        nbytes += sum(_sizeof(key) + _sizeof(value) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        nbytes += sum(_sizeof(item) for item in obj)
+    return nbytes
+
+
+def _update_max(counter, other):
+    """
+    Update ``counter`` in-place with the counts in ``other``, keeping the max
+    of the two counts for each key; same as ``counter | other``, but without
+    copying ``counter``.
+    """
+    for key, count in other.items():
+        if count > counter[key]:
+            counter[key] = count
+
+
+def _get_term_ids_counts(doc):
+    """
+    Get the unique term ids in ``doc`` and their counts, as counted by
+    :meth:`TextDoc.term_counts()` with default arguments, as a pair of arrays;
+    the counts are computed directly rather than through the doc's cache.
+    """
+    term_counts = doc._count_terms()
+    term_ids = np.fromiter(term_counts.keys(), dtype=np.int64, count=len(term_counts))
+    counts = np.fromiter(term_counts.values(), dtype=np.int64, count=len(term_counts))
+    return (term_ids, counts)
+
+
+def _get_word_ids(spacy_doc, lemmatize, filter_stops, filter_punct, filter_nums,
+                  good_pos_tags, bad_pos_tags):
+    """
+    Get the term ids of all words in ``spacy_doc``, normalized as specified by
+    ``lemmatize`` and filtered as in :func:`extract.words() <textacy.extract.words>`,
+    using the same boolean masks over the doc's attribute arrays.
+    """
+    if len(spacy_doc) == 0:
+        return np.zeros(0, dtype=np.int64)
+    doc_data = extract._DocData(spacy_doc)
+    term_ids = doc_data.term_ids(lemmatize)
+    is_bad, is_stop = doc_data.token_filter_masks(
+        filter_punct, filter_nums, good_pos_tags, bad_pos_tags)
+    if filter_stops is True:
+        is_bad = is_bad | is_stop
+    # empty strings are never terms
+    keep = ~is_bad & (term_ids != spacy_doc.vocab.strings[''])
+    return term_ids[keep]
+
+
+def _count_ngram_ids(doc_data, n, lemmatize, get_id):
+    """
+    Count the occurrences of each unique n-gram in a doc, filtered just
+    as the default :meth:`TextDoc.words()` (for n = 1) and :meth:`TextDoc.ngrams()`
+    (for n > 1) but without creating a spacy token or span per n-gram.
+
+    Args:
+        doc_data (:class:`extract._DocData <textacy.extract._DocData>`): shared
+            per-token data of the doc
+        n (int)
+        lemmatize (bool or 'auto'): how to normalize terms, as for
+            :meth:`TextDoc.term_counts()`
+        get_id (func): function that maps an n-gram ``spacy.Span`` to its term id;
+            only called once per unique n-gram, for n > 1
+
+    Returns:
+        :class:`collections.Counter`
+    """
+    term_ids = doc_data.term_ids(lemmatize)
+    # n-grams can't contain punctuation or whitespace tokens,
+    # nor start or end with a stop word
+    is_bad, is_stop = doc_data.token_filter_masks(True, False, None, None)
+    starts = extract._get_ngram_starts(n, is_bad)
+    if len(starts) == 0:
+        return Counter()
+    starts = starts[~is_stop[starts] & ~is_stop[starts + n - 1]]
+    if n == 1:
+        # words' term ids are just their normalized ids
+        ids, inverse = np.unique(term_ids[starts], return_inverse=True)
+        return Counter(dict(zip(ids.tolist(), np.bincount(inverse).tolist())))
+    first_idxs, inverse = _group_ngrams(n, starts, term_ids, doc_data.attr_array(attrs.SPACY))
+    counts = np.bincount(inverse)
+    term_counts = Counter()
+    for first_idx, count in zip(first_idxs.tolist(), counts.tolist()):
+        start = int(starts[first_idx])
+        term_counts[get_id(doc_data.doc[start: start + n])] += count
+    return term_counts
+
+
+def _group_ngrams(n, starts, term_ids, spacy_):
+    """
+    Group the n-grams starting at ``starts`` by identity, where each n-gram is
+    identified by its constituent tokens' ids plus the whitespace between them
+    (which only matters for as-is text).
+
+    Returns:
+        (:class:`numpy.ndarray`, :class:`numpy.ndarray`): index into ``starts``
+            of the first occurrence of each unique n-gram, and the index of
+            each n-gram's group in the first array
+    """
+    cols = [term_ids[starts + j] for j in range(n)]
+    cols.extend(spacy_[starts + j] for j in range(n - 1))
+    keys = np.ascontiguousarray(np.column_stack(cols))
+    keys = keys.view(np.dtype((np.void, keys.dtype.itemsize * keys.shape[1]))).ravel()
+    _, first_idxs, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    return (first_idxs, inverse.ravel())
+
+
+def _get_text_prefix(spacy_doc, n_chars):
+    """
+    Get the text of ``spacy_doc`` up through its first token ending past
+    ``n_chars`` characters, without joining together the text of *all* tokens.
+    """
+    prefix = []
+    prefix_len = 0
+    for tok in spacy_doc:
+        prefix.append(tok.text_with_ws)
+        prefix_len += len(prefix[-1])
+        if prefix_len > n_chars:
+            break
+    return ''.join(prefix)
+
+
+def _hashable(values):
+    """
+    Yield ``values`` in a form suitable for use in a cache key, converting
+    unhashable sets and lists (e.g. of POS tags) into frozensets and tuples.
+    """
+    for value in values:
+        if isinstance(value, (set, frozenset)):
+            yield frozenset(value)
+        elif isinstance(value, (list, tuple)):
+            yield tuple(_hashable(value))
+        else:
+            yield value
+
+
+def _pipe_multiprocess(lang, texts, spacy_pipeline, n_threads=2, n_processes=2,
+                       batch_size=1000):
+    """
+    Parse ``texts`` in chunks of ``batch_size`` across ``n_processes`` worker
+    processes, and yield the resulting ``spacy.Doc`` s in their original order,
+    deserialized against ``spacy_pipeline.vocab``.
+
+    Workers only receive ``lang`` and load their own pipeline, since ``spacy_pipeline``
+    itself can't be sent to them. If ``lang`` or the texts can't be pickled either,
+    a warning is logged and all texts are parsed in this process instead.
+    """
+    chunks = ((lang, chunk) for chunk in itertoolz.partition_all(batch_size, texts))
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        return
+    try:
+        pickle.dumps(first_chunk, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        logger.warning('texts can not be sent to worker processes (%s); '
+                       'parsing them in a single process instead', e)
+        texts = itertools.chain.from_iterable(
+            chunk for _, chunk in itertools.chain([first_chunk], chunks))
+        for spacy_doc in spacy_pipeline.pipe(texts, n_threads=n_threads, batch_size=batch_size):
+            yield spacy_doc
+        return
+    pool = multiprocessing.Pool(processes=n_processes)
+    try:
+        for docs_bytes in pool.imap(_pipe_chunk, itertools.chain([first_chunk], chunks)):
+            for doc_bytes in docs_bytes:
+                yield sdoc(spacy_pipeline.vocab).from_bytes(doc_bytes)
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _pipe_chunk(lang_and_texts):
+    """
+    Parse a chunk of texts in a worker process, returning the serialized docs;
+    the spacy pipeline is loaded (and cached) once per process.
+    """
+    lang, texts = lang_and_texts
+    spacy_pipeline = data.load_spacy(lang)
+    return [spacy_doc.to_bytes()
+            for spacy_doc in spacy_pipeline.pipe(texts, n_threads=1, batch_size=len(texts))]